@@ -0,0 +1,151 @@
+"""
+Parser benchmark: measures how long every parser backend takes to extract the classes, the functions and the
+try-except blocks of the tests/ fixtures and of a generated corpus, and checks that the backends find the same
+elements.
+
+    python benchmarks/parsers.py --modules 20
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blackdoc.parser.fileParser import PARSER_BACKENDS, get_parser_backend
+from synthetic_repo import ModuleGenerator, RepositoryShape
+
+DEFAULT_MODULES = 20
+FIXTURES_FOLDER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"
+)
+
+
+def generate_corpus(modules: int, seed: int = 0) -> List[str]:
+    """
+    Generates the code of the modules of the corpus, with the generator (and the default shape) of the synthetic
+    repositories of the throughput benchmark, so that both benchmarks measure the same corpus.
+
+    :param modules: The number of modules to generate
+    :type modules: int
+    :param seed: The seed of the random choices. (Default=0)
+    :type seed: int
+    :returns: List[str] - the code of every module
+    """
+    generator = ModuleGenerator(RepositoryShape(files=modules), seed)
+    return [generator.generate_module(index) for index in range(modules)]
+
+
+def load_fixtures(folder: str) -> List[str]:
+    """
+    Reads the Python files of the fixtures folder.
+
+    :param folder: The folder with the fixtures
+    :type folder: str
+    :returns: List[str] - the code of every fixture
+    """
+    codes = []
+    for path in sorted(glob.glob(os.path.join(folder, "**", "*.py"), recursive=True)):
+        with open(path, "r") as fp:
+            codes.append(fp.read())
+    return codes
+
+
+def parse_all(backend: str, codes: List[str]) -> Tuple[float, List[set]]:
+    """
+    Parses every code with the backend.
+
+    :param backend: The name of the parser backend
+    :type backend: str
+    :param codes: The code of every module
+    :type codes: List[str]
+    :returns: Tuple[float, List[set]] - the seconds spent, and the (kind, name, start line) of the elements found in
+        every module (None for the modules the backend could not parse)
+    """
+    parser_class = get_parser_backend(backend)
+    elements = []
+    start_time = time.perf_counter()
+    for code in codes:
+        try:
+            parser = parser_class(code=code)
+            parser.parse()
+            found = {
+                (kind, element.get("name", ""), element["start_line"])
+                for kind, records in (
+                    ("class", parser.classes()),
+                    ("function", parser.functions()),
+                    ("try", parser.exceptions()),
+                )
+                for element in records
+                if kind != "try" or element.get("exception")
+            }
+        except Exception:
+            found = None
+        elements.append(found)
+    return time.perf_counter() - start_time, elements
+
+
+def main():
+    """
+    Runs the benchmark, and exits with a non-zero status code if the backends do not find the same elements.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    arg_parser.add_argument(
+        "--modules",
+        help=f"Number of modules of the generated corpus (Default={DEFAULT_MODULES}).",
+        type=int,
+        default=DEFAULT_MODULES,
+    )
+    arg_parser.add_argument(
+        "--seed",
+        help="Seed of the random choices of the generated corpus (Default=0).",
+        type=int,
+        default=0,
+    )
+    arg_parser.add_argument(
+        "--fixtures",
+        help="The folder with the fixtures (Default=tests/).",
+        default=FIXTURES_FOLDER,
+    )
+    arguments = arg_parser.parse_args()
+
+    corpora = {
+        "fixtures": load_fixtures(arguments.fixtures),
+        "generated": generate_corpus(arguments.modules, arguments.seed),
+    }
+
+    failed = False
+    for corpus, codes in corpora.items():
+        lines = sum(code.count("\n") + 1 for code in codes)
+        print(f"{corpus}: {len(codes)} modules, {lines} lines")
+
+        results: Dict[str, Tuple[float, List[set]]] = {}
+        for backend in PARSER_BACKENDS:
+            elapsed, elements = parse_all(backend, codes)
+            results[backend] = (elapsed, elements)
+            errors = sum(1 for found in elements if found is None)
+            print(
+                f"  {backend:>12}: {elapsed:8.3f} s  {lines / elapsed:10.0f} lines/s  "
+                f"{errors} modules not parsed"
+            )
+
+        reference = results[PARSER_BACKENDS[0]][1]
+        for backend in PARSER_BACKENDS[1:]:
+            mismatches = sum(
+                1
+                for expected, found in zip(reference, results[backend][1])
+                if expected is not None and expected != found
+            )
+            if mismatches:
+                print(
+                    f"  FAIL: {backend} found different elements in {mismatches} modules"
+                )
+                failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Startup benchmark: measures, with python -X importtime, how long importing the blackdoc CLI takes, and fails if it
+goes over the time budget, if any module of the NLP stack is imported without --use_nlp, or if black or isort are
+imported before a file is formatted.
+
+    python benchmarks/startup.py --budget 1500
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+# The root modules of the NLP stack, which must be imported only with --use_nlp
+NLP_MODULES = {"nlputilities", "spacy", "nltk", "tensorflow", "torch"}
+# The root modules of the formatters, which must be imported only when the first file is formatted
+FORMATTER_MODULES = {"black", "blib2to3", "isort"}
+DEFAULT_BUDGET_MS = 1500
+
+
+def import_times(module: str) -> List[Tuple[int, int, str]]:
+    """
+    Imports the module in a new interpreter with -X importtime, and parses the reported import times.
+
+    :param module: The module to import
+    :type module: str
+    :returns: List[Tuple[int, int, str]] - the self time (in microseconds), the cumulative time (in microseconds)
+        and the (indented) name of every imported module
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Could not import {module}: {result.stderr}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+        times.append((int(self_time), int(cumulative_time), name.rstrip()))
+    return times
+
+
+def main():
+    """
+    Runs the benchmark, and exits with a non-zero status code if it fails.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    arg_parser.add_argument(
+        "--budget",
+        help=f"Maximum import time of the CLI, in milliseconds (Default={DEFAULT_BUDGET_MS}).",
+        type=int,
+        default=DEFAULT_BUDGET_MS,
+    )
+    arg_parser.add_argument(
+        "--module",
+        help="The module to import (Default=blackdoc.main).",
+        default="blackdoc.main",
+    )
+    arguments = arg_parser.parse_args()
+
+    times = import_times(arguments.module)
+    # The modules imported directly by the command are the only ones not indented
+    total_ms = (
+        sum(cumulative for _, cumulative, name in times if not name.startswith("  "))
+        / 1000
+    )
+    nlp_modules = sorted(
+        {
+            name.strip()
+            for _, _, name in times
+            if name.strip().split(".")[0] in NLP_MODULES
+        }
+    )
+    formatter_modules = sorted(
+        {
+            name.strip()
+            for _, _, name in times
+            if name.strip().split(".")[0] in FORMATTER_MODULES
+        }
+    )
+    slowest = sorted(times, key=lambda entry: entry[0], reverse=True)[:10]
+
+    print(
+        f"Importing {arguments.module} took {total_ms:.1f} ms (budget {arguments.budget} ms)"
+    )
+    print("Slowest modules (self time):")
+    for self_time, _, name in slowest:
+        print(f"  {self_time / 1000:8.1f} ms  {name.strip()}")
+
+    failed = False
+    if nlp_modules:
+        print(f"FAIL: NLP modules imported without --use_nlp: {', '.join(nlp_modules)}")
+        failed = True
+    if formatter_modules:
+        print(
+            f"FAIL: formatter modules imported at startup: {', '.join(formatter_modules)}"
+        )
+        failed = True
+    if total_ms > arguments.budget:
+        print(f"FAIL: the import time is over the budget of {arguments.budget} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Synthetic repository generator: writes a repository of random (but reproducible) Python modules, with the given number
+of files, of functions and classes per file, nesting depth, share of decorated elements and share of elements already
+documented. It is used by the throughput benchmark, and can be run on its own to get a repository to try blackdoc on.
+
+    python benchmarks/synthetic_repo.py /tmp/synthetic --files 500 --depth 2 --documented 0.3
+"""
+import argparse
+import os
+import random
+from typing import List, NamedTuple
+
+# Number of modules in every package of the repository
+MODULES_PER_PACKAGE = 50
+
+FUNCTION_DECORATORS = ("functools.lru_cache(maxsize=None)", "contextlib.contextmanager")
+METHOD_DECORATORS = ("staticmethod", "classmethod", "functools.lru_cache(maxsize=None)")
+# In the order they can appear in a signature
+PARAMETERS = (
+    "value: int",
+    "path",
+    "name: str = 'default'",
+    "items: Optional[List[str]] = None",
+    "retries: int = 3",
+    "*args",
+    "**kwargs",
+)
+EXCEPTIONS = ("ValueError", "KeyError", "OSError", "TypeError")
+
+
+class RepositoryShape(NamedTuple):
+    """
+    The shape of a synthetic repository.
+
+    :param files: The number of Python files
+    :type files: int
+    :param functions: The number of global functions of every file
+    :type functions: int
+    :param classes: The number of classes of every file
+    :type classes: int
+    :param methods: The number of methods of every class
+    :type methods: int
+    :param depth: How many levels of inner functions (and inner classes) every function (and class) contains
+    :type depth: int
+    :param decorated: The share (between 0 and 1) of functions and methods with a decorator
+    :type decorated: float
+    :param documented: The share (between 0 and 1) of functions, classes and methods that already have a docstring
+    :type documented: float
+    """
+
+    files: int = 100
+    functions: int = 8
+    classes: int = 3
+    methods: int = 5
+    depth: int = 1
+    decorated: float = 0.2
+    documented: float = 0.3
+
+
+class ModuleGenerator:
+    """
+    Generates the code of the modules of a synthetic repository.
+
+    Methods:
+    :method generate_module:
+    :method generate_function:
+    :method generate_class:
+    :method docstring:
+
+
+    :param shape: The shape of the repository
+    :type shape: RepositoryShape
+    :param seed: The seed of the random choices, so that the same repository is generated every time. (Default=0)
+    :type seed: int
+    """
+
+    def __init__(self, shape: RepositoryShape, seed: int = 0):
+        """
+        This overrides the built-in object Initializator. It is a class method of ModuleGenerator.
+
+        :param shape: The shape of the repository
+        :type shape: RepositoryShape
+        :param seed: The seed of the random choices. (Default=0)
+        :type seed: int
+        """
+
+        self.shape = shape
+        self.random = random.Random(seed)
+
+    def docstring(self, indent: str, summary: str) -> List[str]:
+        """
+        Returns the docstring of an element, only for the share of the elements that are documented.
+
+        :param indent: The indentation of the body of the element
+        :type indent: str
+        :param summary: The first line of the docstring
+        :type summary: str
+        :returns: List[str] - the lines of the docstring, or no lines
+        """
+
+        if self.random.random() >= self.shape.documented:
+            return []
+        return [f'{indent}"""', f"{indent}{summary}", f'{indent}"""', ""]
+
+    def generate_function(
+        self, name: str, indent: str, depth: int, is_method: bool = False
+    ) -> List[str]:
+        """
+        Generates a function, with a try-except block and (if depth is not 0) an inner function.
+
+        :param name: The name of the function
+        :type name: str
+        :param indent: The indentation of the definition
+        :type indent: str
+        :param depth: The levels of inner functions still to generate
+        :type depth: int
+        :param is_method: If True, the function is generated as a method of a class. (Default=False)
+        :type is_method: bool
+        :returns: List[str] - the lines of the function
+        """
+
+        lines = []
+        decorator = ""
+        if self.random.random() < self.shape.decorated:
+            decorator = self.random.choice(
+                METHOD_DECORATORS if is_method else FUNCTION_DECORATORS
+            )
+            lines.append(f"{indent}@{decorator}")
+
+        parameters = ["value: int"] + self.random.sample(
+            PARAMETERS[1:], self.random.randint(0, 4)
+        )
+        parameters.sort(key=lambda parameter: PARAMETERS.index(parameter))
+        if is_method and decorator != "staticmethod":
+            parameters.insert(0, "cls" if decorator == "classmethod" else "self")
+        lines.append(f"{indent}def {name}({', '.join(parameters)}) -> int:")
+
+        body = indent + "    "
+        lines.extend(self.docstring(body, f"Computes the {name} of the value."))
+        if depth:
+            lines.extend(self.generate_function(f"{name}_inner", body, depth - 1))
+            lines.append("")
+        exception = self.random.choice(EXCEPTIONS)
+        lines.extend(
+            [
+                f"{body}total = value",
+                f"{body}try:",
+                f"{body}    total += len(str(value))",
+                f"{body}except {exception} as ex:",
+                f"{body}    raise ValueError(str(ex))",
+                f"{body}return total",
+            ]
+        )
+        return lines
+
+    def generate_class(self, name: str, indent: str, depth: int) -> List[str]:
+        """
+        Generates a class, with class and object variables, its methods and (if depth is not 0) an inner class.
+
+        :param name: The name of the class
+        :type name: str
+        :param indent: The indentation of the definition
+        :type indent: str
+        :param depth: The levels of inner classes still to generate
+        :type depth: int
+        :returns: List[str] - the lines of the class
+        """
+
+        body = indent + "    "
+        lines = [f"{indent}class {name}(object):"]
+        lines.extend(self.docstring(body, f"The {name} model."))
+        lines.extend(
+            [
+                f"{body}registry: List[str] = []",
+                "",
+                f"{body}def __init__(self, name: str, values=None):",
+                f"{body}    self.name = name",
+                f"{body}    self.values = values if values is not None else []",
+            ]
+        )
+        for index in range(self.shape.methods):
+            lines.append("")
+            lines.extend(
+                self.generate_function(
+                    f"method_{index}", body, max(depth - 1, 0), is_method=True
+                )
+            )
+        if depth:
+            lines.append("")
+            lines.extend(self.generate_class(f"{name}Inner", body, depth - 1))
+        return lines
+
+    def generate_module(self, index: int) -> str:
+        """
+        Generates the code of a module of the repository.
+
+        :param index: The position of the module in the repository
+        :type index: int
+        :returns: str - the code of the module
+        """
+
+        lines = [
+            "import contextlib",
+            "import functools",
+            "from typing import List, Optional",
+        ]
+        for function in range(self.shape.functions):
+            lines.extend(["", ""])
+            lines.extend(
+                self.generate_function(
+                    f"function_{index}_{function}", "", self.shape.depth
+                )
+            )
+        for model in range(self.shape.classes):
+            lines.extend(["", ""])
+            lines.extend(
+                self.generate_class(f"Model{index}x{model}", "", self.shape.depth)
+            )
+        return "\n".join(lines) + "\n"
+
+
+def generate_repository(root: str, shape: RepositoryShape, seed: int = 0) -> List[str]:
+    """
+    Writes the modules of a synthetic repository in the root folder, MODULES_PER_PACKAGE modules per package.
+
+    :param root: The folder of the repository (created if it does not exist)
+    :type root: str
+    :param shape: The shape of the repository
+    :type shape: RepositoryShape
+    :param seed: The seed of the random choices, so that the same repository is generated every time. (Default=0)
+    :type seed: int
+    :returns: List[str] - the paths of the generated modules
+    """
+
+    generator = ModuleGenerator(shape, seed)
+    paths = []
+    for index in range(shape.files):
+        package = os.path.join(root, f"package_{index // MODULES_PER_PACKAGE}")
+        os.makedirs(package, exist_ok=True)
+        path = os.path.join(package, f"module_{index}.py")
+        with open(path, "w") as fp:
+            fp.write(generator.generate_module(index))
+        paths.append(path)
+    return paths
+
+
+def add_shape_arguments(arg_parser: argparse.ArgumentParser):
+    """
+    Adds the CLI arguments describing the shape of the repository, with the defaults of RepositoryShape.
+
+    :param arg_parser: The parser of the CLI arguments
+    :type arg_parser: argparse.ArgumentParser
+    """
+
+    defaults = RepositoryShape()
+    descriptions = {
+        "files": "Number of Python files",
+        "functions": "Number of global functions of every file",
+        "classes": "Number of classes of every file",
+        "methods": "Number of methods of every class",
+        "depth": "Levels of inner functions and classes",
+        "decorated": "Share of decorated functions and methods",
+        "documented": "Share of elements that already have a docstring",
+    }
+    for field, description in descriptions.items():
+        default = getattr(defaults, field)
+        arg_parser.add_argument(
+            f"--{field}",
+            help=f"{description} (Default={default}).",
+            type=type(default),
+            default=default,
+        )
+    arg_parser.add_argument(
+        "--seed",
+        help="Seed of the random choices (Default=0).",
+        type=int,
+        default=0,
+    )
+
+
+def shape_from_arguments(arguments: argparse.Namespace) -> RepositoryShape:
+    """
+    Builds the shape of the repository from the parsed CLI arguments.
+
+    :param arguments: The parsed CLI arguments
+    :type arguments: argparse.Namespace
+    :returns: RepositoryShape - the shape of the repository
+    """
+
+    return RepositoryShape(
+        **{field: getattr(arguments, field) for field in RepositoryShape._fields}
+    )
+
+
+def main():
+    """
+    Generates a synthetic repository in the given folder.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    arg_parser.add_argument("root", help="The folder of the generated repository.")
+    add_shape_arguments(arg_parser)
+    arguments = arg_parser.parse_args()
+
+    paths = generate_repository(
+        arguments.root, shape_from_arguments(arguments), arguments.seed
+    )
+    lines = 0
+    for path in paths:
+        with open(path, "r") as fp:
+            lines += sum(1 for _ in fp)
+    print(f"Generated {len(paths)} modules ({lines} lines) in {arguments.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Throughput benchmark: generates a synthetic repository, and measures how many files per second go through FileParser,
+the extractors, DocumentFile.document_file and the whole blackdoc CLI (at every --workers value), together with the
+peak RSS. The results can be saved and compared with the ones of another commit.
+
+    python benchmarks/throughput.py --files 200 --workers 1 2 4 --save before.json
+    python benchmarks/throughput.py --files 200 --workers 1 2 4 --compare before.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak RSS is not reported
+    resource = None
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_FOLDER)
+
+from blackdoc.docstring import DocumentFile
+from blackdoc.parser.classes_extractor import ClassesExtractor
+from blackdoc.parser.exceptions_extractor import ExceptionsExtractor
+from blackdoc.parser.fileParser import (
+    DEFAULT_PARSER_BACKEND,
+    PARSER_BACKENDS,
+    FileParser,
+)
+from blackdoc.parser.methods_extractor import MethodsExtractor
+from synthetic_repo import (
+    add_shape_arguments,
+    generate_repository,
+    shape_from_arguments,
+)
+
+DEFAULT_WORKERS = [1, 2, 4]
+
+
+def peak_rss_mb(usage) -> Optional[float]:
+    """
+    Converts the peak RSS of a resource usage in megabytes.
+
+    :param usage: The resource usage (as returned by resource.getrusage or os.wait4)
+    :returns: Optional[float] - the peak RSS in megabytes, or None if it is not available
+    """
+
+    if usage is None:
+        return None
+    # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return usage.ru_maxrss / divisor
+
+
+def time_stage(
+    function: Callable,
+    items: List,
+    repeat: int,
+    prepare: Optional[Callable] = None,
+) -> Dict[str, Optional[float]]:
+    """
+    Calls the function on every item, repeat times, in the current process.
+
+    :param function: The function to time
+    :type function: Callable
+    :param items: The items the function is called on
+    :type items: List
+    :param repeat: How many times the items are processed (the fastest time is kept)
+    :type repeat: int
+    :param prepare: If given, it is called (untimed) on every item before every repeat, and the function is called on
+        its results, so that no repeat reuses the state (e.g. memoized results) left by the previous one.
+        (Default=None)
+    :type prepare: Optional[Callable]
+    :returns: Dict[str, Optional[float]] - the fastest time and the peak RSS of the current process so far
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        current_items = [prepare(item) for item in items] if prepare else items
+        start_time = time.perf_counter()
+        for item in current_items:
+            function(item)
+        best = min(best, time.perf_counter() - start_time)
+    usage = resource.getrusage(resource.RUSAGE_SELF) if resource else None
+    return {"seconds": best, "peak_rss_mb": peak_rss_mb(usage)}
+
+
+def parse_file(item: tuple) -> FileParser:
+    """
+    Parses the code of a file.
+
+    :param item: The path, the code and the parser backend of the file
+    :type item: tuple
+    :returns: FileParser - the parser of the file
+    """
+
+    _, code, backend = item
+    parser = FileParser(code, backend)
+    parser.check_code_validity()
+    return parser
+
+
+def extract_elements(parser: FileParser):
+    """
+    Extracts the functions, the classes and the try-except blocks of a parsed file, as DocumentFile does.
+
+    :param parser: The parser of the file
+    :type parser: FileParser
+    """
+
+    functions = MethodsExtractor(parser.get_functions()).collect_data()
+    ClassesExtractor(parser.get_classes(), functions).collect_data()
+    exceptions_extractor = ExceptionsExtractor(parser.get_exceptions())
+    exceptions_extractor.collect_data()
+    exceptions_extractor.index_by_function(functions)
+
+
+def document_file(item: tuple):
+    """
+    Documents a file in memory (the file is never written).
+
+    :param item: The path, the parser backend and whether the formatters are used
+    :type item: tuple
+    """
+
+    path, backend, formatters = item
+    DocumentFile(
+        os.path.basename(path),
+        path,
+        None,
+        use_black=formatters,
+        use_isort=formatters,
+        parser_backend=backend,
+        diff_only=True,
+    ).document_file()
+
+
+def run_cli(
+    repository: str, workers: int, backend: str, formatters: bool
+) -> Dict[str, Optional[float]]:
+    """
+    Runs the whole blackdoc CLI on a copy of the repository, in a new process.
+
+    :param repository: The folder of the synthetic repository
+    :type repository: str
+    :param workers: The number of workers
+    :type workers: int
+    :param backend: The parser backend
+    :type backend: str
+    :param formatters: If True, black and isort are run as well
+    :type formatters: bool
+    :returns: Dict[str, Optional[float]] - the time and the peak RSS (of the largest process) of the run
+    """
+
+    with tempfile.TemporaryDirectory() as folder:
+        copy = os.path.join(folder, "repository")
+        shutil.copytree(repository, copy)
+        with open(os.path.join(copy, "blackdoc_configuration.toml"), "w") as fp:
+            fp.write(f'[blackdoc]\nparser = "{backend}"\n')
+
+        command = [
+            sys.executable,
+            "-m",
+            "blackdoc",
+            "--repo",
+            "--no_backup",
+            "--no_cache",
+            "--workers",
+            str(workers),
+        ]
+        if not formatters:
+            command += ["--no_black", "--no_isort"]
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [ROOT_FOLDER] + environment.get("PYTHONPATH", "").split(os.pathsep)
+        ).rstrip(os.pathsep)
+
+        start_time = time.perf_counter()
+        process = subprocess.Popen(
+            command,
+            cwd=copy,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if hasattr(os, "wait4"):
+            # The usage of this run only (the workers included), not of the previous ones
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = (
+                os.waitstatus_to_exitcode(status)
+                if hasattr(os, "waitstatus_to_exitcode")
+                else status >> 8
+            )
+            errors = process.stderr.read()
+            process.stderr.close()
+        else:
+            _, errors = process.communicate()
+            usage = None
+        elapsed = time.perf_counter() - start_time
+
+    if process.returncode:
+        raise RuntimeError(f"blackdoc failed: {errors.decode(errors='replace')}")
+    return {"seconds": elapsed, "peak_rss_mb": peak_rss_mb(usage)}
+
+
+def print_results(results: List[dict], baseline: Optional[dict] = None):
+    """
+    Prints the throughput and the peak RSS of every stage, and the change of the throughput from the baseline.
+
+    :param results: The results of every stage
+    :type results: List[dict]
+    :param baseline: The results of a previous run, keyed by stage and workers. (Default=None)
+    :type baseline: Optional[dict]
+    """
+
+    print(
+        f"{'stage':<10} {'workers':>7} {'seconds':>9} {'files/s':>9} {'peak RSS':>10}"
+    )
+    for result in results:
+        rss = result["peak_rss_mb"]
+        line = (
+            f"{result['stage']:<10} {result['workers'] or '-':>7} {result['seconds']:>9.3f} "
+            f"{result['files_per_second']:>9.1f} {f'{rss:.1f} MB' if rss is not None else 'n/a':>10}"
+        )
+        previous = (baseline or {}).get((result["stage"], result["workers"]))
+        if previous:
+            change = result["files_per_second"] / previous["files_per_second"] - 1
+            line += f"  {change:+.1%} files/s"
+        print(line)
+
+
+def get_commit() -> str:
+    """
+    Returns the git commit of the benchmarked code.
+
+    :returns: str - the commit, or an empty string if it could not be retrieved
+    """
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_FOLDER,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    """
+    Runs the benchmark, and saves (or compares) the results if requested.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    add_shape_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--workers",
+        help=f"The --workers values the CLI is run with (Default={DEFAULT_WORKERS}).",
+        type=int,
+        nargs="+",
+        default=DEFAULT_WORKERS,
+    )
+    arg_parser.add_argument(
+        "--parser",
+        help=f"The parser backend (Default={DEFAULT_PARSER_BACKEND}).",
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_PARSER_BACKEND,
+    )
+    arg_parser.add_argument(
+        "--formatters",
+        help="If specified, black and isort are run as well when the files are documented.",
+        action="store_true",
+        default=False,
+    )
+    arg_parser.add_argument(
+        "--repeat",
+        help="How many times the in-process stages are repeated, keeping the fastest (Default=1).",
+        type=int,
+        default=1,
+    )
+    arg_parser.add_argument(
+        "--save",
+        help="If specified, the results are saved in this JSON file.",
+        metavar="FILE",
+    )
+    arg_parser.add_argument(
+        "--compare",
+        help="If specified, the throughput is compared with the results saved in this JSON file.",
+        metavar="FILE",
+    )
+    arguments = arg_parser.parse_args()
+    shape = shape_from_arguments(arguments)
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, "r") as fp:
+            saved = json.load(fp)
+        baseline = {
+            (result["stage"], result["workers"]): result for result in saved["results"]
+        }
+        print(f"Comparing with {saved.get('commit') or arguments.compare}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_repository(folder, shape, arguments.seed)
+        codes = []
+        for path in paths:
+            with open(path, "r") as fp:
+                codes.append(fp.read())
+        lines = sum(code.count("\n") for code in codes)
+        print(f"Generated {len(paths)} files, {lines} lines ({shape})")
+
+        parse_items = [
+            (path, code, arguments.parser) for path, code in zip(paths, codes)
+        ]
+        stages = [
+            (
+                "parse",
+                None,
+                lambda: time_stage(parse_file, parse_items, arguments.repeat),
+            ),
+            (
+                "extract",
+                None,
+                # Every repeat extracts from new parsers, since the parsers memoize what they extracted
+                lambda: time_stage(
+                    extract_elements, parse_items, arguments.repeat, parse_file
+                ),
+            ),
+            (
+                "document",
+                None,
+                lambda: time_stage(
+                    document_file,
+                    [(path, arguments.parser, arguments.formatters) for path in paths],
+                    arguments.repeat,
+                ),
+            ),
+        ]
+        for workers in arguments.workers:
+            stages.append(
+                (
+                    "cli",
+                    workers,
+                    lambda workers=workers: run_cli(
+                        folder, workers, arguments.parser, arguments.formatters
+                    ),
+                )
+            )
+
+        results = []
+        for stage, workers, run in stages:
+            result = run()
+            result.update(
+                stage=stage,
+                workers=workers,
+                files_per_second=len(paths) / result["seconds"],
+            )
+            results.append(result)
+
+    print_results(results, baseline)
+
+    if arguments.save:
+        with open(arguments.save, "w") as fp:
+            json.dump(
+                {"commit": get_commit(), "shape": shape._asdict(), "results": results},
+                fp,
+                indent=2,
+            )
+        print(f"Saved the results in {arguments.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import json
+import os
+import shutil
+import time
+from typing import Optional
+
+from blackdoc.configs import log
+
+MANIFEST_NAME = "manifest.jsonl"
+# The folder of the backup where the files outside the working directory are saved, mirroring their absolute path
+EXTERNAL_FOLDER = "blackdoc_external"
+# The prefix of the folders of the backup of every run, followed by the time the run started
+RUN_PREFIX = "run_"
+
+
+class FilesBackup:
+    """
+    Backup of the files modified by blackdoc. Instead of copying the whole working directory, every file is saved
+    lazily, right before it is overwritten, as a hardlink (or as a copy, if hardlinks are not supported) in the folder
+    of the current run inside the backup folder, and recorded in a manifest. The files outside the working directory
+    (e.g. -f ../file.py) are recorded by their absolute path, and saved under EXTERNAL_FOLDER. Since the documented
+    files are written to a new file that replaces the original one, the hardlinked backup keeps the original content.
+    The backups of the previous runs are removed only when the current run saves its first file, so that a run that
+    does not modify any file keeps the last backup.
+
+    Methods:
+    :method latest:
+    :method reset:
+    :method save:
+    :method backup_location:
+    :method restore:
+    :method read_manifest:
+
+
+    :param working_dir: The folder containing the files that are going to be modified
+    :type working_dir: str
+    :param backup_dir: The folder where the backup is stored
+    :type backup_dir: str
+    :param run_name: The folder (inside backup_dir) of the backup of the run. If not given, a new run is started.
+        (Default=None)
+    :type run_name: Optional[str]
+    """
+
+    def __init__(
+        self, working_dir: str, backup_dir: str, run_name: Optional[str] = None
+    ):
+        """
+        This overrides the built-in object Initializator. It is a class method of FilesBackup.
+
+        :param working_dir: The folder containing the files that are going to be modified
+        :type working_dir: str
+        :param backup_dir: The folder where the backup is stored
+        :type backup_dir: str
+        :param run_name: The folder (inside backup_dir) of the backup of the run. If not given, a new run is started.
+            (Default=None)
+        :type run_name: Optional[str]
+        """
+
+        self.working_dir = working_dir
+        self.backup_dir = backup_dir
+        self.run_name = run_name or f"{RUN_PREFIX}{time.time_ns():020d}"
+        self.run_dir = os.path.join(backup_dir, self.run_name)
+        self.manifest_path = os.path.join(self.run_dir, MANIFEST_NAME)
+
+    @classmethod
+    def latest(cls, working_dir: str, backup_dir: str) -> Optional["FilesBackup"]:
+        """Finds the backup of the last run that modified any file.
+
+        :param working_dir: The folder containing the modified files
+        :type working_dir: str
+        :param backup_dir: The folder where the backup is stored
+        :type backup_dir: str
+        :returns: Optional[FilesBackup] - the backup of the last run, or None if there is none
+        """
+        try:
+            runs = sorted(
+                name
+                for name in os.listdir(backup_dir)
+                if name.startswith(RUN_PREFIX)
+                and os.path.isdir(os.path.join(backup_dir, name))
+            )
+        except OSError:
+            return None
+        return cls(working_dir, backup_dir, runs[-1]) if runs else None
+
+    def reset(self):
+        """Creates the folder of the current run, and removes the backups of the previous runs. It is called by every
+        process (e.g. every worker) that saves a file, so the folders of the other runs are removed ignoring the errors
+        of the processes removing them at the same time.
+        """
+        os.makedirs(self.run_dir, exist_ok=True)
+        for name in os.listdir(self.backup_dir):
+            if name == self.run_name:
+                continue
+            path = os.path.join(self.backup_dir, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def save(self, file_path: str, copy: bool = False):
+        """Saves the file in the backup folder and records it in the manifest. Safe to be called by several workers at
+        the same time, since every manifest entry is a single appended line.
+
+        :param file_path: Path of the file that is going to be overwritten
+        :type file_path: str
+        :param copy: If True, the file is copied instead of hardlinked, since it is going to be rewritten in place.
+            (Default=False)
+        :type copy: bool
+        """
+        if not os.path.isdir(self.run_dir):
+            self.reset()
+
+        file_path = os.path.abspath(file_path)
+        try:
+            relative_path = os.path.relpath(file_path, self.working_dir)
+        except ValueError:
+            # On a different drive than the working directory
+            relative_path = file_path
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            relative_path = file_path
+        backup_path = self.backup_location(relative_path)
+        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+
+        if os.path.exists(backup_path):
+            return
+
+        # The content of a symlink is the one of its target
+        source_path = os.path.realpath(file_path)
+        try:
+            if copy:
+                raise OSError("The file is rewritten in place")
+            os.link(source_path, backup_path)
+        except OSError:
+            shutil.copy2(source_path, backup_path)
+
+        with open(self.manifest_path, "a") as fp:
+            fp.write(json.dumps({"path": relative_path}) + "\n")
+
+    def backup_location(self, path: str) -> str:
+        """Finds where a file is saved in the backup folder.
+
+        :param path: The path of the file, relative to the working directory, or absolute if the file is outside it
+        :type path: str
+        :raises ValueError: If the location is not inside the folder of the run
+        :returns: str - the path of the file in the folder of the run
+        """
+        if os.path.isabs(path):
+            drive, path = os.path.splitdrive(path)
+            location = os.path.join(
+                self.run_dir,
+                EXTERNAL_FOLDER,
+                drive.strip(":" + os.sep + (os.altsep or "")),
+                path.lstrip(os.sep + (os.altsep or "")),
+            )
+        else:
+            location = os.path.join(self.run_dir, path)
+
+        run_dir = os.path.abspath(self.run_dir)
+        if os.path.commonpath([os.path.abspath(location), run_dir]) != run_dir:
+            raise ValueError(f"The backup of {path} would be outside {self.run_dir}")
+        return location
+
+    def read_manifest(self) -> list:
+        """Reads the paths (relative to the working directory, or absolute) of the files saved in the backup.
+
+        :returns: list - the paths of the files in the backup
+        """
+        paths = []
+        with open(self.manifest_path, "r") as fp:
+            for line in fp:
+                if line.strip():
+                    paths.append(json.loads(line)["path"])
+        return paths
+
+    def restore(self) -> int:
+        """Puts back every file recorded in the manifest. The files are copied, so that the backup stays untouched. As
+        when the files are documented, the target of a symlink is replaced, and a file with other hardlinks is
+        rewritten in place.
+
+        :returns: int - the number of restored files
+        """
+        try:
+            paths = self.read_manifest()
+        except (FileNotFoundError, ValueError, KeyError) as ex:
+            log(
+                f"Could not read the backup manifest {self.manifest_path}: {ex}",
+                "error",
+            )
+            return 0
+
+        restored = 0
+        for relative_path in paths:
+            file_path = os.path.realpath(os.path.join(self.working_dir, relative_path))
+            temp_path = file_path + ".blackdoc_restore"
+            try:
+                backup_path = self.backup_location(relative_path)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                if os.path.exists(file_path) and os.stat(file_path).st_nlink > 1:
+                    shutil.copyfile(backup_path, file_path)
+                else:
+                    shutil.copy2(backup_path, temp_path)
+                    os.replace(temp_path, file_path)
+                restored += 1
+            except (OSError, ValueError) as ex:
+                log(f"Could not restore the file {file_path}: {ex}", "error")
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return restored
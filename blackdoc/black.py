@@ -1,39 +1,61 @@
-import subprocess
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from blackdoc.configs import log, Config
+from blackdoc.configs import log
 
+if TYPE_CHECKING:
+    import black
 
-def black_repo():
+
+@lru_cache(maxsize=None)
+def get_black_mode(project_dir: str = "") -> "black.Mode":
     """
-    This method is XXX . It is a global method.
+    This is a getter method. Builds the black formatting mode from the black configuration in the pyproject.toml of
+    the project (if any), the same way the black CLI would. The mode is computed once per process, and black is
+    imported only then, so that the runs without black do not pay for its import.
+
+    :param project_dir: Folder from which the pyproject.toml file is searched. (Default="")
+    :type project_dir: str
+    :returns: black.Mode - the formatting mode
     """
 
-    temp = subprocess.run(
-        f'black --extend-exclude="{Config.backup_folder}" .',
-        stderr=subprocess.PIPE,
-        stdout=subprocess.DEVNULL,
-        shell=True,
+    import black
+
+    configs = {}
+    try:
+        pyproject = black.find_pyproject_toml((project_dir or os.getcwd(),))
+        if pyproject:
+            configs = black.parse_pyproject_toml(pyproject)
+    except Exception as ex:
+        log(f"Error reading the black configuration: {ex}", "warning")
+
+    return black.Mode(
+        target_versions={
+            black.TargetVersion[version.upper()]
+            for version in configs.get("target_version", [])
+        },
+        line_length=configs.get("line_length", black.DEFAULT_LINE_LENGTH),
+        string_normalization=not configs.get("skip_string_normalization", False),
+        magic_trailing_comma=not configs.get("skip_magic_trailing_comma", False),
     )
-    report = temp.stderr.decode()
-    log(f"Finished formatting the repository!\n{report}")
 
 
-def black_file(file_path: str):
+def black_code(code: str, file_path: str = "") -> str:
     """
-    This method is XXX . It is a global method.
+    Formats the code in memory with black.
 
-    :param file_path: XXX
+    :param code: The code to format
+    :type code: str
+    :param file_path: Path of the file containing the code, only used for logging. (Default="")
     :type file_path: str
+    :returns: str - the formatted code, or the given code if black could not format it
     """
 
-    temp = subprocess.run(
-        "black " + file_path,
-        stderr=subprocess.PIPE,
-        stdout=subprocess.DEVNULL,
-        shell=True,
-    )
-    report = temp.stderr.decode()
-    if report and not report.startswith("All done!"):
-        log(f"Error blacking the file {file_path}: {report}")
-    else:
-        log(f"Finished formatting the file {file_path}!")
+    import black
+
+    try:
+        return black.format_str(code, mode=get_black_mode())
+    except Exception as ex:
+        log(f"Error blacking the file {file_path}: {ex}")
+        return code
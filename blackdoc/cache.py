@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+from typing import Iterable, Iterator
+
+from blackdoc.configs import log
+from blackdoc.timing import StageTimer
+
+CACHE_NAME = "blackdoc_cache.json"
+
+
+class FilesCache:
+    """
+    Persistent cache of the files already documented (and formatted) by blackdoc. Every file is keyed by its path
+    (relative to the cache folder), and its modification time, size and content hash are stored, so that an unchanged
+    file can be skipped in the following runs. The whole cache is discarded if the settings used for the run differ
+    from the saved ones.
+
+    Methods:
+    :method load:
+    :method save:
+    :method is_unchanged:
+    :method changed_files:
+    :method update:
+    :method content_hash:
+
+
+    :param cache_folder: Folder where the cache file is stored (the one containing blackdoc_configuration.toml)
+    :type cache_folder: str
+    :param settings: Fingerprint of the settings (version and CLI flags) used for the current run
+    :type settings: str
+    """
+
+    def __init__(self, cache_folder: str, settings: str):
+        """
+        This overrides the built-in object Initializator. It is a class method of FilesCache.
+
+        :param cache_folder: Folder where the cache file is stored
+        :type cache_folder: str
+        :param settings: Fingerprint of the settings used for the current run
+        :type settings: str
+        """
+
+        self.cache_folder = cache_folder
+        self.cache_path = os.path.join(cache_folder, CACHE_NAME)
+        self.settings = settings
+        self.files = {}
+        self.skipped = 0
+
+    def load(self):
+        """Loads the cache file, if present and created with the same settings of the current run.
+
+        :returns: FilesCache - the cache itself
+        """
+        try:
+            with open(self.cache_path, "r") as fp:
+                cache_file = json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cache_file = {}
+
+        if cache_file.get("settings") == self.settings:
+            self.files = cache_file.get("files", {})
+        else:
+            self.files = {}
+        return self
+
+    def save(self):
+        """Writes the cache file, next to the configuration file."""
+        try:
+            with open(self.cache_path, "w") as fp:
+                json.dump({"settings": self.settings, "files": self.files}, fp)
+        except OSError as ex:
+            log(f"Could not save the cache file {self.cache_path}: {ex}", "warning")
+
+    @staticmethod
+    def content_hash(file_path: str) -> str:
+        """Computes the hash of the content of the file.
+
+        :param file_path: Path of the file
+        :type file_path: str
+        :returns: str - the hexadecimal sha256 digest of the file content
+        """
+        with open(file_path, "rb") as fp:
+            return hashlib.sha256(fp.read()).hexdigest()
+
+    def is_unchanged(self, file_path: str) -> bool:
+        """Checks whether the file is the same one saved in the cache. The content hash is computed only when the
+        modification time differs but the size does not.
+
+        :param file_path: Path of the file
+        :type file_path: str
+        :returns: bool - True if the file did not change since it was last documented, False otherwise
+        """
+        entry = self.files.get(os.path.relpath(file_path, self.cache_folder))
+        if not entry:
+            return False
+
+        try:
+            stats = os.stat(file_path)
+        except OSError:
+            return False
+
+        if stats.st_size != entry["size"]:
+            return False
+
+        if stats.st_mtime_ns == entry["mtime"]:
+            return True
+
+        if self.content_hash(file_path) == entry["hash"]:
+            entry["mtime"] = stats.st_mtime_ns
+            return True
+        return False
+
+    def changed_files(
+        self, files: Iterable[str], timer: StageTimer = None
+    ) -> Iterator[str]:
+        """Yields only the files that changed since they were last documented, counting the skipped ones.
+
+        :param files: The paths of the files
+        :type files: Iterable[str]
+        :param timer: If given, the time spent checking the files is added to its "cache" stage. (Default=None)
+        :type timer: StageTimer
+        :returns: Iterator[str] - the paths of the changed files
+        """
+        timer = timer or StageTimer()
+        for file_path in files:
+            with timer.span("cache"):
+                unchanged = self.is_unchanged(file_path)
+            if unchanged:
+                self.skipped += 1
+            else:
+                yield file_path
+
+    def update(self, file_path: str):
+        """Saves the current state of the file in the cache.
+
+        :param file_path: Path of the file
+        :type file_path: str
+        """
+        key = os.path.relpath(file_path, self.cache_folder)
+        try:
+            stats = os.stat(file_path)
+            self.files[key] = {
+                "mtime": stats.st_mtime_ns,
+                "size": stats.st_size,
+                "hash": self.content_hash(file_path),
+            }
+        except OSError:
+            self.files.pop(key, None)
@@ -1,8 +1,9 @@
-from multiprocessing.managers import BaseManager
 from typing import List
 
 import toml
 
+from blackdoc.parser.fileParser import DEFAULT_PARSER_BACKEND, PARSER_BACKENDS
+
 CONFIGURATION_NAME = "blackdoc_configuration.toml"
 
 
@@ -18,15 +19,6 @@ def log(data: str = "", level: str = "INFO"):
     print(f"[{level.upper()}]: {data}")
 
 
-class NLPManager(BaseManager):
-    """
-    This class XXX .
-    Extends class BaseManager.
-    """
-
-    pass
-
-
 class Config:
     """
     This class XXX .
@@ -62,6 +54,15 @@ class Config:
 
     workers: int = 3
 
+    # Skip the files ignored by the .gitignore files (of the parent folders too) and by .git/info/exclude
+    gitignore: bool = True
+
+    # The parser used to extract the elements of the code: "pythonparser" or "ast"
+    parser: str = DEFAULT_PARSER_BACKEND
+
+    # The files of at least this many bytes are documented in low memory mode (0 never)
+    low_memory_threshold: int = 4 * 1024 * 1024
+
     @staticmethod
     def _set_values(configs: dict):
         """Load all the values from the blackdoc_configuration.toml file, and use the default values for everything is not
@@ -76,6 +77,32 @@ class Config:
         Config.workers = miscellaneous.get("workers", Config.workers)
         Config.whitelist = miscellaneous.get("whitelist", Config.whitelist)
         Config.backup_folder = miscellaneous.get("backup_folder", Config.backup_folder)
+        Config.gitignore = miscellaneous.get("gitignore", Config.gitignore)
+        parser = miscellaneous.get("parser", Config.parser)
+        if parser in PARSER_BACKENDS:
+            Config.parser = parser
+        else:
+            log(
+                f"Unknown parser {parser!r} in {CONFIGURATION_NAME}. Available parsers: "
+                f"{', '.join(PARSER_BACKENDS)}. Using {Config.parser}.",
+                level="error",
+            )
+        low_memory_threshold = miscellaneous.get(
+            "low_memory_threshold", Config.low_memory_threshold
+        )
+        # bool is a subclass of int, but "true" is not a size
+        if (
+            isinstance(low_memory_threshold, int)
+            and not isinstance(low_memory_threshold, bool)
+            and low_memory_threshold >= 0
+        ):
+            Config.low_memory_threshold = low_memory_threshold
+        else:
+            log(
+                f"Invalid low_memory_threshold {low_memory_threshold!r} in {CONFIGURATION_NAME}: it has to be a "
+                f"number of bytes (0 never). Using {Config.low_memory_threshold}.",
+                level="error",
+            )
         Config.blacklist = set(
             miscellaneous.get("blacklist", Config.blacklist) + [Config.backup_folder]
         )
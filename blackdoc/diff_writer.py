@@ -0,0 +1,55 @@
+from typing import Dict, TextIO
+
+
+class DiffWriter:
+    """
+    Writes the unified diffs of the documented files in the order the files were found, even if the workers finish
+    them in a different order: a diff is held back only until the diffs of all the previous files are written.
+
+    Methods:
+    :method add:
+    :method flush:
+
+
+    :param output: The stream where the diffs are written
+    :type output: TextIO
+    """
+
+    def __init__(self, output: TextIO):
+        """
+        This overrides the built-in object Initializator. It is a class method of DiffWriter.
+
+        :param output: The stream where the diffs are written
+        :type output: TextIO
+        """
+
+        self.output = output
+        self.pending: Dict[int, str] = {}
+        self.next_index = 0
+        self.written = 0
+
+    def add(self, index: int, diff: str):
+        """This is an adder method. Saves the diff of a file, and writes all the diffs that are next in order.
+
+        :param index: The position of the file among the documented ones
+        :type index: int
+        :param diff: The unified diff of the file (empty if the file did not change)
+        :type diff: str
+        """
+        self.pending[index] = diff
+        while self.next_index in self.pending:
+            diff = self.pending.pop(self.next_index)
+            if diff:
+                self.output.write(diff)
+                self.written += 1
+            self.next_index += 1
+        self.output.flush()
+
+    def flush(self):
+        """Writes the diffs still held back, if some previous file never completed."""
+        for index in sorted(self.pending):
+            if self.pending[index]:
+                self.output.write(self.pending[index])
+                self.written += 1
+        self.pending = {}
+        self.output.flush()
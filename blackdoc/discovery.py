@@ -0,0 +1,409 @@
+import os
+import re
+from fnmatch import translate
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+GITIGNORE_NAME = ".gitignore"
+GIT_FOLDER = ".git"
+# The patterns of the repository that are not shared, relative to the git directory
+EXCLUDE_FILE = os.path.join("info", "exclude")
+
+
+def compile_patterns(
+    patterns: List[str],
+) -> Tuple[Optional[Pattern], Optional[Pattern]]:
+    """
+    Compiles a collection of folder names or glob patterns (e.g. "venv" or "*.egg-info") into two regular expressions:
+    one for the entries matching a single file or folder name, and one for the entries containing a "/", matching the
+    path relative to the root folder.
+
+    :param patterns: The names or glob patterns
+    :type patterns: List[str]
+    :returns: Tuple[Optional[Pattern], Optional[Pattern]] - the regular expressions for the names and for the relative
+        paths, or None when there are no entries of that kind
+    """
+
+    names = []
+    paths = []
+    for pattern in patterns:
+        pattern = pattern.strip().strip("/")
+        if not pattern:
+            continue
+        (paths if "/" in pattern else names).append(translate(pattern))
+
+    return (
+        re.compile("|".join(names)) if names else None,
+        re.compile("|".join(paths)) if paths else None,
+    )
+
+
+def gitignore_pattern(pattern: str) -> Tuple[Pattern, bool]:
+    """
+    Translates a single .gitignore pattern into a regular expression matching the paths relative to the folder
+    containing the .gitignore file.
+
+    :param pattern: The .gitignore pattern, without the leading "!" of negated patterns
+    :type pattern: str
+    :returns: Tuple[Pattern, bool] - the regular expression, and whether the pattern only matches folders
+    """
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+        elif pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+        elif pattern[index] == "*":
+            regex += "[^/]*"
+            index += 1
+        elif pattern[index] == "?":
+            regex += "[^/]"
+            index += 1
+        elif pattern[index] == "[" and "]" in pattern[index + 1 :]:
+            closing = pattern.index("]", index + 1)
+            regex += "[" + pattern[index + 1 : closing].replace("!", "^", 1) + "]"
+            index = closing + 1
+        else:
+            regex += re.escape(pattern[index])
+            index += 1
+
+    return re.compile(("^" if anchored else "^(?:.*/)?") + regex + "$"), dir_only
+
+
+class GitIgnore:
+    """
+    The patterns of a single .gitignore file, matched against the paths relative to the folder containing it.
+
+    Methods:
+    :method load:
+    :method is_ignored:
+
+
+    :param patterns: The (regular expression, is folder only, is negated) triplets of the .gitignore file
+    :type patterns: List[Tuple[Pattern, bool, bool]]
+    """
+
+    def __init__(self, patterns: List[Tuple[Pattern, bool, bool]]):
+        """
+        This overrides the built-in object Initializator. It is a class method of GitIgnore.
+
+        :param patterns: The (regular expression, is folder only, is negated) triplets of the .gitignore file
+        :type patterns: List[Tuple[Pattern, bool, bool]]
+        """
+
+        self.patterns = patterns
+
+    @staticmethod
+    def load(folder: str, file_name: str = GITIGNORE_NAME) -> Optional["GitIgnore"]:
+        """Parses the .gitignore file in the folder, if any.
+
+        :param folder: The folder that may contain a .gitignore file
+        :type folder: str
+        :param file_name: The path of the file with the patterns (relative to the folder, or absolute), whose
+            patterns are relative to the folder. (Default=GITIGNORE_NAME)
+        :type file_name: str
+        :returns: Optional[GitIgnore] - the parsed .gitignore file, or None if there is none
+        """
+        try:
+            with open(os.path.join(folder, file_name), "r") as fp:
+                lines = fp.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        patterns = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            regex, dir_only = gitignore_pattern(line[1:] if negated else line)
+            patterns.append((regex, dir_only, negated))
+        return GitIgnore(patterns) if patterns else None
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        """Checks whether the path is ignored. As in git, the last matching pattern wins.
+
+        :param relative_path: The path relative to the folder containing the .gitignore file
+        :type relative_path: str
+        :param is_dir: Whether the path is a folder
+        :type is_dir: bool
+        :returns: bool - True if the path is ignored, False otherwise
+        """
+        ignored = False
+        for regex, dir_only, negated in self.patterns:
+            if (is_dir or not dir_only) and regex.match(relative_path):
+                ignored = not negated
+        return ignored
+
+
+def find_git_dir(folder: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Finds the root of the git repository containing the folder, without running git.
+
+    :param folder: A folder that may be inside a git repository
+    :type folder: str
+    :returns: Tuple[Optional[str], Optional[str]] - the root of the repository and its git directory (the one with
+        the info/exclude file), or None and None if the folder is not inside a git repository
+    """
+
+    folder = os.path.abspath(folder)
+    while True:
+        git_path = os.path.join(folder, GIT_FOLDER)
+        if os.path.isdir(git_path):
+            return folder, git_path
+        if os.path.isfile(git_path):
+            # Worktrees and submodules: ".git" is a file with the path of the git directory
+            try:
+                with open(git_path, "r") as fp:
+                    content = fp.read().strip()
+            except (OSError, UnicodeDecodeError):
+                return folder, None
+            if not content.startswith("gitdir:"):
+                return folder, None
+            git_dir = os.path.join(folder, content[len("gitdir:") :].strip())
+            # The worktrees share the info/exclude file of the main repository
+            try:
+                with open(os.path.join(git_dir, "commondir"), "r") as fp:
+                    git_dir = os.path.join(git_dir, fp.read().strip())
+            except (OSError, UnicodeDecodeError):
+                pass
+            return folder, os.path.normpath(git_dir)
+
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None, None
+        folder = parent
+
+
+class FilesDiscovery:
+    """
+    Finds the Python files to process under the root folder. The folders in the blacklist (names or glob patterns),
+    and the ones ignored by the .gitignore files, are pruned before descending into them. As in git, the .gitignore
+    files of the parent folders (up to the root of the git repository) and the info/exclude file of the repository
+    apply as well, while the global excludes file of git (core.excludesFile) is not read. If the whitelist is not
+    empty, only the files inside a folder in the whitelist are returned.
+
+    Methods:
+    :method walk:
+    :method is_allowed:
+    :method _is_blacklisted:
+    :method _is_whitelisted:
+    :method _is_gitignored:
+    :method _get_gitignore:
+    :method _get_parent_gitignores:
+
+
+    :param root_dir: The folder where the search starts
+    :type root_dir: str
+    :param blacklist: The names or glob patterns of the folders (and files) to skip
+    :type blacklist: List[str]
+    :param whitelist: The names or glob patterns of the only folders to process (if not empty)
+    :type whitelist: List[str]
+    :param use_gitignore: If True, the files and folders ignored by the .gitignore files are skipped. (Default=True)
+    :type use_gitignore: bool
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        blacklist: List[str],
+        whitelist: List[str],
+        use_gitignore: bool = True,
+    ):
+        """
+        This overrides the built-in object Initializator. It is a class method of FilesDiscovery.
+
+        :param root_dir: The folder where the search starts
+        :type root_dir: str
+        :param blacklist: The names or glob patterns of the folders (and files) to skip
+        :type blacklist: List[str]
+        :param whitelist: The names or glob patterns of the only folders to process (if not empty)
+        :type whitelist: List[str]
+        :param use_gitignore: If True, the files and folders ignored by the .gitignore files are skipped.
+            (Default=True)
+        :type use_gitignore: bool
+        """
+
+        self.root_dir = root_dir
+        self.blacklist_names, self.blacklist_paths = compile_patterns(list(blacklist))
+        self.whitelist_names, self.whitelist_paths = compile_patterns(list(whitelist))
+        self.use_whitelist = bool(self.whitelist_names or self.whitelist_paths)
+        self.use_gitignore = use_gitignore
+        self.gitignores: Dict[str, Optional[GitIgnore]] = {}
+        self.parent_gitignores = self._get_parent_gitignores() if use_gitignore else []
+
+    def _is_blacklisted(self, name: str, relative_path: str) -> bool:
+        """Checks whether the file or folder is in the blacklist.
+
+        :param name: The name of the file or folder
+        :type name: str
+        :param relative_path: The path of the file or folder, relative to the root folder
+        :type relative_path: str
+        :returns: bool - True if the file or folder has to be skipped, False otherwise
+        """
+        return bool(
+            (self.blacklist_names and self.blacklist_names.match(name))
+            or (self.blacklist_paths and self.blacklist_paths.match(relative_path))
+        )
+
+    def _is_whitelisted(self, name: str, relative_path: str) -> bool:
+        """Checks whether the folder is in the whitelist.
+
+        :param name: The name of the folder
+        :type name: str
+        :param relative_path: The path of the folder, relative to the root folder
+        :type relative_path: str
+        :returns: bool - True if the folder is in the whitelist, False otherwise
+        """
+        return bool(
+            (self.whitelist_names and self.whitelist_names.match(name))
+            or (self.whitelist_paths and self.whitelist_paths.match(relative_path))
+        )
+
+    def _get_gitignore(self, folder: str) -> Optional[GitIgnore]:
+        """This is a getter method. Loads (once) the .gitignore file of the folder.
+
+        :param folder: The folder that may contain a .gitignore file
+        :type folder: str
+        :returns: Optional[GitIgnore] - the parsed .gitignore file, or None if there is none
+        """
+        if folder not in self.gitignores:
+            self.gitignores[folder] = GitIgnore.load(folder)
+        return self.gitignores[folder]
+
+    def _get_parent_gitignores(self) -> List[Tuple[str, GitIgnore]]:
+        """This is a getter method. Loads the info/exclude file of the git repository containing the root folder, and
+        the .gitignore files of the folders between the root of the repository and the root folder (excluded).
+
+        :returns: List[Tuple[str, GitIgnore]] - the (folder, parsed patterns) pairs, from the root of the repository
+        """
+        top_dir, git_dir = find_git_dir(self.root_dir)
+        if top_dir is None:
+            return []
+
+        gitignores = []
+        if git_dir is not None:
+            exclude = GitIgnore.load(top_dir, os.path.join(git_dir, EXCLUDE_FILE))
+            if exclude:
+                gitignores.append((top_dir, exclude))
+
+        # The root folder is inside the root of the repository, found by going up from it
+        folders = []
+        folder = os.path.abspath(self.root_dir)
+        while folder != top_dir:
+            folder = os.path.dirname(folder)
+            folders.append(folder)
+        for folder in reversed(folders):
+            gitignore = GitIgnore.load(folder)
+            if gitignore:
+                gitignores.append((folder, gitignore))
+        return gitignores
+
+    def _is_gitignored(self, path: str, is_dir: bool, gitignores: list) -> bool:
+        """Checks whether the file or folder is ignored by any of the .gitignore files of its parent folders.
+
+        :param path: The path of the file or folder
+        :type path: str
+        :param is_dir: Whether the path is a folder
+        :type is_dir: bool
+        :param gitignores: The (folder, parsed .gitignore) pairs of the parent folders
+        :type gitignores: list
+        :returns: bool - True if the file or folder is ignored, False otherwise
+        """
+        return any(
+            gitignore.is_ignored(
+                os.path.relpath(path, folder).replace(os.sep, "/"), is_dir
+            )
+            for folder, gitignore in gitignores
+        )
+
+    def walk(self) -> Iterator[str]:
+        """Yields the paths of the Python files to process, as soon as they are found.
+
+        :returns: Iterator[str] - the paths of the Python files
+        """
+        stack = [(self.root_dir, not self.use_whitelist, self.parent_gitignores)]
+        while stack:
+            folder, whitelisted, gitignores = stack.pop()
+            if self.use_gitignore:
+                gitignore = self._get_gitignore(folder)
+                if gitignore:
+                    gitignores = gitignores + [(folder, gitignore)]
+
+            try:
+                entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subfolders = []
+            for entry in entries:
+                relative_path = os.path.relpath(entry.path, self.root_dir).replace(
+                    os.sep, "/"
+                )
+                if self._is_blacklisted(entry.name, relative_path):
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    if not self._is_gitignored(entry.path, True, gitignores):
+                        subfolders.append(
+                            (
+                                entry.path,
+                                whitelisted
+                                or self._is_whitelisted(entry.name, relative_path),
+                                gitignores,
+                            )
+                        )
+
+                elif (
+                    whitelisted
+                    and entry.name.endswith(".py")
+                    and entry.is_file()
+                    and not self._is_gitignored(entry.path, False, gitignores)
+                ):
+                    yield entry.path
+
+            stack.extend(reversed(subfolders))
+
+    def is_allowed(self, file_path: str) -> bool:
+        """Checks whether the file would be returned by the search, without walking the whole tree.
+
+        :param file_path: The path of the file
+        :type file_path: str
+        :returns: bool - True if the file has to be processed, False otherwise
+        """
+        relative_path = os.path.relpath(file_path, self.root_dir).replace(os.sep, "/")
+        if relative_path.startswith("../"):
+            return False
+
+        parts = relative_path.split("/")
+        whitelisted = not self.use_whitelist
+        folder = self.root_dir
+        gitignores = list(self.parent_gitignores)
+
+        for index, name in enumerate(parts):
+            is_dir = index < len(parts) - 1
+            path = os.path.join(folder, name)
+            if self.use_gitignore:
+                gitignore = self._get_gitignore(folder)
+                if gitignore:
+                    gitignores.append((folder, gitignore))
+
+            if self._is_blacklisted(
+                name, "/".join(parts[: index + 1])
+            ) or self._is_gitignored(path, is_dir, gitignores):
+                return False
+            if is_dir:
+                whitelisted = whitelisted or self._is_whitelisted(
+                    name, "/".join(parts[: index + 1])
+                )
+            folder = path
+
+        return whitelisted
@@ -1,12 +1,30 @@
+import difflib
+import filecmp
 import os
-
+import shutil
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from blackdoc.backup import FilesBackup
+from blackdoc.black import black_code
+from blackdoc.isort import isort_code
+from blackdoc.lexicon import is_known_verb
+from blackdoc.line_buffer import LineBuffer
+from blackdoc.nlp_cache import IdentifiersCache
 from blackdoc.parser.classes_extractor import ClassesExtractor
-from blackdoc.parser.fileParser import FileParser
+from blackdoc.parser.fileParser import (
+    DEFAULT_PARSER_BACKEND,
+    ChunkedFileParser,
+    FileParser,
+)
 from blackdoc.parser.methods_extractor import MethodsExtractor
 from blackdoc.parser.exceptions_extractor import ExceptionsExtractor
+from blackdoc.parser.records import ClassRecord, MethodRecord, RaiseRecord
+from blackdoc.timing import StageTimer
 import logging
 
 logger = logging.getLogger(__name__)
+# The suffix of the temporary file the documented code is written to, before it replaces the file
+TEMP_SUFFIX = ".blackdoc_tmp"
 PREFAB_METHOD_EXPLANATIONS = {
     "get": "This is a getter method.",
     "add": "This is an adder method.",
@@ -48,8 +66,12 @@ class DocumentFile:
 
     Methods:
     :method add_docstring_2_code_element:
+    :method add_docstrings_2_code:
+    :method iter_docstrings_2_code:
+    :method find_docstring_splice:
     :method get_tabs:
     :method _get_code:
+    :method get_temp_path:
     :method generate_class_documentation:
     :method describe_method:
     :method method_docstring_exceptions:
@@ -61,9 +83,16 @@ class DocumentFile:
     :method method_docstring_parameters:
     :method generate_method_documentation:
     :method tokenize_identifier:
+    :method tokenize_identifiers:
+    :method stem_word:
+    :method is_verb:
     :method _set_code:
     :method cleanup_code:
     :method describe_class:
+    :method is_changed_element:
+    :method format_code:
+    :method get_diff:
+    :method _document_in_low_memory:
 
 
     :param filename: XXX
@@ -71,9 +100,45 @@ class DocumentFile:
     :param file_path: XXX
     :type file_path: str
     :param nlp_utilities: XXX
+    :param changed_lines: If given, only the elements overlapping these (start_line, end_line) ranges are documented.
+        (Default=None)
+    :type changed_lines: Optional[List[Tuple[int, int]]]
+    :param use_black: If True, the code is formatted with black before being written. (Default=False)
+    :type use_black: bool
+    :param use_isort: If True, the imports of the code are sorted with isort before being written. (Default=False)
+    :type use_isort: bool
+    :param backup: If given, the file is saved in the backup right before being overwritten. (Default=None)
+    :type backup: Optional[FilesBackup]
+    :param identifiers_cache: The NLP cache shared by the files documented by the current process. (Default=None)
+    :type identifiers_cache: Optional[IdentifiersCache]
+    :param parser_backend: The parser used to extract the elements of the code. (Default=DEFAULT_PARSER_BACKEND)
+    :type parser_backend: str
+    :param check_only: If True, the undocumented elements are only collected, and the file is never written.
+        (Default=False)
+    :type check_only: bool
+    :param diff_only: If True, the code is documented (and formatted) only in memory, and the file is never written.
+        (Default=False)
+    :type diff_only: bool
+    :param low_memory_threshold: If not 0, the files of at least this many bytes are documented in low memory mode.
+        (Default=0)
+    :type low_memory_threshold: int
     """
 
-    def __init__(self, filename: str, file_path: str, nlp_utilities):
+    def __init__(
+        self,
+        filename: str,
+        file_path: str,
+        nlp_utilities,
+        changed_lines: Optional[List[Tuple[int, int]]] = None,
+        use_black: bool = False,
+        use_isort: bool = False,
+        backup: Optional[FilesBackup] = None,
+        identifiers_cache: Optional[IdentifiersCache] = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        check_only: bool = False,
+        diff_only: bool = False,
+        low_memory_threshold: int = 0,
+    ):
         """
         This overrides the built-in object Initializator. It is a class method of DocumentFile.
 
@@ -82,18 +147,74 @@ class DocumentFile:
         :param file_path: XXX
         :type file_path: str
         :param nlp_utilities: XXX
+        :param changed_lines: If given, only the elements overlapping these (start_line, end_line) ranges are
+            documented. (Default=None)
+        :type changed_lines: Optional[List[Tuple[int, int]]]
+        :param use_black: If True, the code is formatted with black before being written. (Default=False)
+        :type use_black: bool
+        :param use_isort: If True, the imports of the code are sorted with isort before being written.
+            (Default=False)
+        :type use_isort: bool
+        :param backup: If given, the file is saved in the backup right before being overwritten. (Default=None)
+        :type backup: Optional[FilesBackup]
+        :param identifiers_cache: The NLP cache shared by the files documented by the current process. If not given,
+            the results are cached only for the current file. (Default=None)
+        :type identifiers_cache: Optional[IdentifiersCache]
+        :param parser_backend: The parser used to extract the elements of the code, one of PARSER_BACKENDS.
+            (Default=DEFAULT_PARSER_BACKEND)
+        :type parser_backend: str
+        :param check_only: If True, the undocumented elements are only collected (in undocumented_elements), without
+            generating their docstrings, formatting the code or writing the file. (Default=False)
+        :type check_only: bool
+        :param diff_only: If True, the code is documented (and formatted) only in memory, and the file is never
+            written, so that the changes can be shown with get_diff. (Default=False)
+        :type diff_only: bool
+        :param low_memory_threshold: If not 0, the files of at least this many bytes are documented in low memory
+            mode: the code is never read as a whole, but parsed one chunk of top-level statements at a time (see
+            ChunkedFileParser), and the documented code is streamed to the file (see _document_in_low_memory), unless
+            it has to be formatted. It is ignored when only the diff is requested. (Default=0)
+        :type low_memory_threshold: int
         """
 
         self.nlp_utilities = nlp_utilities
+        self.changed_lines = changed_lines
+        self.use_black = use_black
+        self.use_isort = use_isort
+        self.backup = backup
+        self.parser_backend = parser_backend
+        self.check_only = check_only
+        self.diff_only = diff_only
+        self.isort_changed = False
+        self.isort_time = 0.0
+        # The time spent in every stage of the documentation of the file
+        self.timer = StageTimer()
         self.filename = filename
         self.file_path = file_path
         self.parser = None
-        self.sorted_elements = []
-        self.classes = []
-        self.functions = []
-        self.exceptions = []
+        self.sorted_elements: List[Union[ClassRecord, MethodRecord]] = []
+        self.classes: List[ClassRecord] = []
+        self.functions: List[MethodRecord] = []
+        self.exceptions: List[RaiseRecord] = []
+        self.functions_exceptions: Dict[int, List[RaiseRecord]] = {}
+        self.undocumented_elements: List[Union[ClassRecord, MethodRecord]] = []
+        # True if the file has no class or function to document (e.g. an empty __init__.py)
+        self.nothing_to_document = False
         self.no_nlp = True if not nlp_utilities else False
-        self.code = self._get_code()
+        self.tokenized_identifiers: Dict[str, list] = {}
+        self.stemmed_words: Dict[str, str] = {}
+        self.identifiers_cache = (
+            identifiers_cache if identifiers_cache is not None else IdentifiersCache()
+        )
+        self.low_memory = (
+            bool(low_memory_threshold)
+            and not diff_only
+            and os.path.isfile(self.file_path)
+            and os.path.getsize(self.file_path) >= low_memory_threshold
+        )
+        # In low memory mode the code is read only when it has to be formatted
+        with self.timer.span("read"):
+            self.code = "" if self.low_memory else self._get_code()
+        self.original_code = self.code
 
     def _get_code(self) -> str:
         """
@@ -118,13 +239,57 @@ class DocumentFile:
 
         return code.replace("\t", "    ")
 
-    def _set_code(self):
+    def _set_code(self, temp_path: Optional[str] = None):
         """
-        This method is XXX . It is a class method of DocumentFile.
+        This method is XXX . It is a class method of DocumentFile. The file is written only if its code changed, and it
+        is saved in the backup (if any) right before. The code is written to a new file that then replaces the original
+        one, so that a hardlinked backup keeps the original content. If the file is a symlink, its target is replaced,
+        and a file with other hardlinks is rewritten in place (and copied in the backup), so that the links are kept.
+        The temporary file never outlives the call. Nothing is written when only the diff is requested. In low memory
+        mode, where the original code is not held, the new file is compared with the original one.
+
+        :param temp_path: If given, the new file, where the code was already written (in low memory mode, see
+            get_temp_path). (Default=None)
+        :type temp_path: Optional[str]
+        """
+
+        if self.diff_only or (not self.low_memory and self.code == self.original_code):
+            return
+
+        target_path = os.path.realpath(self.file_path)
+        try:
+            if temp_path is None:
+                temp_path = self.get_temp_path()
+                with self.timer.span("write"):
+                    with open(temp_path, "w") as fp:
+                        fp.write(self.code)
+            if self.low_memory and filecmp.cmp(temp_path, target_path, shallow=False):
+                return
+
+            in_place = os.stat(target_path).st_nlink > 1
+            if self.backup:
+                with self.timer.span("backup"):
+                    self.backup.save(self.file_path, copy=in_place)
+
+            with self.timer.span("write"):
+                if in_place:
+                    shutil.copyfile(temp_path, target_path)
+                else:
+                    shutil.copymode(target_path, temp_path)
+                    os.replace(temp_path, target_path)
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get_temp_path(self) -> str:
         """
+        This is a getter method. Returns the temporary file the documented code is written to, next to the file (or to
+        the target of the symlink), so that it can replace it.
 
-        with open(self.file_path, "w") as fp:
-            fp.write(self.code)
+        :returns: str - the path of the temporary file
+        """
+
+        return os.path.realpath(self.file_path) + TEMP_SUFFIX
 
     def parse_code(self) -> bool:
         """
@@ -133,72 +298,275 @@ class DocumentFile:
         :returns: bool - XXX
         """
 
-        self.parser = FileParser(self.code)
-        return self.parser.check_code_validity()
+        with self.timer.span("parse"):
+            if self.low_memory:
+                self.parser = ChunkedFileParser(self.file_path, self.parser_backend)
+            else:
+                self.parser = FileParser(self.code, self.parser_backend)
+            return self.parser.check_code_validity()
 
     def document_file(self):
         """
-        This method is XXX . It is a class method of DocumentFile.
+        This method is XXX . It is a class method of DocumentFile. In check only mode, the undocumented elements are
+        collected and nothing else is done.
         """
 
-        if not self.parse_code() or (
-            not self.parser.get_classes() and not self.parser.get_functions()
-        ):
+        # The empty files (e.g. most __init__.py) have nothing to check, and nothing to format or write
+        if not self.low_memory and not self.code.strip():
+            self.nothing_to_document = True
+            return self.check_only
+
+        if not self.parse_code():
             return False
 
-        self.classes = ClassesExtractor(
-            self.parser.get_classes(), self.parser.get_functions()
-        ).collect_data()
-        self.functions = MethodsExtractor(self.parser.get_functions()).collect_data()
-        self.exceptions = ExceptionsExtractor(
-            self.parser.get_exceptions()
-        ).collect_data()
+        if not self.parser.get_classes() and not self.parser.get_functions():
+            self.nothing_to_document = True
+            if self.check_only:
+                return True
+            if self.low_memory:
+                if not self.use_isort and not self.use_black:
+                    return False
+                with self.timer.span("read"):
+                    self.code = self._get_code()
+            self.format_code()
+            self._set_code()
+            return False
+
+        with self.timer.span("extract"):
+            self.functions = MethodsExtractor(
+                self.parser.get_functions()
+            ).collect_data()
+            self.classes = ClassesExtractor(
+                self.parser.get_classes(), self.functions
+            ).collect_data()
+            exceptions_extractor = ExceptionsExtractor(self.parser.get_exceptions())
+            self.exceptions = exceptions_extractor.collect_data()
+            self.functions_exceptions = exceptions_extractor.index_by_function(
+                self.functions
+            )
 
         self.sorted_elements = sorted(
             self.classes + self.functions,
-            key=lambda elem: elem.get("start_line"),
+            key=lambda elem: elem.start_line,
             reverse=True,
         )
 
-        for elem_index in range(len(self.sorted_elements)):
-            current_elem = self.sorted_elements[elem_index]
-            if (
-                elem_index == 0
-                or not any(
-                    current_elem.get("start_line") == prev_elem.get("start_line")
-                    for prev_elem in self.sorted_elements[:elem_index]
-                )
-            ) and not current_elem.get("documentation").strip():
-                new_docstring = self.generate_element_docstring(current_elem)
-                self.code = self.add_docstring_2_code_element(
-                    new_docstring, current_elem.get("start_line")
-                )
+        # The elements reported more than once by the parser (same start line) are documented once
+        undocumented_elements = []
+        start_lines = set()
+        for current_elem in self.sorted_elements:
+            if current_elem.start_line in start_lines:
+                continue
+            start_lines.add(current_elem.start_line)
+            if not current_elem.documentation.strip() and self.is_changed_element(
+                current_elem
+            ):
+                undocumented_elements.append(current_elem)
 
-        self.code = self.cleanup_code(self.code)
-        if not self.parse_code():
+        if self.check_only:
+            self.undocumented_elements = undocumented_elements
+            return True
+
+        if not self.no_nlp:
+            with self.timer.span("nlp"):
+                self.tokenize_identifiers(undocumented_elements)
+
+        with self.timer.span("generate"):
+            docstrings = [
+                (element.start_line, self.generate_element_docstring(element))
+                for element in undocumented_elements
+            ]
+        if self.low_memory and not self.use_isort and not self.use_black:
+            return self._document_in_low_memory(docstrings)
+
+        with self.timer.span("generate"):
+            if self.low_memory:
+                # The formatters need the whole code, that is built from the lines of the file
+                with LineBuffer(self.file_path) as code_lines:
+                    self.code = "\n".join(
+                        self.iter_docstrings_2_code(code_lines, docstrings)
+                    )
+            else:
+                self.code = self.add_docstrings_2_code(docstrings)
+            self.code = self.cleanup_code(self.code)
+        with self.timer.span("parse"):
+            valid_code = FileParser.check_syntax(self.code)
+        if not valid_code:
+            # The broken code is discarded, so that it does not show up in the diff either
+            self.code = self.original_code
             return False
 
+        self.format_code()
         self._set_code()
         return True
 
+    def _document_in_low_memory(self, docstrings: List[Tuple[int, str]]) -> bool:
+        """
+        Inserts the docstrings streaming the lines of the file, read back with a LineBuffer, to a temporary file that
+        then replaces the original one (see _set_code), so that the code is never held as a whole. Like the parsing,
+        the syntax check of the documented code is done one chunk of top-level statements at a time.
+
+        :param docstrings: Collection of (start_line, docstring) pairs, one for every element to document
+        :type docstrings: List[Tuple[int, str]]
+        :returns: bool - False if the documented code is not valid
+        """
+
+        self.parser = None
+        temp_path = self.get_temp_path()
+
+        try:
+            with self.timer.span("generate"):
+                with LineBuffer(self.file_path) as code_lines, open(
+                    temp_path, "w"
+                ) as fp:
+                    for index, line in enumerate(
+                        self.iter_docstrings_2_code(code_lines, docstrings)
+                    ):
+                        if index:
+                            fp.write("\n")
+                        fp.write(self.cleanup_code(line))
+            with self.timer.span("parse"):
+                valid_code = ChunkedFileParser.check_file_syntax(temp_path)
+            if valid_code:
+                self._set_code(temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return valid_code
+
+    def get_diff(self, path_label: str) -> str:
+        """
+        This is a getter method. Returns the unified diff between the original code of the file and the documented
+        one.
+
+        :param path_label: The path of the file shown in the diff headers
+        :type path_label: str
+        :returns: str - the unified diff, or an empty string if the code did not change
+        """
+
+        lines = []
+        for line in difflib.unified_diff(
+            self.original_code.splitlines(keepends=True),
+            self.code.splitlines(keepends=True),
+            fromfile=f"a/{path_label}",
+            tofile=f"b/{path_label}",
+        ):
+            lines.append(line)
+            if not line.endswith("\n"):
+                lines.append("\n\\ No newline at end of file\n")
+        return "".join(lines)
+
+    def format_code(self):
+        """
+        Formats the code in memory, before it is written, with the enabled formatters. The imports are sorted first,
+        so that black has the last word on the layout of the code.
+        """
+
+        if self.use_isort:
+            with self.timer.span("isort"):
+                sorted_code = isort_code(self.code, self.file_path)
+            self.isort_time = self.timer.stages["isort"]
+            self.isort_changed = sorted_code != self.code
+            self.code = sorted_code
+        if self.use_black:
+            with self.timer.span("black"):
+                self.code = black_code(self.code, self.file_path)
+
+    def is_changed_element(self, element: Union[ClassRecord, MethodRecord]) -> bool:
+        """
+        Checks whether the element overlaps any of the changed line ranges. If no changed line ranges were given, every
+        element is considered changed.
+
+        :param element: The class or method element
+        :type element: Union[ClassRecord, MethodRecord]
+        :returns: bool - True if the element has to be documented, False otherwise
+        """
+
+        if self.changed_lines is None:
+            return True
+        return any(
+            element.start_line <= end_line and element.end_line >= start_line
+            for start_line, end_line in self.changed_lines
+        )
+
     def add_docstring_2_code_element(self, docstring: str, start_line: int) -> str:
         """
-        This is an adder method. This method is XXX . It is a class method of DocumentFile.
+        This is an adder method. Inserts a single docstring in the code element starting at start_line.
 
-        :param docstring: XXX
+        :param docstring: The docstring to insert
         :type docstring: str
-        :param start_line: XXX
+        :param start_line: The (1-based) line where the code element definition starts
         :type start_line: int
-        :returns: str - XXX
+        :returns: str - the code with the docstring inserted
+        """
+
+        return self.add_docstrings_2_code([(start_line, docstring)])
+
+    def add_docstrings_2_code(self, docstrings: List[Tuple[int, str]]) -> str:
+        """
+        This is an adder method. Inserts every docstring in the code with a single pass over the lines of the code.
+        The insertion points are all located on the original lines first, and then the new code is built once,
+        instead of splitting and joining the whole code for every docstring.
+
+        :param docstrings: Collection of (start_line, docstring) pairs, one for every element to document, in the
+            order in which they are generated
+        :type docstrings: List[Tuple[int, str]]
+        :returns: str - the code with all the docstrings inserted
+        """
+
+        return "\n".join(self.iter_docstrings_2_code(self.code.split("\n"), docstrings))
+
+    def iter_docstrings_2_code(
+        self, code_lines: Sequence[str], docstrings: List[Tuple[int, str]]
+    ) -> Iterator[str]:
+        """
+        Yields the lines of the code with the docstrings inserted. Only the insertion points are located in advance,
+        and the lines are then yielded one by one, so that the documented code never needs to be held in memory.
+
+        :param code_lines: The lines of the code (a list, or a LineBuffer)
+        :type code_lines: Sequence[str]
+        :param docstrings: Collection of (start_line, docstring) pairs, one for every element to document
+        :type docstrings: List[Tuple[int, str]]
+        :returns: Iterator[str] - the lines of the documented code, without their line endings
+        """
+
+        splices: Dict[int, Tuple[int, List[str]]] = {}
+        for start_line, docstring in docstrings:
+            splice = self.find_docstring_splice(code_lines, start_line)
+            if splice is not None:
+                splice_start, splice_end = splice
+                splices[splice_start] = (splice_end, docstring.split("\n") + [""])
+
+        current_line = 0
+        for splice_start in sorted(splices):
+            splice_end, docstring_lines = splices[splice_start]
+            for line_index in range(current_line, splice_start):
+                yield code_lines[line_index]
+            yield from docstring_lines
+            current_line = max(current_line, splice_end)
+        for line_index in range(current_line, len(code_lines)):
+            yield code_lines[line_index]
+
+    @staticmethod
+    def find_docstring_splice(code_lines: Sequence[str], start_line: int):
+        """
+        Finds where the docstring of the element starting at start_line has to be placed: right after the line closing
+        the element definition, replacing every empty line (or empty docstring) before the first statement of its body.
+
+        :param code_lines: The lines of the code
+        :type code_lines: Sequence[str]
+        :param start_line: The (1-based) line where the code element definition starts
+        :type start_line: int
+        :returns: Optional[Tuple[int, int]] - the (start, end) indexes of the lines to replace with the docstring, or
+            None if the body of the element could not be found
         """
 
-        new_code = self.code.split("\n")
         existing_docstring = False
-        start_line = start_line - 1
         first_line = -1
 
-        for line_index in range(start_line, len(new_code)):
-            if first_line == -1 and new_code[line_index].strip().endswith(":"):
+        for line_index in range(start_line - 1, len(code_lines)):
+            line = code_lines[line_index].strip()
+            if first_line == -1 and line.endswith(":"):
                 first_line = line_index
                 continue
 
@@ -206,8 +574,7 @@ class DocumentFile:
                 first_line != -1
                 and not existing_docstring
                 and any(
-                    new_code[line_index].strip().startswith(mark)
-                    and new_code[line_index].strip().count(mark) % 2 != 0
+                    line.startswith(mark) and line.count(mark) % 2 != 0
                     for mark in ("'''", '"""')
                 )
             ):
@@ -218,30 +585,21 @@ class DocumentFile:
                 first_line != -1
                 and existing_docstring
                 and any(
-                    new_code[line_index].strip().endswith(mark)
-                    and new_code[line_index].strip().count(mark) % 2 != 0
+                    line.endswith(mark) and line.count(mark) % 2 != 0
                     for mark in ("'''", '"""')
                 )
             ):
                 existing_docstring = False
                 continue
 
-            if (
-                first_line != -1
-                and not existing_docstring
-                and new_code[line_index].strip()
-            ):
-                new_code = (
-                    new_code[: first_line + 1]
-                    + docstring.split("\n")
-                    + [""]
-                    + new_code[line_index:]
-                )
-                break
+            if first_line != -1 and not existing_docstring and line:
+                return first_line + 1, line_index
 
-        return "\n".join(new_code)
+        return None
 
-    def generate_element_docstring(self, element: dict) -> str:
+    def generate_element_docstring(
+        self, element: Union[ClassRecord, MethodRecord]
+    ) -> str:
         """
         Generally speaking, when two nouns (common nouns, not name of people), the second word has 'posession'
         of the first word (e.g. thread manager -> manager of threads). Anyway, usually it's the last word the control
@@ -252,11 +610,13 @@ class DocumentFile:
         tabs = self.get_tabs(element)
         quote_marks = '"""'
 
-        if element.get("genus") == "class":
+        if isinstance(element, ClassRecord):
             documentation = self.generate_class_documentation(element, tabs)
         else:
             documentation = self.generate_method_documentation(
-                element, exceptions_info=self.exceptions, tabs=tabs
+                element,
+                exceptions_info=self.functions_exceptions.get(element.start_line, []),
+                tabs=tabs,
             )
 
         return (
@@ -265,7 +625,9 @@ class DocumentFile:
 
     # Class documentation
 
-    def generate_class_documentation(self, class_element: dict, tabs: str) -> str:
+    def generate_class_documentation(
+        self, class_element: ClassRecord, tabs: str
+    ) -> str:
         """
         documentation generation functionality
         documentation NOUN compound []
@@ -280,52 +642,50 @@ class DocumentFile:
         thread PROPN compound []
         manager NOUN ROOT [thread]
         """
-        docstring = self.describe_class(class_element.get("name"), tabs)
+        docstring = self.describe_class(class_element.name, tabs)
         parameters = self.class_docstring_parameters(class_element, tabs)
         return docstring + parameters
 
-    def class_docstring_parameters(self, class_element: dict, tabs: str) -> str:
+    def class_docstring_parameters(self, class_element: ClassRecord, tabs: str) -> str:
         """
         This method is XXX . It is a class method of DocumentFile.
 
         :param class_element: XXX
-        :type class_element: dict
+        :type class_element: ClassRecord
         :param tabs: XXX
         :type tabs: str
         :returns: str - XXX
         """
-        if not class_element["inheritance"]:
+        if not class_element.inheritance:
             info = ""
 
         else:
             info = (
                 f"\n{tabs}It extends the "
-                f"{('class ' if len(class_element['inheritance']) == 1 else 'classes ')}"
-                f"{', '.join(class_element['inheritance'])}.\n\n"
+                f"{('class ' if len(class_element.inheritance) == 1 else 'classes ')}"
+                f"{', '.join(class_element.inheritance)}.\n\n"
             )
 
-        if class_element.get("methods"):
+        if class_element.methods:
             info += f"\n{tabs}Methods:\n"
-            for method in set(class_element["methods"]):
+            for method in set(class_element.methods):
                 info += f"{tabs}:method {method}: XXX\n"
             info += "\n"
 
         # Uncomment to add class attributes to the generated docstring for classes
-        # if class_element.get("class_variables"):
+        # if class_element.class_variables:
         #     info += f"\n{tabs}Attributes:\n"
-        #     for attr in class_element["class_variables"]:
+        #     for attr in class_element.class_variables:
         #         info += f"{tabs}:ivar {attr.get('name')}: XXX\n"
         #     info += "\n"
 
-        if class_element["__init__"]:
-            if class_element["__init__"]["documentation"]:
-                for line in (
-                    class_element["__init__"]["documentation"].strip().split("\n")
-                ):
+        if class_element.init_method:
+            if class_element.init_method.documentation:
+                for line in class_element.init_method.documentation.strip().split("\n"):
                     info += f"{tabs}{line.strip()}\n"
             else:
                 info += self.method_docstring_parameters(
-                    class_element["__init__"], tabs
+                    class_element.init_method, tabs
                 )
             info += "\n"
         return info
@@ -333,43 +693,37 @@ class DocumentFile:
     # Functions and Methods
 
     def generate_method_documentation(
-        self, method_element: dict, exceptions_info: list, tabs: str = ""
+        self,
+        method_element: MethodRecord,
+        exceptions_info: List[RaiseRecord],
+        tabs: str = "",
     ) -> str:
         """
         This method is XXX . It is a class method of DocumentFile.
 
         :param method_element: XXX
-        :type method_element: dict
-        :param exceptions_info: XXX
-        :type exceptions_info: list
+        :type method_element: MethodRecord
+        :param exceptions_info: The try-except blocks of the method (not of its inner functions)
+        :type exceptions_info: List[RaiseRecord]
         :param tabs: XXX. (Default="")
         :type tabs: str
         :returns: str - XXX
         """
-        method_exceptions = []
-        if exceptions_info:
-            method_exceptions = [
-                exceptions["exception"]
-                for exceptions in exceptions_info
-                if exceptions["start_line"] > method_element["start_line"]
-                and exceptions["end_line"] < method_element["end_line"]
-            ]
-
         result = self.describe_method(method_element, tabs)
         result += self.method_docstring_parameters(method_element, tabs)
 
-        if method_exceptions:
-            result += self.method_docstring_exceptions(method_exceptions, tabs)
+        if exceptions_info:
+            result += self.method_docstring_exceptions(exceptions_info, tabs)
 
         return result
 
     @staticmethod
-    def method_docstring_parameters(method_info: dict, tabs: str) -> str:
+    def method_docstring_parameters(method_info: MethodRecord, tabs: str) -> str:
         """
         This method is XXX . It is a static class method of DocumentFile.
 
         :param method_info: XXX
-        :type method_info: dict
+        :type method_info: MethodRecord
         :param tabs: XXX
         :type tabs: str
         :returns: str - XXX
@@ -377,19 +731,19 @@ class DocumentFile:
         result = ""
         arguments = []
 
-        for argument_index in range(len(method_info["parameters"])):
-            argument = method_info["parameters"][argument_index]
+        for argument_index in range(len(method_info.parameters)):
+            argument = method_info.parameters[argument_index]
 
-            if "self" == argument["name"] and argument_index == 0:
+            if "self" == argument.name and argument_index == 0:
                 continue
 
             arguments.append(
                 {
-                    "name": argument["name"],
+                    "name": argument.name,
                     "type": ""
-                    if not argument["param_type_hint"]
-                    else argument["param_type_hint"],
-                    "default": argument["value"],
+                    if not argument.param_type_hint
+                    else argument.param_type_hint,
+                    "default": argument.value,
                 }
             )
 
@@ -402,54 +756,172 @@ class DocumentFile:
             if param["type"]:
                 result += f"\n{tabs}:type {param['name']}: {param['type']}"
 
-        if method_info["returns"]:
-            result += f"\n{tabs}:returns: {method_info['returns']} - XXX"
+        if method_info.returns:
+            result += f"\n{tabs}:returns: {method_info.returns} - XXX"
         return result
 
     @staticmethod
-    def method_docstring_exceptions(exceptions, tabs: str) -> str:
+    def method_docstring_exceptions(exceptions: List[RaiseRecord], tabs: str) -> str:
         """
         This method is XXX . It is a static class method of DocumentFile.
 
         :param exceptions: XXX
+        :type exceptions: List[RaiseRecord]
         :param tabs: XXX
         :type tabs: str
         :returns: str - XXX
         """
         result = ""
         for exception in exceptions:
-            result += f"\n{tabs}:raises {', '.join([exception['name']])}: XXX"
+            result += f"\n{tabs}:raises {', '.join([exception.name])}: XXX"
         return result
 
     # NLP-based
 
     @staticmethod
-    def get_tabs(element: dict) -> str:
+    def get_tabs(element: Union[ClassRecord, MethodRecord]) -> str:
         """
         This is a getter method. This method is XXX . It is a static class method of DocumentFile.
 
         :param element: XXX
-        :type element: dict
+        :type element: Union[ClassRecord, MethodRecord]
         :returns: str - XXX
         """
 
-        return "\t" * (len(element.get("complete_context")))
+        return "\t" * (len(element.complete_context))
+
+    def tokenize_identifiers(self, elements: List[Union[ClassRecord, MethodRecord]]):
+        """
+        Tokenizes at once the names of all the given elements, so that the NLP utilities are called a handful of times
+        per file instead of several times for every element: the words of all the names are spell checked together,
+        all the phrases are tagged together and the leading verbs of the method names are stemmed together. The names
+        and the words already in the NLP cache are not analyzed again. The results are kept for tokenize_identifier
+        and stem_word.
+
+        :param elements: The classes and methods that are going to be documented
+        :type elements: List[Union[ClassRecord, MethodRecord]]
+        """
+
+        names = []
+        method_names = []
+        for element in elements:
+            name = element.name
+            if element.genus != "class":
+                if name.lower() in PREFAB_METHOD_DESCRIPTIONS:
+                    continue
+                if name not in method_names:
+                    method_names.append(name)
+
+            if name in self.tokenized_identifiers or name in names:
+                continue
+            tokenized_phrase = self.identifiers_cache.get("tokens", name)
+            if tokenized_phrase is None:
+                names.append(name)
+            else:
+                self.tokenized_identifiers[name] = tokenized_phrase
+
+        if names:
+            separated_words = [self.nlp_utilities.use_segmenter(name) for name in names]
+            all_words = [word for words in separated_words for word in words]
+            all_corrected_words = self.nlp_utilities.use_spell_checker(all_words)
+            if len(all_corrected_words) == len(all_words):
+                corrected_words = []
+                for words in separated_words:
+                    corrected_words.append(all_corrected_words[: len(words)])
+                    all_corrected_words = all_corrected_words[len(words) :]
+            else:
+                corrected_words = [
+                    self.nlp_utilities.use_spell_checker(words)
+                    for words in separated_words
+                ]
+
+            tokenized_phrases = self.nlp_utilities.use_pos_dependency_tagger(
+                [" ".join(words) for words in corrected_words]
+            )
+            for name, tokenized_phrase in zip(names, tokenized_phrases):
+                self.tokenized_identifiers[name] = tokenized_phrase
+                self.identifiers_cache.put("tokens", name, tokenized_phrase)
+
+        verbs = []
+        for name in method_names:
+            tokenized_phrase = self.tokenized_identifiers.get(name)
+            if not tokenized_phrase:
+                continue
+            word = tokenized_phrase[0]["word"]
+            if (
+                word in self.stemmed_words
+                or word in verbs
+                or not self.is_verb(tokenized_phrase[0])
+            ):
+                continue
+            stemmed_word = self.identifiers_cache.get("stems", word)
+            if stemmed_word is None:
+                verbs.append(word)
+            else:
+                self.stemmed_words[word] = stemmed_word
+
+        if verbs:
+            stemmed_words = self.nlp_utilities.use_words_stemmer(verbs)
+            if len(stemmed_words) == len(verbs):
+                for word, stemmed_word in zip(verbs, stemmed_words):
+                    self.stemmed_words[word] = stemmed_word["stemmed"]
+                    self.identifiers_cache.put("stems", word, stemmed_word["stemmed"])
 
     def tokenize_identifier(self, element_name: str) -> list:
         """
-        This method is XXX . It is a class method of DocumentFile.
+        Tokenizes the name of a class or method, reusing the result of tokenize_identifiers or of the NLP cache when
+        available.
 
-        :param element_name: XXX
+        :param element_name: The name of the class or method
         :type element_name: str
-        :returns: list - XXX
+        :returns: list - a copy of the tagged words of the name, which can be freely modified
         """
 
-        separated_words = self.nlp_utilities.use_segmenter(element_name)
-        corrected_words = self.nlp_utilities.use_spell_checker(separated_words)
-        separated_corrected_words = " ".join([word for word in corrected_words])
-        return self.nlp_utilities.use_pos_dependency_tagger(
-            [separated_corrected_words]
-        )[0]
+        if element_name not in self.tokenized_identifiers:
+            tokenized_phrase = self.identifiers_cache.get("tokens", element_name)
+            if tokenized_phrase is None:
+                separated_words = self.nlp_utilities.use_segmenter(element_name)
+                corrected_words = self.nlp_utilities.use_spell_checker(separated_words)
+                separated_corrected_words = " ".join([word for word in corrected_words])
+                tokenized_phrase = self.nlp_utilities.use_pos_dependency_tagger(
+                    [separated_corrected_words]
+                )[0]
+                self.identifiers_cache.put("tokens", element_name, tokenized_phrase)
+            self.tokenized_identifiers[element_name] = tokenized_phrase
+        return list(self.tokenized_identifiers[element_name])
+
+    def stem_word(self, word: str) -> str:
+        """
+        Stems the word, reusing the result of tokenize_identifiers or of the NLP cache when available.
+
+        :param word: The word to stem
+        :type word: str
+        :returns: str - the stemmed word
+        """
+
+        if word not in self.stemmed_words:
+            stemmed_word = self.identifiers_cache.get("stems", word)
+            if stemmed_word is None:
+                stemmed_word = self.nlp_utilities.use_words_stemmer([word])[0][
+                    "stemmed"
+                ]
+                self.identifiers_cache.put("stems", word, stemmed_word)
+            self.stemmed_words[word] = stemmed_word
+        return self.stemmed_words[word]
+
+    def is_verb(self, tagged_word: dict) -> bool:
+        """
+        Checks whether the tagged word is a verb, either by its part of speech or because it is one of the verbs known
+        by the NLP utilities, which are loaded once per process.
+
+        :param tagged_word: The word, together with its part of speech and its role
+        :type tagged_word: dict
+        :returns: bool - True if the word is a verb, False otherwise
+        """
+
+        return tagged_word["pos_tag"] == "VERB" or is_known_verb(
+            tagged_word["word"], self.nlp_utilities
+        )
 
     def describe_class(self, element_name: str, tabs: str) -> str:
         """
@@ -486,18 +958,18 @@ class DocumentFile:
 
         return result + ".\n"
 
-    def describe_method(self, element: dict, tabs: str) -> str:
+    def describe_method(self, element: MethodRecord, tabs: str) -> str:
         """
         This method is XXX . It is a class method of DocumentFile.
 
         :param element: XXX
-        :type element: dict
+        :type element: MethodRecord
         :param tabs: XXX
         :type tabs: str
         :returns: str - XXX
         """
 
-        element_name = element.get("name")
+        element_name = element.name
         result = f"{tabs}"
 
         if any(
@@ -524,16 +996,11 @@ class DocumentFile:
             result += "This method "
             tokenized_phrase = self.tokenize_identifier(element_name)
 
-            if (
-                tokenized_phrase[0]["pos_tag"] == "VERB"
-                or tokenized_phrase[0]["word"] in self.nlp_utilities.initialize_verbs()
-            ):
-                stemmed_word = self.nlp_utilities.use_words_stemmer(
-                    [tokenized_phrase[0]["word"]]
-                )
+            if self.is_verb(tokenized_phrase[0]):
+                stemmed_word = self.stem_word(tokenized_phrase[0]["word"])
                 tokenized_phrase.pop(0)
                 result += (
-                    f"is for {stemmed_word[0]['stemmed']}ing"
+                    f"is for {stemmed_word}ing"
                     f"{('.'if not tokenized_phrase else ' the ' + ' '.join([word['word'] for word in tokenized_phrase]))}"
                 )
             else:
@@ -543,12 +1010,12 @@ class DocumentFile:
                     f"{' '.join([word['word'] for word in tokenized_phrase])}."
                 )
 
-        if element["genus"] == "class_method":
+        if element.genus == "class_method":
             result += f" It is a"
 
-            if not element["parameters"] or element["parameters"][0]["name"] != "self":
+            if not element.parameters or element.parameters[0].name != "self":
                 result += " static"
 
-            return f"{result} class method of {element['context']['context_name']}.\n"
+            return f"{result} class method of {element.context['context_name']}.\n"
         else:
             return f"{result} It is a global method.\n"
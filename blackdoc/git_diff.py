@@ -0,0 +1,274 @@
+import os
+import re
+import subprocess
+from typing import Dict, List, Tuple, Union
+
+from blackdoc.configs import log
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+# The escape sequences of the paths quoted by git (besides the octal ones)
+QUOTED_ESCAPES = {
+    "a": "\a",
+    "b": "\b",
+    "t": "\t",
+    "n": "\n",
+    "v": "\v",
+    "f": "\f",
+    "r": "\r",
+    '"': '"',
+    "\\": "\\",
+}
+QUOTED_ESCAPE = re.compile(r"\\([0-7]{3}|.)")
+
+
+def git_command(arguments: List[str], curr_dir: str) -> Union[str, None]:
+    """
+    Runs a git command in the given folder.
+
+    :param arguments: The arguments passed to git
+    :type arguments: List[str]
+    :param curr_dir: The folder in which git is executed
+    :type curr_dir: str
+    :returns: Union[str, None] - the standard output of the command, or None if the command failed
+    """
+
+    try:
+        # The paths with non-ASCII characters are printed as they are, instead of being quoted
+        result = subprocess.run(
+            ["git", "-c", "core.quotepath=off"] + arguments,
+            cwd=curr_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        log("git is not installed!", "error")
+        return None
+
+    if result.returncode:
+        log(
+            f"Error executing git {' '.join(arguments)}: {result.stderr.decode()}",
+            "error",
+        )
+        return None
+    return result.stdout.decode()
+
+
+def unquote_path(path: str) -> str:
+    """
+    Reads a path printed by git, that quotes (like a C string) the paths with special characters, and the non-ASCII
+    ones when core.quotepath is on.
+
+    :param path: The path, quoted or not
+    :type path: str
+    :returns: str - the path without quotes and escape sequences
+    """
+
+    if len(path) < 2 or not path.startswith('"') or not path.endswith('"'):
+        return path
+
+    # The octal escape sequences are the bytes of the UTF-8 encoding of the characters
+    path_bytes = bytearray()
+    position = 1
+    for escape in QUOTED_ESCAPE.finditer(path, 1, len(path) - 1):
+        path_bytes += path[position : escape.start()].encode()
+        sequence = escape.group(1)
+        if len(sequence) == 3:
+            path_bytes.append(int(sequence, 8))
+        else:
+            path_bytes += QUOTED_ESCAPES.get(sequence, sequence).encode()
+        position = escape.end()
+    path_bytes += path[position:-1].encode()
+    return path_bytes.decode(errors="surrogateescape")
+
+
+def parse_hunks(diff: str, root_dir: str) -> Dict[str, List[Tuple[int, int, int, int]]]:
+    """
+    Extracts the hunks of every file from a unified diff with no context lines.
+
+    :param diff: The output of git diff --unified=0
+    :type diff: str
+    :param root_dir: The root of the git repository, to which the paths in the diff are relative
+    :type root_dir: str
+    :returns: Dict[str, List[Tuple[int, int, int, int]]] - the (old_start, old_count, new_start, new_count) of every
+        hunk of every file, in the order of the lines
+    """
+
+    hunks = {}
+    current_file = None
+
+    for line in diff.split("\n"):
+        if line.startswith("+++ "):
+            path = unquote_path(line[4:].rstrip("\r"))
+            if path == "/dev/null":
+                current_file = None
+            else:
+                current_file = os.path.join(
+                    root_dir, path[2:] if path.startswith("b/") else path
+                )
+                hunks.setdefault(current_file, [])
+            continue
+
+        hunk = HUNK_HEADER.match(line)
+        if hunk and current_file:
+            old_start, old_count, new_start, new_count = (
+                int(value) if value is not None else 1 for value in hunk.groups()
+            )
+            hunks[current_file].append((old_start, old_count, new_start, new_count))
+
+    return hunks
+
+
+def parse_diff(diff: str, root_dir: str) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Extracts, from a unified diff with no context lines, the changed line ranges of every file in the new version.
+    A pure deletion is reported as the single line preceding it, so that the element it was removed from is still
+    considered changed.
+
+    :param diff: The output of git diff --unified=0
+    :type diff: str
+    :param root_dir: The root of the git repository, to which the paths in the diff are relative
+    :type root_dir: str
+    :returns: Dict[str, List[Tuple[int, int]]] - the (start_line, end_line) ranges changed in every file
+    """
+
+    changed_lines = {}
+    for path, hunks in parse_hunks(diff, root_dir).items():
+        changed_lines[path] = []
+        for _, _, start_line, count in hunks:
+            end_line = start_line + count - 1 if count else start_line
+            changed_lines[path].append((max(start_line, 1), max(end_line, 1)))
+    return changed_lines
+
+
+def map_line(line: int, hunks: List[Tuple[int, int, int, int]]) -> Tuple[int, int]:
+    """
+    Finds where a line of the old version of a file is in its new version.
+
+    :param line: The (1-based) line in the old version
+    :type line: int
+    :param hunks: The (old_start, old_count, new_start, new_count) hunks between the two versions, in order
+    :type hunks: List[Tuple[int, int, int, int]]
+    :returns: Tuple[int, int] - the range of lines in the new version: the line itself, or the lines that replaced it
+        if it was changed
+    """
+
+    offset = 0
+    for old_start, old_count, new_start, new_count in hunks:
+        # A pure insertion is placed after old_start, the other hunks replace the lines from old_start
+        if line < old_start or (not old_count and line == old_start):
+            break
+        if line < old_start + old_count:
+            return max(new_start, 1), max(new_start + new_count - 1, new_start, 1)
+        offset += new_count - old_count
+    return line + offset, line + offset
+
+
+def map_changed_lines(
+    changed_lines: List[Tuple[int, int]], hunks: List[Tuple[int, int, int, int]]
+) -> List[Tuple[int, int]]:
+    """
+    Moves the changed line ranges of the old version of a file to its new version (e.g. the ranges of the staged
+    changes, that refer to the index, to the working tree).
+
+    :param changed_lines: The (start_line, end_line) ranges in the old version
+    :type changed_lines: List[Tuple[int, int]]
+    :param hunks: The (old_start, old_count, new_start, new_count) hunks between the two versions, in order
+    :type hunks: List[Tuple[int, int, int, int]]
+    :returns: List[Tuple[int, int]] - the ranges in the new version
+    """
+
+    mapped_lines = []
+    for start_line, end_line in changed_lines:
+        mapped_start = map_line(start_line, hunks)[0]
+        mapped_end = map_line(end_line, hunks)[1]
+        mapped_lines.append((mapped_start, max(mapped_start, mapped_end)))
+    return mapped_lines
+
+
+def get_untracked_files(curr_dir: str, root_dir: str) -> Union[List[str], None]:
+    """
+    Retrieves the untracked (and not ignored) Python files, that git diff does not report.
+
+    :param curr_dir: A folder inside the git repository, whose files are searched
+    :type curr_dir: str
+    :param root_dir: The root of the git repository
+    :type root_dir: str
+    :returns: Union[List[str], None] - the paths of the untracked files, or None if git could not be used
+    """
+
+    output = git_command(
+        [
+            "ls-files",
+            "--others",
+            "--exclude-standard",
+            "--full-name",
+            "-z",
+            "--",
+            "*.py",
+        ],
+        curr_dir,
+    )
+    if output is None:
+        return None
+    return [os.path.join(root_dir, path) for path in output.split("\0") if path]
+
+
+def get_changed_lines(
+    curr_dir: str, since: str = "", staged: bool = False
+) -> Union[Dict[str, List[Tuple[int, int]]], None]:
+    """
+    Retrieves the Python files changed, together with their changed line ranges, either since the given git reference
+    (working tree included) or in the staging area (compared to HEAD, or to the given reference). The ranges are
+    always in the working tree version of the files (the one documented), so the ranges of the staged changes are
+    moved past the unstaged changes of the same files. Since a reference, the new untracked files are changed as a
+    whole.
+
+    :param curr_dir: A folder inside the git repository
+    :type curr_dir: str
+    :param since: The git reference to compare against. (Default="")
+    :type since: str
+    :param staged: If True, only the staged changes are considered. (Default=False)
+    :type staged: bool
+    :returns: Union[Dict[str, List[Tuple[int, int]]], None] - the changed line ranges for every changed file, or None
+        if git could not be used
+    """
+
+    root_dir = git_command(["rev-parse", "--show-toplevel"], curr_dir)
+    if root_dir is None:
+        return None
+
+    diff_arguments = ["diff", "--unified=0", "--no-color", "--no-ext-diff"]
+    arguments = diff_arguments + ["--diff-filter=AMR"]
+    if staged:
+        arguments.append("--cached")
+    if since:
+        arguments.append(since)
+    diff = git_command(arguments + ["--", "*.py"], curr_dir)
+    if diff is None:
+        return None
+
+    changed_lines = {
+        path: lines
+        for path, lines in parse_diff(diff, root_dir.strip()).items()
+        if lines and os.path.isfile(path)
+    }
+    if not staged:
+        untracked_files = get_untracked_files(curr_dir, root_dir.strip())
+        if untracked_files is None:
+            return None
+        for path in untracked_files:
+            if os.path.isfile(path):
+                with open(path, "rb") as fp:
+                    changed_lines[path] = [(1, max(sum(1 for _ in fp), 1))]
+        return changed_lines
+    if not changed_lines:
+        return changed_lines
+
+    # The staged ranges refer to the index: they are moved by the unstaged changes (index -> working tree)
+    unstaged_diff = git_command(diff_arguments + ["--"] + list(changed_lines), curr_dir)
+    if unstaged_diff is None:
+        return None
+    for path, hunks in parse_hunks(unstaged_diff, root_dir.strip()).items():
+        if path in changed_lines:
+            changed_lines[path] = map_changed_lines(changed_lines[path], hunks)
+    return changed_lines
@@ -1,12 +1,62 @@
-import isort
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from blackdoc.configs import log
 
-def isort_file(file_path: str):
+if TYPE_CHECKING:
+    import isort
+
+
+@lru_cache(maxsize=None)
+def get_isort_config(project_dir: str = "") -> "isort.Config":
+    """
+    This is a getter method. Loads the isort configuration of the project (pyproject.toml, .isort.cfg, setup.cfg, ...)
+    once per process. If the project does not choose an isort profile, the black profile is used, since the code is
+    formatted with black right afterwards. isort is imported only then, so that the runs without isort do not pay for
+    its import.
+
+    :param project_dir: Folder from which the isort configuration is searched. (Default="")
+    :type project_dir: str
+    :returns: isort.Config - the parsed isort configuration
+    """
+
+    import isort
+
+    settings_path = project_dir or os.getcwd()
+    try:
+        config = isort.Config(settings_path=settings_path)
+        if not config.profile:
+            config = isort.Config(settings_path=settings_path, profile="black")
+        return config
+    except Exception as ex:
+        log(f"Error reading the isort configuration: {ex}", "warning")
+        return isort.Config(profile="black")
+
+
+def isort_code(code: str, file_path: str = "") -> str:
     """
-    This method is XXX . It is a global method.
+    Sorts the imports of the code in memory with isort.
 
-    :param file_path: XXX
+    :param code: The code whose imports are sorted
+    :type code: str
+    :param file_path: Path of the file containing the code, used for logging and for the file specific isort
+        settings. (Default="")
     :type file_path: str
+    :returns: str - the code with the sorted imports, or the given code if isort skipped or could not sort it
     """
 
-    isort.code(file_path)
+    import isort
+
+    try:
+        return isort.code(
+            code,
+            config=get_isort_config(),
+            file_path=Path(file_path) if file_path else None,
+        )
+    except isort.exceptions.FileSkipped:
+        return code
+    except Exception as ex:
+        log(f"Error isorting the file {file_path}: {ex}")
+        return code
@@ -0,0 +1,32 @@
+from typing import FrozenSet, Optional
+
+# The verbs known by the NLP utilities of the current process. Loaded once per process, and inherited by the workers
+# when they are forked
+_verbs: Optional[FrozenSet[str]] = None
+
+
+def load_verbs(nlp_utilities) -> FrozenSet[str]:
+    """
+    Loads the verbs known by the NLP utilities into a frozen set, if they are not loaded yet, so that checking whether
+    a word is a verb takes constant time.
+
+    :param nlp_utilities: The NLP utilities of the current process
+    :returns: FrozenSet[str] - the known verbs
+    """
+    global _verbs
+
+    if _verbs is None:
+        _verbs = frozenset(nlp_utilities.initialize_verbs())
+    return _verbs
+
+
+def is_known_verb(word: str, nlp_utilities) -> bool:
+    """
+    Checks whether the word is one of the verbs known by the NLP utilities.
+
+    :param word: The word to check
+    :type word: str
+    :param nlp_utilities: The NLP utilities of the current process, used to load the verbs the first time
+    :returns: bool - True if the word is a known verb, False otherwise
+    """
+    return word in (_verbs if _verbs is not None else load_verbs(nlp_utilities))
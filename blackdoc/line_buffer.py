@@ -0,0 +1,109 @@
+import locale
+import mmap
+import os
+from array import array
+from typing import Optional
+
+# Files at least this big (in bytes) are memory-mapped instead of being read
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class LineBuffer:
+    """
+    Read-only view of the lines of a file, indexed like the list returned by code.split("\\n"). Only the offsets of
+    the lines are kept (in an array of integers, instead of a string object for every line), and every line is decoded
+    when it is accessed. The files of at least MMAP_THRESHOLD bytes are memory-mapped, so that their content is paged
+    in (and out) by the OS instead of being held by the process. As when the file is read in text mode, the
+    carriage returns before the line feeds are dropped.
+
+    Methods:
+    :method close:
+    :method __len__:
+    :method __getitem__:
+    :method __enter__:
+    :method __exit__:
+
+
+    :param file_path: The path of the file
+    :type file_path: str
+    :param encoding: The encoding of the file. (Default=the encoding used by open)
+    :type encoding: Optional[str]
+    """
+
+    def __init__(self, file_path: str, encoding: Optional[str] = None):
+        """
+        This overrides the built-in object Initializator. It is a class method of LineBuffer.
+
+        :param file_path: The path of the file
+        :type file_path: str
+        :param encoding: The encoding of the file. (Default=the encoding used by open)
+        :type encoding: Optional[str]
+        """
+
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self._file = open(file_path, "rb")
+        if os.fstat(self._file.fileno()).st_size >= MMAP_THRESHOLD:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = self._file.read()
+            self._file.close()
+
+        self._offsets = array("q", [0])
+        newline = self._data.find(b"\n")
+        while newline != -1:
+            self._offsets.append(newline + 1)
+            newline = self._data.find(b"\n", newline + 1)
+
+    def close(self):
+        """
+        Releases the mapping and the file, if the file was memory-mapped.
+        """
+
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        """
+        This overrides the built-in Lenght representation of the object.
+
+        :returns: int - the number of lines (as many as the items of code.split("\\n"))
+        """
+
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> str:
+        """
+        Returns a line of the file, without its line ending.
+
+        :param index: The (0-based) index of the line
+        :type index: int
+        :returns: str - the line
+        """
+
+        if index < 0:
+            index += len(self._offsets)
+        start = self._offsets[index]
+        if index + 1 < len(self._offsets):
+            line = self._data[start : self._offsets[index + 1] - 1]
+        else:
+            line = self._data[start:]
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        return line.decode(self.encoding)
+
+    def __enter__(self) -> "LineBuffer":
+        """
+        Returns the buffer itself, that is closed when the with statement ends.
+
+        :returns: LineBuffer - the buffer
+        """
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Closes the buffer.
+        """
+
+        self.close()
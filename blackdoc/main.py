@@ -1,28 +1,42 @@
 import concurrent
+import contextlib
+import multiprocessing
 import os
 import sys
+import time
 import warnings
-from concurrent.futures import ProcessPoolExecutor
-from typing import Tuple, Union, List
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Tuple, Union, List, TextIO
 
-from blackdoc.isort import isort_file
 
 # Silences useless warnings
 warnings.filterwarnings("ignore")
-os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
 import argparse
 
-import shutil
-
-from nlputilities.nlp import NLPUtilities
-
-from blackdoc.black import black_file, black_repo
-from blackdoc.configs import log, Config, NLPManager
+from blackdoc.backup import FilesBackup
+from blackdoc.cache import CACHE_NAME, FilesCache
+from blackdoc.configs import log, Config
+from blackdoc.diff_writer import DiffWriter
+from blackdoc.discovery import FilesDiscovery
 from blackdoc.docstring import DocumentFile
+from blackdoc.git_diff import get_changed_lines
+from blackdoc.nlp import get_nlp_utilities, initialize_worker, load_nlp_utilities
+from blackdoc.nlp_cache import NLP_CACHE_NAME, get_identifiers_cache
+from blackdoc.parser.fileParser import DEFAULT_PARSER_BACKEND
+from blackdoc.timing import (
+    StageTimer,
+    aggregate_stage_timings,
+    profile_call,
+    save_profile,
+    save_timings,
+)
 
 __version__ = "1.1.1"
 
+# Number of files waiting in the pool for every worker, so that workers never starve while pending results stay bounded
+IN_FLIGHT_PER_WORKER = 2
+
 
 def get_cli_argument_parser() -> argparse.ArgumentParser:
     """
@@ -54,10 +68,36 @@ def get_cli_argument_parser() -> argparse.ArgumentParser:
         required=False,
     )
 
+    group.add_argument(
+        "--since",
+        help="If a git reference is specified, then the 'black & doc' process is executed only on the Python files "
+        "changed since that reference (working tree and new untracked files included), and only the elements "
+        "overlapping the changed lines are documented.",
+        metavar="REF",
+        required=False,
+    )
+
+    group.add_argument(
+        "--restore",
+        help="If specified, puts back the files saved in the backup folder during the last run.",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+
+    group.add_argument(
+        "--staged",
+        help="If specified, the 'black & doc' process is executed only on the Python files with staged changes, and "
+        "only the elements overlapping the staged lines are documented.",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+
     cli_arg_parser.add_argument(
         "--no_backup",
-        help="If specified, it does not create a backup folder of the current directory called 'blackdoc_backup' "
-        "(NOTE: if the backup is created and 'blackdoc_backup' already exists, it overwrites it).",
+        help="If specified, it does not save the files modified by blackdoc in the backup folder called "
+        "'blackdoc_backup' (NOTE: if the backup is created and 'blackdoc_backup' already exists, it overwrites it).",
         action="store_true",
         default=False,
         required=False,
@@ -79,6 +119,46 @@ def get_cli_argument_parser() -> argparse.ArgumentParser:
         required=False,
     )
 
+    cli_arg_parser.add_argument(
+        "--no_cache",
+        help="If specified, every file of the repository is processed again, instead of skipping the ones already "
+        "documented and formatted (and not changed) since the last run. With --use_nlp, the NLP results of the "
+        "previous runs are not reused either.",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+
+    mode_group = cli_arg_parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        "--check",
+        help="If specified, nothing is written (and no backup is created): the undocumented classes and methods are "
+        "only listed, one per line as 'path:line: undocumented genus name', and the exit code is 1 if there is any.",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+
+    mode_group.add_argument(
+        "--diff",
+        help="If specified, no file is modified (and no backup is created): the changes that would be made are printed "
+        "as unified diffs, in the order the files are found, or written to FILE if given.",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        required=False,
+    )
+
+    cli_arg_parser.add_argument(
+        "--low_memory",
+        help="If specified, every file is documented in low memory mode: the code is parsed one chunk of top-level "
+        "statements at a time, and the documented code is written to the file line by line (unless it is formatted). "
+        "Without it, only the files bigger than the low_memory_threshold of the configuration file are.",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+
     cli_arg_parser.add_argument(
         "--use_nlp",
         help="If specified, it will use NLP-based tools (e.g. text segmentation) for describing the code elements in the "
@@ -88,6 +168,17 @@ def get_cli_argument_parser() -> argparse.ArgumentParser:
         required=False,
     )
 
+    cli_arg_parser.add_argument(
+        "--profile",
+        help="If specified, the time spent in every stage (summed across the workers) is logged at the end of the run. "
+        "If FILE ends with .json, the timings of every file are saved in it, otherwise the files are documented under "
+        "cProfile, and the profiles of all the workers are merged and saved in FILE as pstats.",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        required=False,
+    )
+
     cli_arg_parser.add_argument(
         "-w",
         "--workers",
@@ -97,147 +188,516 @@ def get_cli_argument_parser() -> argparse.ArgumentParser:
     )
     if len(sys.argv) == 1:
         cli_arg_parser.print_help(sys.stderr)
-        log("\nNOTE: Either -r/--repo or -f FILE/--file FILE need to be provided.")
+        log(
+            "\nNOTE: Either -r/--repo, -f FILE/--file FILE, --since REF or --staged need to be provided."
+        )
         sys.exit(1)
     return cli_arg_parser
 
 
-def document_file(nlp_utilities, file_path: str) -> Tuple[bool, str]:
+def document_file(
+    use_nlp: bool,
+    file_path: str,
+    changed_lines: List[Tuple[int, int]] = None,
+    use_black: bool = False,
+    use_isort: bool = False,
+    backup: FilesBackup = None,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+    check_only: bool = False,
+    diff_only: bool = False,
+    profile: bool = False,
+    low_memory_threshold: int = 0,
+) -> Tuple[bool, str, dict]:
     """
     This method is XXX . It is a global method.
 
     :param file_path: XXX
     :type file_path: str
-    :param nlp_utilities:
-    :returns: Tuple[bool, str] - XXX
+    :param use_nlp: If True, the NLP utilities of the current process are used to describe the elements
+    :type use_nlp: bool
+    :param changed_lines: If given, only the elements overlapping these line ranges are documented. (Default=None)
+    :type changed_lines: List[Tuple[int, int]]
+    :param use_black: If True, the file is formatted with black before being written. (Default=False)
+    :type use_black: bool
+    :param use_isort: If True, the imports of the file are sorted with isort before being written. (Default=False)
+    :type use_isort: bool
+    :param backup: If given, the file is saved in the backup before being overwritten. (Default=None)
+    :type backup: FilesBackup
+    :param parser_backend: The parser used to extract the elements of the file. (Default=DEFAULT_PARSER_BACKEND)
+    :type parser_backend: str
+    :param check_only: If True, the undocumented elements of the file are only listed in the report, and the file is
+        not written. (Default=False)
+    :type check_only: bool
+    :param diff_only: If True, the file is not written, and the unified diff of the changes is returned in the report.
+        (Default=False)
+    :type diff_only: bool
+    :param profile: If True, the file is documented under cProfile, and the profile is returned in the report.
+        (Default=False)
+    :type profile: bool
+    :param low_memory_threshold: If not 0, the file is documented in low memory mode if it has at least this many
+        bytes. (Default=0)
+    :type low_memory_threshold: int
+    :returns: Tuple[bool, str, dict] - XXX, and the report of the stages (and their timings) of the file (or of its
+        undocumented elements, or its diff)
     """
     file_name = file_path.split("/")[-1]
-    log(f"Documenting {file_name}")
-    docs = DocumentFile(file_name, file_path, nlp_utilities)
-    return docs.document_file(), file_path
+    if not diff_only:
+        # With --diff the output may be the diff itself, written (in order) only by the main process
+        log(f"Documenting {file_name}")
+    identifiers_cache = get_identifiers_cache() if use_nlp else None
+    docs = DocumentFile(
+        file_name,
+        file_path,
+        get_nlp_utilities(use_nlp),
+        changed_lines,
+        use_black,
+        use_isort,
+        backup,
+        identifiers_cache,
+        parser_backend,
+        check_only,
+        diff_only,
+        low_memory_threshold,
+    )
+    if profile:
+        status, profile_entries = profile_call(docs.document_file)
+    else:
+        status, profile_entries = docs.document_file(), None
+    report = {
+        "isort_changed": docs.isort_changed,
+        "isort_time": docs.isort_time,
+        "timings": docs.timer.stages,
+        "nothing_to_document": docs.nothing_to_document,
+    }
+    if profile_entries:
+        report["profile"] = profile_entries
+    if check_only:
+        report["undocumented"] = [
+            {"line": element.start_line, "genus": element.genus, "name": element.name}
+            for element in sorted(
+                docs.undocumented_elements, key=lambda element: element.start_line
+            )
+        ]
+    if diff_only:
+        report["diff"] = docs.get_diff(os.path.relpath(file_path))
+    if identifiers_cache:
+        report["nlp_cache"] = identifiers_cache.pop_report()
+    return status, file_path, report
+
+
+def document_files(
+    use_nlp: bool,
+    files: Iterable[str],
+    workers: int,
+    changed_lines: Dict[str, List[Tuple[int, int]]] = None,
+    use_black: bool = False,
+    use_isort: bool = False,
+    backup: FilesBackup = None,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+    check_only: bool = False,
+    diff_writer: DiffWriter = None,
+    profile: bool = False,
+    low_memory_threshold: int = 0,
+) -> List[Tuple[bool, str, dict]]:
+    """
+    Documents the given files, in parallel if more than one worker is requested. Every file is documented, isorted
+    and blacked in memory by the same worker, and then written once. The files are submitted to the workers as soon
+    as they are yielded, so files can be documented while the rest of the repository is still being searched. At most
+    IN_FLIGHT_PER_WORKER files per worker are submitted at any time, and the results are collected (and the progress
+    logged) as soon as every file is done.
+
+    :param use_nlp: If True, every worker loads its own NLP utilities once, and uses them to describe the elements
+    :type use_nlp: bool
+    :param files: The paths of the files to document
+    :type files: Iterable[str]
+    :param workers: Number of workers documenting the files in parallel
+    :type workers: int
+    :param changed_lines: If given, for every file only the elements overlapping its line ranges are documented.
+        (Default=None)
+    :type changed_lines: Dict[str, List[Tuple[int, int]]]
+    :param use_black: If True, every file is formatted with black before being written. (Default=False)
+    :type use_black: bool
+    :param use_isort: If True, the imports of every file are sorted with isort before being written. (Default=False)
+    :type use_isort: bool
+    :param backup: If given, every file is saved in the backup before being overwritten. (Default=None)
+    :type backup: FilesBackup
+    :param parser_backend: The parser used to extract the elements of every file. (Default=DEFAULT_PARSER_BACKEND)
+    :type parser_backend: str
+    :param check_only: If True, the undocumented elements of every file are only listed in its report, and no file is
+        written. (Default=False)
+    :type check_only: bool
+    :param diff_writer: If given, no file is written, and the diff of every file is written here, in the order of the
+        files. (Default=None)
+    :type diff_writer: DiffWriter
+    :param profile: If True, every file is documented under cProfile, and its profile is returned in its report.
+        (Default=False)
+    :type profile: bool
+    :param low_memory_threshold: If not 0, the files of at least this many bytes are documented in low memory mode.
+        (Default=0)
+    :type low_memory_threshold: int
+    :returns: List[Tuple[bool, str, dict]] - the documentation status, the path and the report of every file
+    """
+    changed_lines = changed_lines if changed_lines is not None else {}
+    success = []
+    start_time = time.perf_counter()
+
+    def collect(future_jobs: dict, finished_jobs: Iterable):
+        """
+        Saves the results of the finished jobs, and logs the progress.
+
+        :param future_jobs: The submitted jobs, with the position and the path of their file
+        :type future_jobs: dict
+        :param finished_jobs: The finished jobs
+        :type finished_jobs: Iterable
+        """
+        for future in finished_jobs:
+            index, path = future_jobs.pop(future)
+            try:
+                status, _, report = future.result()
+            except Exception:
+                status, report = False, {}
+            success.append((status, path, report))
+            log_progress(len(success), path, status, start_time)
+            if diff_writer:
+                diff_writer.add(index, report.get("diff", ""))
+
+    if workers > 1:
+        # Forked workers share the NLP utilities already loaded by the parent process
+        mp_context = (
+            multiprocessing.get_context("fork")
+            if use_nlp and "fork" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=initialize_worker,
+            initargs=(use_nlp,),
+        ) as executor:
+            jobs = {}
+            for index, file_path in enumerate(files):
+                if len(jobs) >= workers * IN_FLIGHT_PER_WORKER:
+                    finished, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                    collect(jobs, finished)
+
+                jobs[
+                    executor.submit(
+                        document_file,
+                        use_nlp,
+                        file_path,
+                        changed_lines.get(file_path),
+                        use_black,
+                        use_isort,
+                        backup,
+                        parser_backend,
+                        check_only,
+                        diff_writer is not None,
+                        profile,
+                        low_memory_threshold,
+                    )
+                ] = (index, file_path)
+
+            collect(jobs, concurrent.futures.as_completed(list(jobs)))
+
+    else:
+        for index, file in enumerate(files):
+            try:
+                status, _, report = document_file(
+                    use_nlp,
+                    file,
+                    changed_lines.get(file),
+                    use_black,
+                    use_isort,
+                    backup,
+                    parser_backend,
+                    check_only,
+                    diff_writer is not None,
+                    profile,
+                    low_memory_threshold,
+                )
+            except Exception:
+                status, report = False, {}
+            success.append((status, file, report))
+            log_progress(len(success), file, status, start_time)
+            if diff_writer:
+                diff_writer.add(index, report.get("diff", ""))
+
+    return success
 
 
-def start_blacking(no_black: bool, file_path: str = ""):
+def log_progress(completed: int, file_path: str, status: bool, start_time: float):
     """
-    This method is XXX . It is a global method.
+    Logs the file that has just been processed, together with the number of processed files and the throughput.
 
-    :param no_black: XXX
-    :type no_black: bool
-    :param file_path: XXX. (Default="")
+    :param completed: The number of files processed so far
+    :type completed: int
+    :param file_path: The path of the file that has just been processed
     :type file_path: str
+    :param status: Whether the file was successfully documented
+    :type status: bool
+    :param start_time: The time (from time.perf_counter) when the processing started
+    :type start_time: float
     """
+    elapsed = time.perf_counter() - start_time
+    throughput = completed / elapsed if elapsed > 0 else 0.0
+    log(
+        f"[{completed} done, {throughput:.1f} files/s] "
+        f"{'Documented' if status else 'Not documented'} {file_path}"
+    )
 
-    if not no_black:
-        log("\nBlacking")
-        if file_path:
-            black_file(file_path)
-        else:
-            black_repo()
 
+def log_isort_report(success: List[Tuple[bool, str, dict]]):
+    """
+    Logs how many files had their imports sorted by isort, and the time spent (summed across the workers) in the
+    isort stage.
 
-def start_isorting(no_isort: bool, file_paths: Union[str, List[str]] = ""):
+    :param success: The documentation status, the path and the report of every processed file
+    :type success: List[Tuple[bool, str, dict]]
     """
-    This method is XXX . It is a global method.
 
-    :param no_isort: XXX
-    :type no_isort: bool
-    :param file_paths: XXX. (Default="")
-    :type file_paths: Union[str, List[str]]
+    changed = sum(1 for _, _, report in success if report.get("isort_changed"))
+    elapsed = sum(report.get("isort_time", 0.0) for _, _, report in success)
+    log(
+        f"\nISorting changed {changed} out of {len(success)} files "
+        f"({elapsed:.2f} seconds of isort across the workers)"
+    )
+
+
+def log_timing_summary(
+    timer: StageTimer, success: List[Tuple[bool, str, dict]], curr_dir: str
+):
+    """
+    Logs the time spent in every stage by the main process, and the time spent in every stage documenting the files,
+    summed across the workers, together with the slowest file of every stage.
+
+    :param timer: The timer of the stages of the main process
+    :type timer: StageTimer
+    :param success: The documentation status, the path and the report of every processed file
+    :type success: List[Tuple[bool, str, dict]]
+    :param curr_dir: The folder in which blackdoc was executed
+    :type curr_dir: str
     """
 
-    if not no_isort:
-        log("\nISorting")
-        file_paths = file_paths if isinstance(file_paths, list) else [file_paths]
-        for path in file_paths:
-            isort_file(path)
+    log(
+        "\nTime spent in every stage by the main process (without the nested stages, e.g. document does not "
+        "include the walk and cache time):"
+    )
+    for stage, elapsed in timer.stages.items():
+        log(f"{stage:<10} {elapsed:>9.3f} s")
+
+    file_timings = [(path, report.get("timings", {})) for _, path, report in success]
+    log("\nTime spent in every stage documenting the files, summed across the workers:")
+    log(
+        f"{'stage':<10} {'files':>6} {'total':>11} {'mean':>11} {'max':>11}  "
+        "slowest file"
+    )
+    for stage, summary in aggregate_stage_timings(file_timings).items():
+        log(
+            f"{stage:<10} {summary['files']:>6} {summary['total']:>9.3f} s "
+            f"{summary['total'] / summary['files'] * 1000:>8.1f} ms {summary['max'] * 1000:>8.1f} ms  "
+            f"{os.path.relpath(summary['slowest'], curr_dir)}"
+        )
+
+
+def save_profile_output(
+    profile_path: str,
+    timer: StageTimer,
+    success: List[Tuple[bool, str, dict]],
+):
+    """
+    Saves the timings of every file as JSON, if the path ends with .json, otherwise the profiles of every file
+    (computed by any worker) merged in a single pstats file.
+
+    :param profile_path: The file where the timings or the profiles are saved
+    :type profile_path: str
+    :param timer: The timer of the stages of the main process
+    :type timer: StageTimer
+    :param success: The documentation status, the path and the report of every processed file
+    :type success: List[Tuple[bool, str, dict]]
+    """
 
+    if profile_path.endswith(".json"):
+        save_timings(
+            profile_path,
+            timer.stages,
+            [(path, report.get("timings", {})) for _, path, report in success],
+        )
+    elif not save_profile(
+        profile_path,
+        (report["profile"] for _, _, report in success if "profile" in report),
+    ):
+        log("\nNo file was profiled", "warning")
+        return
+    log(f"\nSaved the profile in {profile_path}")
+
+
+def log_undocumented_elements(
+    success: List[Tuple[bool, str, dict]], curr_dir: str, output: TextIO = None
+) -> int:
+    """
+    Prints the undocumented elements found by the check, one per line as "path:line: undocumented genus name" (with
+    the path relative to the current folder), sorted by path and line.
 
-def create_backup(is_backup: bool, working_dir: str):
+    :param success: The documentation status, the path and the report of every processed file
+    :type success: List[Tuple[bool, str, dict]]
+    :param curr_dir: The folder in which blackdoc was executed
+    :type curr_dir: str
+    :param output: Where the elements are printed. (Default=sys.stdout)
+    :type output: TextIO
+    :returns: int - the number of undocumented elements
     """
-    This method is XXX . It is a global method.
+
+    undocumented = 0
+    for _, path, report in sorted(success, key=lambda result: result[1]):
+        for element in report.get("undocumented", []):
+            print(
+                f"{os.path.relpath(path, curr_dir)}:{element['line']}: "
+                f"undocumented {element['genus']} {element['name']}",
+                file=output,
+            )
+            undocumented += 1
+    return undocumented
+
+
+def update_nlp_cache(success: List[Tuple[bool, str, dict]], cache_path: str = ""):
+    """
+    Collects the NLP results computed by the workers in the NLP cache of the current process, saves it (if
+    requested) and logs how many lookups were answered by the cache.
+
+    :param success: The documentation status, the path and the report of every processed file
+    :type success: List[Tuple[bool, str, dict]]
+    :param cache_path: If given, the NLP cache is saved in this file. (Default="")
+    :type cache_path: str
+    """
+    identifiers_cache = get_identifiers_cache()
+    hits = 0
+    misses = 0
+    for _, _, report in success:
+        nlp_report = report.get("nlp_cache")
+        if nlp_report:
+            hits += nlp_report["hits"]
+            misses += nlp_report["misses"]
+            identifiers_cache.merge(nlp_report["entries"])
+
+    if cache_path:
+        identifiers_cache.save(cache_path, __version__)
+    log(f"\nNLP cache: {hits} hits, {misses} misses")
+
+
+def create_backup(is_backup: bool, working_dir: str) -> Union[FilesBackup, None]:
+    """
+    This method is XXX . It is a global method. The files are saved in the backup only when they are about to be
+    modified, and the backup of the previous run is discarded only when the first file is saved.
 
     :param is_backup: XXX
     :type is_backup: bool
     :param working_dir: XXX
     :type working_dir: str
+    :returns: Union[FilesBackup, None] - the backup, or None if the backup is not created
+    """
+
+    if not is_backup:
+        return None
+    log("\nBacking up the modified files in " + Config.backup_folder)
+    return FilesBackup(working_dir, working_dir + Config.backup_folder)
+
+
+def restore_backup(working_dir: str):
+    """
+    Puts back the files saved in the backup folder during the last run.
+
+    :param working_dir: The folder in which blackdoc was executed
+    :type working_dir: str
     """
 
-    log("\nBacking up repository")
-    if is_backup:
-        if os.path.exists(working_dir + Config.backup_folder):
-            shutil.rmtree(working_dir + Config.backup_folder)
-        shutil.copytree(working_dir, working_dir + Config.backup_folder)
+    backup = FilesBackup.latest(working_dir, working_dir + Config.backup_folder)
+    if backup is None:
+        log(f"\nNo backup found in {Config.backup_folder}", "warning")
+        return
+    restored = backup.restore()
+    log(f"\nRestored {restored} files from {Config.backup_folder}")
 
 
 def initialize_NLP(is_nlp: bool):
     """
-    This method is XXX . It is a global method.
+    This method is XXX . It is a global method. The NLP utilities are loaded in the current process, so that the
+    forked workers inherit them instead of loading them again. The NLP backend is imported only here, and the run is
+    stopped if it is not installed.
     """
     if not is_nlp:
-        return None
+        return
     log("\nLoading NLP-based tools")
-    NLPManager.register(
-        "NLPUtilities",
-        NLPUtilities,
-        exposed=[
-            "initialize_all_datasets",
-            "initialize_segmenter",
-            "initialize_spell_checker",
-            "initialize_spacy",
-            "initialize_verbs",
-            "initialize_stemmer",
-            "use_segmenter",
-            "use_spell_checker",
-            "use_lemmetizer",
-            "check_abbreviation",
-            "extend_contraction",
-            "use_phrase_checker",
-            "use_pos_dependency_tagger",
-            "use_words_stemmer",
-            "identifier_checker",
-            "input_vectorization",
-            "english_score",
-            "separator_score",
-            "get_pos_tags",
-        ],
-    )
-    mymanager = NLPManager()
-    mymanager.start()
-    toolset = mymanager.NLPUtilities()
-    toolset.initialize_segmenter()
-    toolset.initialize_spell_checker()
-    toolset.initialize_spacy()
-    toolset.initialize_verbs()
-    toolset.initialize_stemmer()
+    try:
+        load_nlp_utilities()
+    except ImportError as ex:
+        log(
+            f"Could not load the NLP-based tools ({ex}). Install them with: pip install BlackDoc[nlp]",
+            "error",
+        )
+        sys.exit(1)
     log("NLP utilities loaded")
-    return toolset
 
 
-def update_gitignore(backup: bool, curr_dir: str):
+def load_cache(
+    no_cache: bool, curr_dir: str, cli_arguments, parser_backend: str
+) -> Union[FilesCache, None]:
+    """
+    Loads the cache of the files already documented in the previous runs. The cache is tied to the version of blackdoc,
+    to the CLI flags and to the parser, since they change the produced code.
+
+    :param no_cache: If True, the cache is not used
+    :type no_cache: bool
+    :param curr_dir: Folder where the cache is stored
+    :type curr_dir: str
+    :param cli_arguments: The parsed CLI arguments
+    :param parser_backend: The parser used to extract the elements of the files
+    :type parser_backend: str
+    :returns: Union[FilesCache, None] - the loaded cache, or None if the cache is not used
     """
-    This method is XXX . It is a global method.
+
+    if no_cache:
+        return None
+    settings = (
+        f"{__version__}-black:{not cli_arguments.no_black}-isort:{not cli_arguments.no_isort}"
+        f"-nlp:{cli_arguments.use_nlp}-parser:{parser_backend}"
+    )
+    return FilesCache(curr_dir, settings).load()
+
+
+def update_gitignore(backup: bool, curr_dir: str, cache_files: Iterable[str] = ()):
+    """
+    This method is XXX . It is a global method. The cache files written by the run are ignored as well.
 
     :param backup: XXX
     :type backup: bool
     :param curr_dir: XXX
     :type curr_dir: str
+    :param cache_files: The names of the cache files written in curr_dir by the run. (Default=())
+    :type cache_files: Iterable[str]
     """
 
-    if backup:
-        gitignore_file = os.path.join(curr_dir, ".gitignore")
-        backup_folder = Config.backup_folder[1:]
-
-        if os.path.exists(gitignore_file):
+    ignored_files = ([Config.backup_folder[1:]] if backup else []) + list(cache_files)
+    gitignore_file = os.path.join(curr_dir, ".gitignore")
 
-            with open(gitignore_file, "r") as fp:
-                ignored_elements = fp.readlines()
+    if ignored_files and os.path.exists(gitignore_file):
+        with open(gitignore_file, "r") as fp:
+            ignored_elements = fp.readlines()
 
-            if not any(backup_folder in element for element in ignored_elements):
-                log(f"\nUpdating .gitignore to ignore {Config.backup_folder}.")
-                ignored_elements.append(backup_folder)
+        missing_files = [
+            ignored_file
+            for ignored_file in ignored_files
+            if not any(ignored_file in element for element in ignored_elements)
+        ]
+        if missing_files:
+            log(f"\nUpdating .gitignore to ignore {', '.join(missing_files)}.")
+            if ignored_elements and not ignored_elements[-1].endswith("\n"):
+                ignored_elements[-1] += "\n"
+            ignored_elements.extend(
+                f"{ignored_file}\n" for ignored_file in missing_files
+            )
 
-                with open(gitignore_file, "w") as fp:
-                    fp.writelines(ignored_elements)
+            with open(gitignore_file, "w") as fp:
+                fp.writelines(ignored_elements)
 
 
 def main():
@@ -251,84 +711,214 @@ def main():
     success = []
     arg_parser = get_cli_argument_parser()
     cli_arguments = arg_parser.parse_args()
+    # The time spent in every stage by the main process
+    timer = StageTimer()
+    profile_files = bool(cli_arguments.profile) and not cli_arguments.profile.endswith(
+        ".json"
+    )
 
-    configs = Config.load_configs(curr_dir)
-    workers = cli_arguments.workers if cli_arguments.workers else configs.workers
-
-    update_gitignore(not cli_arguments.no_backup, curr_dir)
-    create_backup(not cli_arguments.no_backup, curr_dir)
-
-    # Initialize nlp utilities once for every worker
-    nlp_utilities = initialize_NLP(cli_arguments.use_nlp)
-
-    if cli_arguments.file:
-        if not cli_arguments.file.endswith(".py"):
-            log("\nOnly Python files are supported!", "error")
-            exit()
-
-        curr_file = os.path.join(curr_dir, cli_arguments.file)
-
-        success.append(document_file(nlp_utilities, curr_file))
-        start_blacking(cli_arguments.no_black, curr_file)
-        start_isorting(cli_arguments.no_isort, curr_file)
-
-    else:
-        files = []
-        for dirpath, dirnames, filenames in os.walk(curr_dir, topdown=True):
-            relative_path = dirpath.replace(curr_dir, "")
-            if any(
-                subfolder == ignored
-                for subfolder in relative_path.split("/")
-                for ignored in configs.blacklist
-            ):
-                continue
-
-            if not configs.whitelist or (
-                configs.whitelist
-                and any(
-                    subfolder == allowed
-                    for subfolder in relative_path.split("/")
-                    for allowed in configs.whitelist
+    # The diff is computed in memory: nothing is backed up or written
+    diff_only = cli_arguments.diff is not None
+    # The check only parses the files: nothing is backed up, formatted, described or written
+    check_only = cli_arguments.check
+    results_output = sys.stdout
+    # The redirection of stdout and the diff file are released when main returns or exits
+    with contextlib.ExitStack() as outputs:
+        if (diff_only and cli_arguments.diff == "-") or check_only:
+            # The diffs (or the undocumented elements) are the only output on stdout, the logs go to stderr
+            outputs.enter_context(contextlib.redirect_stdout(sys.stderr))
+
+        with timer.span("config"):
+            configs = Config.load_configs(curr_dir)
+        workers = cli_arguments.workers if cli_arguments.workers else configs.workers
+
+        if cli_arguments.restore:
+            restore_backup(curr_dir)
+            return
+
+        diff_writer = None
+        if diff_only:
+            diff_writer = DiffWriter(
+                results_output
+                if cli_arguments.diff == "-"
+                else outputs.enter_context(open(cli_arguments.diff, "w"))
+            )
+
+        use_backup = not cli_arguments.no_backup and not check_only and not diff_only
+        use_black = not cli_arguments.no_black and not check_only
+        use_isort = not cli_arguments.no_isort and not check_only
+        use_nlp = cli_arguments.use_nlp and not check_only
+        # The files above the threshold (every file, with --low_memory) are documented in low memory mode
+        low_memory_threshold = (
+            1 if cli_arguments.low_memory else configs.low_memory_threshold
+        )
+
+        with timer.span("backup"):
+            backup = create_backup(use_backup, curr_dir)
+
+        # Initialize nlp utilities once, before the workers are forked
+        with timer.span("nlp"):
+            initialize_NLP(use_nlp)
+            nlp_cache_path = (
+                os.path.join(curr_dir, NLP_CACHE_NAME)
+                if use_nlp and not cli_arguments.no_cache
+                else ""
+            )
+            if nlp_cache_path:
+                get_identifiers_cache().load(nlp_cache_path, __version__)
+
+        # The cache of the files is written only by the (non check, non diff) runs on the whole repository
+        use_cache = (
+            cli_arguments.repo
+            and not cli_arguments.no_cache
+            and not check_only
+            and not diff_only
+        )
+        update_gitignore(
+            use_backup,
+            curr_dir,
+            ([CACHE_NAME] if use_cache else [])
+            + ([NLP_CACHE_NAME] if nlp_cache_path else []),
+        )
+
+        if cli_arguments.file:
+            if not cli_arguments.file.endswith(".py"):
+                log("\nOnly Python files are supported!", "error")
+                exit()
+
+            curr_file = os.path.join(curr_dir, cli_arguments.file)
+
+            with timer.span("document"):
+                success.append(
+                    document_file(
+                        use_nlp,
+                        curr_file,
+                        use_black=use_black,
+                        use_isort=use_isort,
+                        backup=backup,
+                        parser_backend=configs.parser,
+                        check_only=check_only,
+                        diff_only=diff_only,
+                        profile=profile_files,
+                        low_memory_threshold=low_memory_threshold,
+                    )
                 )
-            ):
-                for single_file in [file for file in filenames if file.endswith(".py")]:
-                    files.append(os.path.join(dirpath, single_file))
-
-        if workers > 1:
-            with ProcessPoolExecutor(max_workers=workers) as executor:
-                jobs = {
-                    executor.submit(document_file, nlp_utilities, file_path): file_path
-                    for file_path in files
-                }
-
-            for future in concurrent.futures.as_completed(jobs):
-                path = jobs[future]
-                try:
-                    status, _ = future.result()
-                except Exception:
-                    status = False
-                success.append((status, path))
+            if diff_writer:
+                diff_writer.add(0, success[0][2].get("diff", ""))
 
-        else:
-            for file in files:
-                success.append(document_file(nlp_utilities, file))
+        elif cli_arguments.since or cli_arguments.staged:
+            with timer.span("walk"):
+                changed_lines = get_changed_lines(
+                    curr_dir, cli_arguments.since, cli_arguments.staged
+                )
+                if changed_lines is None:
+                    log("\nCould not retrieve the changes from git!", "error")
+                    exit(1)
 
-        start_blacking(cli_arguments.no_black)
-        start_isorting(cli_arguments.no_isort, files)
+                discovery = FilesDiscovery(
+                    curr_dir, configs.blacklist, configs.whitelist, configs.gitignore
+                )
+                files = [file for file in changed_lines if discovery.is_allowed(file)]
+            log(f"\nFound {len(files)} changed Python files")
+
+            with timer.span("document"):
+                success = document_files(
+                    use_nlp,
+                    files,
+                    workers,
+                    changed_lines,
+                    use_black,
+                    use_isort,
+                    backup,
+                    configs.parser,
+                    check_only,
+                    diff_writer,
+                    profile_files,
+                    low_memory_threshold,
+                )
 
-    documented = 0
-    non_documented = []
-    for status, path in success:
-        if status:
-            documented += 1
         else:
-            non_documented.append(path)
+            # The files are searched while they are documented, so only the time spent searching them is counted
+            files = timer.iterate(
+                "walk",
+                FilesDiscovery(
+                    curr_dir, configs.blacklist, configs.whitelist, configs.gitignore
+                ).walk(),
+            )
+
+            with timer.span("cache"):
+                cache = load_cache(
+                    cli_arguments.no_cache or check_only,
+                    curr_dir,
+                    cli_arguments,
+                    configs.parser,
+                )
+            if cache:
+                files = cache.changed_files(files, timer)
+
+            with timer.span("document"):
+                success = document_files(
+                    use_nlp,
+                    files,
+                    workers,
+                    use_black=use_black,
+                    use_isort=use_isort,
+                    backup=backup,
+                    parser_backend=configs.parser,
+                    check_only=check_only,
+                    diff_writer=diff_writer,
+                    profile=profile_files,
+                    low_memory_threshold=low_memory_threshold,
+                )
 
-    log(f"\nSuccessfully documented {documented} out of {len(success)} files found")
-    if non_documented:
-        log("\nProblem occured documenting the following files:", "warning")
-        for file in non_documented:
-            log(f"- {file}")
+            # With --diff the files are not written, so the cache is only read
+            if cache and not diff_only:
+                log(f"\nSkipped {cache.skipped} unchanged files")
+                with timer.span("cache"):
+                    # The files with nothing to document are cached too, so that they are not formatted again
+                    for status, path, report in success:
+                        if status or report.get("nothing_to_document"):
+                            cache.update(path)
+                    cache.save()
+
+        documented = 0
+        non_documented = []
+        for status, path, _ in success:
+            if status:
+                documented += 1
+            else:
+                non_documented.append(path)
+
+        if cli_arguments.profile is not None:
+            log_timing_summary(timer, success, curr_dir)
+            if cli_arguments.profile:
+                save_profile_output(cli_arguments.profile, timer, success)
+
+        if check_only:
+            undocumented = log_undocumented_elements(success, curr_dir, results_output)
+            log(
+                f"\nFound {undocumented} undocumented elements in {len(success)} files checked"
+            )
+            if non_documented:
+                log("\nProblem occured checking the following files:", "warning")
+                for file in non_documented:
+                    log(f"- {file}")
+            sys.exit(1 if undocumented or non_documented else 0)
+
+        if diff_writer:
+            diff_writer.flush()
+            log(f"\nWrote the diffs of {diff_writer.written} changed files")
+
+        if use_isort:
+            log_isort_report(success)
+        if use_nlp:
+            update_nlp_cache(success, nlp_cache_path)
+
+        log(f"\nSuccessfully documented {documented} out of {len(success)} files found")
+        if non_documented:
+            log("\nProblem occured documenting the following files:", "warning")
+            for file in non_documented:
+                log(f"- {file}")
 
 
 if __name__ == "__main__":
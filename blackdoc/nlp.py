@@ -0,0 +1,75 @@
+import importlib
+import os
+
+from blackdoc.lexicon import load_verbs
+
+# The class implementing the NLP utilities, as "module:class". It is imported only when the NLP-based tools are used
+NLP_BACKEND = "nlputilities.nlp:NLPUtilities"
+
+# The NLP utilities of the current process. Loaded once per process, and inherited by the workers when they are forked
+_nlp_utilities = None
+
+
+def import_nlp_backend(backend: str = NLP_BACKEND) -> type:
+    """
+    Imports the class implementing the NLP utilities. Any class can be used, as long as it provides the same methods
+    of NLPUtilities: initialize_segmenter, initialize_spell_checker, initialize_spacy, initialize_verbs and
+    initialize_stemmer to load the tools, and use_segmenter, use_spell_checker, use_pos_dependency_tagger and
+    use_words_stemmer to use them.
+
+    :param backend: The class implementing the NLP utilities, as "module:class". (Default=NLP_BACKEND)
+    :type backend: str
+    :raises ImportError: If the module of the class is not installed
+    :returns: type - the class implementing the NLP utilities
+    """
+
+    # Silences useless warnings
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+
+    module_name, class_name = backend.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_nlp_utilities():
+    """
+    Loads the NLP utilities (segmenter, spell checker, spacy, verbs and stemmer) of the current process, if they are
+    not loaded yet. The NLP backend is imported only here, so that the runs without NLP never import it.
+
+    :raises ImportError: If the NLP backend is not installed
+    :returns: NLPUtilities - the NLP utilities of the current process
+    """
+    global _nlp_utilities
+
+    if _nlp_utilities is None:
+        toolset = import_nlp_backend()()
+        toolset.initialize_segmenter()
+        toolset.initialize_spell_checker()
+        toolset.initialize_spacy()
+        load_verbs(toolset)
+        toolset.initialize_stemmer()
+        _nlp_utilities = toolset
+    return _nlp_utilities
+
+
+def get_nlp_utilities(use_nlp: bool):
+    """
+    This is a getter method. Returns the NLP utilities of the current process, loading them if needed.
+
+    :param use_nlp: Whether the NLP-based tools are used
+    :type use_nlp: bool
+    :returns: Union[NLPUtilities, None] - the NLP utilities, or None if NLP is not used
+    """
+    return load_nlp_utilities() if use_nlp else None
+
+
+def initialize_worker(use_nlp: bool):
+    """
+    Initializer of the pool workers. Every worker loads its own NLP utilities once, so that no NLP call crosses
+    process boundaries. Forked workers inherit the ones already loaded by the parent process, sharing their read-only
+    data until it is written.
+
+    :param use_nlp: Whether the NLP-based tools are used
+    :type use_nlp: bool
+    """
+    if use_nlp:
+        load_nlp_utilities()
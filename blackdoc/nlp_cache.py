@@ -0,0 +1,169 @@
+import json
+from collections import OrderedDict
+from typing import Any, Dict
+
+from blackdoc.configs import log
+
+NLP_CACHE_NAME = "blackdoc_nlp_cache.json"
+# The tokenized identifiers and the stemmed words
+CACHE_TABLES = ("tokens", "stems")
+MAX_CACHED_ENTRIES = 100000
+
+
+class IdentifiersCache:
+    """
+    Memoization of the results of the NLP utilities, keyed by the identifier (or word) they were computed for. Every
+    table is a LRU of at most max_size entries, and the whole cache can be stored on disk, so that the vocabulary
+    repeated across the files (and across the runs) is analyzed only once. The entries computed since the last report
+    are kept, so that the workers can send them back to the main process.
+
+    Methods:
+    :method get:
+    :method put:
+    :method merge:
+    :method pop_report:
+    :method load:
+    :method save:
+
+
+    :param max_size: Maximum number of entries of every table. (Default=MAX_CACHED_ENTRIES)
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_ENTRIES):
+        """
+        This overrides the built-in object Initializator. It is a class method of IdentifiersCache.
+
+        :param max_size: Maximum number of entries of every table. (Default=MAX_CACHED_ENTRIES)
+        :type max_size: int
+        """
+
+        self.max_size = max_size
+        self.tables = {table: OrderedDict() for table in CACHE_TABLES}
+        self.new_entries = {table: {} for table in CACHE_TABLES}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table: str, key: str) -> Any:
+        """This is a getter method. Looks the key up in the table, counting the hit or the miss.
+
+        :param table: The name of the table
+        :type table: str
+        :param key: The identifier or word
+        :type key: str
+        :returns: Any - the cached result, or None if it was not computed yet
+        """
+        entries = self.tables[table]
+        if key not in entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entries.move_to_end(key)
+        return entries[key]
+
+    def _store(self, table: str, key: str, value: Any):
+        """Saves the value in the table, evicting the least recently used entry if the table is full.
+
+        :param table: The name of the table
+        :type table: str
+        :param key: The identifier or word
+        :type key: str
+        :param value: The result of the NLP utilities
+        :type value: Any
+        """
+        entries = self.tables[table]
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def put(self, table: str, key: str, value: Any):
+        """Saves a newly computed result in the table.
+
+        :param table: The name of the table
+        :type table: str
+        :param key: The identifier or word
+        :type key: str
+        :param value: The result of the NLP utilities
+        :type value: Any
+        """
+        self._store(table, key, value)
+        self.new_entries[table][key] = value
+
+    def merge(self, entries: Dict[str, dict]):
+        """Saves the entries computed by another process.
+
+        :param entries: The new entries of every table
+        :type entries: Dict[str, dict]
+        """
+        for table, values in entries.items():
+            if table in self.tables:
+                for key, value in values.items():
+                    self._store(table, key, value)
+
+    def pop_report(self) -> dict:
+        """Returns the hits, the misses and the new entries since the last report, and resets them.
+
+        :returns: dict - the hits, the misses and the new entries of every table
+        """
+        report = {"hits": self.hits, "misses": self.misses, "entries": self.new_entries}
+        self.hits = 0
+        self.misses = 0
+        self.new_entries = {table: {} for table in CACHE_TABLES}
+        return report
+
+    def load(self, cache_path: str, settings: str):
+        """Loads the cache file, if present and created with the same settings of the current run.
+
+        :param cache_path: Path of the cache file
+        :type cache_path: str
+        :param settings: Fingerprint of the settings used for the current run
+        :type settings: str
+        :returns: IdentifiersCache - the cache itself
+        """
+        try:
+            with open(cache_path, "r") as fp:
+                cache_file = json.load(fp)
+        except (OSError, json.JSONDecodeError):
+            cache_file = {}
+
+        if cache_file.get("settings") == settings:
+            self.merge(cache_file.get("tables", {}))
+        return self
+
+    def save(self, cache_path: str, settings: str):
+        """Writes the cache file.
+
+        :param cache_path: Path of the cache file
+        :type cache_path: str
+        :param settings: Fingerprint of the settings used for the current run
+        :type settings: str
+        """
+        try:
+            with open(cache_path, "w") as fp:
+                json.dump(
+                    {
+                        "settings": settings,
+                        "tables": {
+                            table: dict(entries)
+                            for table, entries in self.tables.items()
+                        },
+                    },
+                    fp,
+                )
+        except OSError as ex:
+            log(f"Could not save the NLP cache file {cache_path}: {ex}", "warning")
+
+
+# The cache of the current process, inherited by the workers when they are forked
+_identifiers_cache = IdentifiersCache()
+
+
+def get_identifiers_cache() -> IdentifiersCache:
+    """
+    This is a getter method. Returns the NLP cache of the current process.
+
+    :returns: IdentifiersCache - the NLP cache of the current process
+    """
+    return _identifiers_cache
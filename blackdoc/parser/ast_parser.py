@@ -0,0 +1,432 @@
+import ast
+import io
+from typing import Iterable, List
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+TRY_NODES = tuple(
+    getattr(ast, name) for name in ("Try", "TryStar") if hasattr(ast, name)
+)
+
+
+class AstParser:
+    """
+    Parser based on the ast module of the standard library. It extracts the same records of the classes, the
+    functions and the try-except blocks that pythonparser.Parser extracts (same keys, genus, contexts and line
+    numbers), visiting only the statements of the code, without building a full description of every node. Unlike
+    pythonparser, the members of a class are extracted once, async functions are supported, and the try blocks
+    without an except clause are not reported.
+
+    Methods:
+    :method parse:
+    :method parsing_status:
+    :method classes:
+    :method functions:
+    :method exceptions:
+    :method _visit:
+    :method _visit_nodes:
+    :method _visit_function:
+    :method _visit_class:
+    :method _visit_try:
+    :method _visit_assignment:
+    :method _parameters:
+    :method _as_string:
+    :method _push_context:
+    :method _current_context:
+    :method _complete_context:
+    :method _current_class:
+
+
+    :param code: The code to parse
+    :type code: str
+    """
+
+    def __init__(self, code: str = ""):
+        """
+        This overrides the built-in object Initializator. It is a class method of AstParser.
+
+        :param code: The code to parse. (Default="")
+        :type code: str
+        """
+
+        self.code = code.replace("\t", "    ")
+        self.status: List[str] = []
+        self._classes: List[dict] = []
+        self._functions: List[dict] = []
+        self._exceptions: List[dict] = []
+        self._context: List[dict] = [{"type": "", "name": ""}]
+        self._variables: List[dict] = []
+        # The lines of the code (with their line endings), split only when the code of a node is first needed
+        self._lines: List[str] = []
+
+    def parse(self):
+        """
+        Parses the code, and collects the classes, the functions and the try-except blocks. A syntax error is saved in
+        the parsing status.
+        """
+        try:
+            module = ast.parse(self.code)
+        except (SyntaxError, ValueError) as ex:
+            self.status.append(str(ex))
+            return
+        self._visit(module)
+
+    def parsing_status(self) -> List[str]:
+        """
+        Returns the errors encountered while parsing the code. If the code was parsed successfully, the list is empty.
+
+        :returns: List[str] - the errors encountered while parsing the code
+        """
+        return self.status
+
+    def classes(self) -> List[dict]:
+        """
+        Returns the classes found in the code, each one right after the elements defined in its body.
+
+        :returns: List[dict] - the class records
+        """
+        return self._classes
+
+    def functions(self) -> List[dict]:
+        """
+        Returns the functions (global, inner and class methods) found in the code, each one right after the elements
+        defined in its body.
+
+        :returns: List[dict] - the function records
+        """
+        return self._functions
+
+    def exceptions(self) -> List[dict]:
+        """
+        Returns the try-except blocks found in the code, together with their (last) exception handler.
+
+        :returns: List[dict] - the try-except records
+        """
+        return self._exceptions
+
+    def _visit(self, node: ast.AST):
+        """
+        Visits the statements in the body (and in the other blocks) of the node.
+
+        :param node: The node whose statements are visited
+        :type node: ast.AST
+        """
+        self._visit_nodes(ast.iter_child_nodes(node))
+
+    def _visit_nodes(self, nodes: Iterable[ast.AST]):
+        """
+        Visits the given nodes, extracting the records of the functions, classes and try-except blocks among them. The
+        expressions are skipped, since they cannot contain any of them.
+
+        :param nodes: The nodes to visit
+        :type nodes: Iterable[ast.AST]
+        """
+        for child in nodes:
+            if isinstance(child, FUNCTION_NODES):
+                self._visit_function(child)
+            elif isinstance(child, ast.ClassDef):
+                self._visit_class(child)
+            elif isinstance(child, TRY_NODES):
+                self._visit_try(child)
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                self._visit_assignment(child)
+            elif not isinstance(child, ast.expr):
+                self._visit(child)
+
+    def _visit_function(self, node: ast.FunctionDef):
+        """
+        Extracts the record of the function, after visiting its body.
+
+        :param node: The function definition
+        :type node: ast.FunctionDef
+        """
+        genus = self._push_context(node.name, "function")
+        self._visit(node)
+        self._context.pop()
+
+        parent_class = self._current_class()
+        parameters, star_parameters_count = self._parameters(node)
+        self._functions.append(
+            {
+                "name": node.name,
+                "genus": "class_method" if parent_class else genus,
+                "parent_class": parent_class,
+                "is_class_method": bool(parent_class),
+                "start_line": node.lineno,
+                "end_line": node.end_lineno,
+                "total_lines": node.end_lineno - node.lineno + 1,
+                "documentation": ast.get_docstring(node, clean=False) or "",
+                "returns": self._as_string(node.returns) if node.returns else "",
+                "star_parameters_count": star_parameters_count,
+                "parameters": parameters,
+                "inner_methods": [
+                    statement.name
+                    for statement in node.body
+                    if isinstance(statement, FUNCTION_NODES)
+                ],
+                "context": self._current_context(),
+                "complete_context": self._complete_context(node.name, genus),
+            }
+        )
+
+    def _visit_class(self, node: ast.ClassDef):
+        """
+        Extracts the record of the class, after visiting its body.
+
+        :param node: The class definition
+        :type node: ast.ClassDef
+        """
+        genus = self._push_context(node.name, "class")
+        variables = {"class_variables": [], "object_variables": []}
+        self._variables.append(variables)
+        self._visit(node)
+        self._variables.pop()
+        self._context.pop()
+
+        self._classes.append(
+            {
+                "name": node.name,
+                "genus": genus,
+                "start_line": node.lineno,
+                "end_line": node.end_lineno,
+                "total_lines": node.end_lineno - node.lineno + 1,
+                "documentation": ast.get_docstring(node, clean=False) or "",
+                "inheritance": [self._as_string(base) for base in node.bases],
+                "methods": [
+                    statement.name
+                    for statement in node.body
+                    if isinstance(statement, FUNCTION_NODES)
+                ],
+                "class_variables": variables["class_variables"],
+                "object_variables": variables["object_variables"],
+                "context": self._current_context(),
+                "complete_context": self._complete_context(node.name, genus),
+            }
+        )
+
+    def _visit_try(self, node: ast.Try):
+        """
+        Extracts the record of the try-except block, with its last exception handler, after visiting its body. The
+        finally block is visited afterwards, since it does not belong to the try-except block.
+
+        :param node: The try statement
+        :type node: ast.Try
+        """
+        self._visit_nodes(node.body + node.handlers + node.orelse)
+
+        if node.handlers:
+            handler = node.handlers[-1]
+            if handler.type is None:
+                name = ""
+            elif isinstance(handler.type, ast.Name):
+                name = handler.type.id
+            else:
+                name = self._as_string(handler.type)
+
+            end_line = (node.orelse or node.handlers)[-1].end_lineno
+            self._exceptions.append(
+                {
+                    "genus": "try_except",
+                    "start_line": node.lineno,
+                    "end_line": end_line,
+                    "total_lines": end_line - node.lineno + 1,
+                    "exception": {
+                        "genus": "exception_handler",
+                        "name": name,
+                        "alias": handler.name or "",
+                        "start_line": handler.lineno,
+                        "end_line": handler.end_lineno,
+                        "total_lines": handler.end_lineno - handler.lineno + 1,
+                    },
+                    "context": self._current_context(),
+                }
+            )
+
+        self._visit_nodes(node.finalbody)
+
+    def _visit_assignment(self, node: ast.AST):
+        """
+        Collects the class variables (assigned in the body of the class) and the object variables (assigned to self in
+        its methods) of the class being visited.
+
+        :param node: The assignment
+        :type node: ast.AST
+        """
+        if self._variables:
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            in_class_body = self._context[-1]["type"] in ("class", "inner_class")
+            for target in targets:
+                if in_class_body and isinstance(target, ast.Name):
+                    kind, label = "class_variables", target.id
+                elif (
+                    not in_class_body
+                    and isinstance(target, ast.Attribute)
+                    and isinstance(target.value, ast.Name)
+                    and target.value.id == "self"
+                ):
+                    kind, label = "object_variables", f"self.{target.attr}"
+                else:
+                    continue
+
+                self._variables[-1][kind].append(
+                    {
+                        "label": label,
+                        "genus": "value_assignment",
+                        "start_line": node.lineno,
+                        "end_line": node.end_lineno,
+                    }
+                )
+
+    def _parameters(self, node: ast.FunctionDef):
+        """
+        Extracts the parameters of the function, as pythonparser does: the *args (or, if missing, the **kwargs)
+        parameter first, followed by the positional parameters. The parameters with a default value and no type hint
+        get "<class 'list'>" as type hint, as in pythonparser.
+
+        :param node: The function definition
+        :type node: ast.FunctionDef
+        :returns: Tuple[List[dict], int] - the parameter records, and the number of star parameters
+        """
+        arguments = node.args
+        parameters = []
+        star_parameters_count = 0
+
+        if arguments.vararg or arguments.kwarg:
+            parameters.append(
+                {
+                    "genus": "argument",
+                    "name": (arguments.vararg or arguments.kwarg).arg,
+                    "param_type_hint": "",
+                    "value": "",
+                    "is_vararg": bool(arguments.vararg),
+                    "is_kwarg": not arguments.vararg,
+                    "start_line": node.lineno,
+                    "end_line": node.lineno,
+                }
+            )
+            star_parameters_count += 1
+
+        defaults = arguments.defaults
+        for index, argument in enumerate(arguments.args):
+            type_hint = (
+                self._as_string(argument.annotation) if argument.annotation else ""
+            )
+            value = ""
+            default_index = index + len(defaults) - len(arguments.args)
+            if defaults and default_index >= 0:
+                value = self._as_string(defaults[default_index]).replace("'", '"')
+                type_hint = type_hint if type_hint else str(type(defaults))
+
+            parameters.append(
+                {
+                    "genus": "argument",
+                    "name": argument.arg,
+                    "param_type_hint": type_hint,
+                    "value": value,
+                    "is_vararg": False,
+                    "is_kwarg": False,
+                    "start_line": argument.lineno,
+                    "end_line": argument.end_lineno,
+                }
+            )
+
+        return parameters, star_parameters_count
+
+    def _as_string(self, node: ast.AST) -> str:
+        """
+        Returns the code of the node. The string literals are quoted as in pythonparser.
+
+        :param node: The node
+        :type node: ast.AST
+        :returns: str - the code of the node
+        """
+        if hasattr(ast, "unparse"):
+            return ast.unparse(node)
+        if isinstance(node, ast.Constant):
+            return repr(node.value)
+
+        # As ast.get_source_segment, without splitting the whole code again for every node (the offsets are in bytes)
+        if not self._lines:
+            self._lines = io.StringIO(self.code, newline="").readlines()
+        first_line = self._lines[node.lineno - 1].encode()
+        if node.lineno == node.end_lineno:
+            return first_line[node.col_offset : node.end_col_offset].decode()
+        last_line = self._lines[node.end_lineno - 1].encode()
+        return "".join(
+            [first_line[node.col_offset :].decode()]
+            + self._lines[node.lineno : node.end_lineno - 1]
+            + [last_line[: node.end_col_offset].decode()]
+        )
+
+    def _push_context(self, name: str, genus: str) -> str:
+        """
+        Adds the class or function as the innermost context, with the genus pythonparser would give it: inner_class,
+        class_method, inner_method or inner_function, depending on the enclosing contexts.
+
+        :param name: The name of the class or function
+        :type name: str
+        :param genus: Either "class" or "function"
+        :type genus: str
+        :returns: str - the genus of the class or function
+        """
+        types = [context["type"] for context in self._context]
+        if any(kind in ("class", "inner_class") for kind in types):
+            if genus == "class":
+                genus = "inner_class"
+            elif any(kind in ("class_method", "inner_method") for kind in types):
+                genus = "inner_method"
+            else:
+                genus = "class_method"
+        elif genus == "function" and any(
+            kind in ("function", "inner_function") for kind in types
+        ):
+            genus = "inner_function"
+
+        self._context.append({"name": name, "type": genus})
+        return genus
+
+    def _current_context(self) -> dict:
+        """
+        This is a getter method. Returns the innermost context.
+
+        :returns: dict - the type and the name of the innermost context
+        """
+        return {
+            "context_type": self._context[-1]["type"] or "global",
+            "context_name": self._context[-1]["name"],
+        }
+
+    def _complete_context(self, name: str, genus: str) -> List[dict]:
+        """
+        Returns the chain of contexts enclosing the element, from the innermost to the global one.
+
+        :param name: The name of the element
+        :type name: str
+        :param genus: The genus of the element
+        :type genus: str
+        :returns: List[dict] - the chain of contexts
+        """
+        complete_context = []
+        for context in reversed(self._context):
+            complete_context.append(
+                {
+                    "context": {
+                        "name": context["name"],
+                        "type": context["type"] or "global",
+                    },
+                    "name": name,
+                    "kind": genus,
+                }
+            )
+            name, genus = context["name"], context["type"] or "global"
+        return complete_context
+
+    def _current_class(self) -> str:
+        """
+        Returns the name of the innermost enclosing class (not counting the inner classes), as pythonparser does.
+
+        :returns: str - the name of the class, or an empty string if there is none
+        """
+        for context in reversed(self._context):
+            if context["type"] == "class":
+                return context["name"]
+        return ""
@@ -1,15 +1,6 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-
-CLASSES_RECORD_KEYS = [
-    "name",
-    "genus",
-    "documentation",
-    "start_line",
-    "end_line",
-    "inheritance",
-    "complete_context",
-]
+from blackdoc.parser.records import ClassRecord, MethodRecord
 
 
 class ClassesExtractor:
@@ -22,110 +13,115 @@ class ClassesExtractor:
     :method collect_method_body:
     :method __init__:
     :method get_variables:
+    :method index_methods:
 
 
     :param parsed_classes: XXX
-    :param parsed_functions: XXX
+    :param parsed_functions: The records of the functions of the file
+    :type parsed_functions: List[MethodRecord]
     """
 
-    def __init__(self, parsed_classes, parsed_functions):
+    def __init__(self, parsed_classes, parsed_functions: List[MethodRecord]):
         """
         This overrides the built-in object Initializator. It is a class method of ClassesExtractor.
 
         :param parsed_classes: XXX
-        :param parsed_functions: XXX
+        :param parsed_functions: The records of the functions of the file
+        :type parsed_functions: List[MethodRecord]
         """
 
         self.classes = parsed_classes
         self.functions = parsed_functions
+        self.class_methods, self.method_bodies = self.index_methods(self.functions)
 
-    def collect_data(self) -> List[dict]:
+    def collect_data(self) -> List[ClassRecord]:
         """
         Tries to parse (via `py:parsepy.Parser`) the classes in the module at module_path, and save the extracted results
         in collected_data.
         If parsing does not succeed an empty list is saved instead
+
+        :returns: List[ClassRecord] - the records of the classes
         """
         class_data = list()
 
         for class_element in self.classes:
-            class_model = dict()
-
-            class_model["total_lines"] = (
-                class_element["end_line"] - class_element["start_line"] + 1
-            )
-
-            class_model["methods"] = self.collect_class_methods(
-                class_element.get("name", ""), self.functions
+            class_name = class_element.get("name", "")
+            start_line = class_element["start_line"]
+            end_line = class_element["end_line"]
+            class_data.append(
+                ClassRecord(
+                    name=class_element.get("name"),
+                    genus=class_element.get("genus"),
+                    documentation=class_element.get("documentation"),
+                    start_line=start_line,
+                    end_line=end_line,
+                    total_lines=end_line - start_line + 1,
+                    inheritance=tuple(class_element.get("inheritance") or ()),
+                    methods=self.collect_class_methods(class_name),
+                    init_method=self.collect_method_body(class_name, "__init__"),
+                    class_variables=self.get_variables(
+                        class_element, "class_variables"
+                    ),
+                    object_variables=self.get_variables(
+                        class_element, "object_variables"
+                    ),
+                    complete_context=tuple(class_element.get("complete_context") or ()),
+                )
             )
 
-            class_model["__init__"] = self.collect_method_body(
-                class_element.get("name", ""), "__init__", self.functions
-            )
-
-            class_model["class_variables"] = self.get_variables(
-                class_element, "class_variables"
-            )
-            class_model["object_variables"] = self.get_variables(
-                class_element, "object_variables"
-            )
-            class_model.update(
-                {k: class_element.get(k, None) for k in CLASSES_RECORD_KEYS}
-            )
-            class_data.append(class_model)
-
         return class_data
 
     @staticmethod
-    def get_variables(class_element: dict, cls_obj: str) -> list:
+    def get_variables(class_element: dict, cls_obj: str) -> tuple:
         """Retrieves either "class_variables" or "object_variables" (depending on cls_obj) from the class_element.
 
         :param class_element: Parsepy element containing information about a single class
         :type class_element: dict
         :param cls_obj: either "class_variables" or "object_variables"
         :type cls_obj: str
-        :returns: list - Collection of all the class/object variables from the given class
+        :returns: tuple - Collection of all the class/object variables from the given class
         """
-        variables = []
-        for element in class_element.get(cls_obj, []):
-            variables.append(element)
-        return variables
+        return tuple(class_element.get(cls_obj, []))
 
     @staticmethod
+    def index_methods(
+        module_methods: List[MethodRecord],
+    ) -> Tuple[Dict[str, List[str]], Dict[Tuple[str, str], MethodRecord]]:
+        """Indexes the functions of the file by their parent class, in a single pass, so that the records of all the
+        classes are collected in linear time.
+
+        :param module_methods: Collection of all the functions in the file
+        :type module_methods: List[MethodRecord]
+        :returns: Tuple[Dict[str, List[str]], Dict[Tuple[str, str], MethodRecord]] - the names of the methods of every class
+            (in the order of the file), and the first method with a given name of every class
+        """
+        class_methods = {}
+        method_bodies = {}
+        for method in module_methods:
+            class_methods.setdefault(method.parent_class, []).append(method.name)
+            method_bodies.setdefault((method.parent_class, method.name), method)
+        return class_methods, method_bodies
+
     def collect_method_body(
-        class_name: str, method_name: str, module_methods: List[dict]
-    ) -> dict:
+        self, class_name: str, method_name: str
+    ) -> Optional[MethodRecord]:
         """
-        This method is XXX . It is a static class method of ClassesExtractor.
+        This method is XXX . It is a class method of ClassesExtractor.
 
         :param class_name: XXX
         :type class_name: str
         :param method_name: XXX
         :type method_name: str
-        :param module_methods: XXX
-        :type module_methods: List[dict]
-        :returns: dict - XXX
+        :returns: Optional[MethodRecord] - XXX
         """
 
-        body = [
-            method
-            for method in module_methods
-            if method.get("parent_class") == class_name
-            and method.get("name") == method_name
-        ]
-        return body[0] if body else {}
+        return self.method_bodies.get((class_name, method_name))
 
-    @staticmethod
-    def collect_class_methods(class_name: str, module_methods: List[dict]) -> List[str]:
+    def collect_class_methods(self, class_name: str) -> Tuple[str, ...]:
         """Retrieves the methods of the class.
 
         :param class_name: Name of the extracted class
         :type class_name: str
-        :param module_methods: Collection of all the functions in the file
-        :type module_methods: List[dict]
-        :returns: list - Collection of all the class methods of the class with the given name
+        :returns: Tuple[str, ...] - Collection of all the class methods of the class with the given name
         """
-        return [
-            method.get("name")
-            for method in module_methods
-            if method.get("parent_class") == class_name
-        ]
+        return tuple(self.class_methods.get(class_name, ()))
@@ -1,4 +1,6 @@
-from typing import List
+from typing import Dict, List
+
+from blackdoc.parser.records import MethodRecord, RaiseRecord
 
 
 class ExceptionsExtractor:
@@ -8,6 +10,7 @@ class ExceptionsExtractor:
     Methods:
     :method collect_data:
     :method __init__:
+    :method index_by_function:
 
 
     :param parsed_exceptions: XXX
@@ -21,10 +24,82 @@ class ExceptionsExtractor:
         """
 
         self.exceptions = parsed_exceptions
+        # The records of the try-except blocks, collected only once
+        self.raises = None
 
-    def collect_data(self) -> List[dict]:
+    def collect_data(self) -> List[RaiseRecord]:
         """
         Tries to parse (via `py:parsepy.Parser`) the exceptions in the module at module_path.
-        If parsing does not succeed returns an empty list
+        If parsing does not succeed returns an empty list. The blocks without an exception handler are skipped, and the
+        ones reported more than once by the parser are kept once.
+
+        :returns: List[RaiseRecord] - the records of the try-except blocks, in the order of the parser
+        """
+        if self.raises is None:
+            blocks = {}
+            for exception in self.exceptions:
+                if exception.get("exception"):
+                    blocks.setdefault(
+                        exception["start_line"],
+                        RaiseRecord(
+                            name=exception["exception"]["name"],
+                            alias=exception["exception"].get("alias", ""),
+                            start_line=exception["start_line"],
+                            end_line=exception["end_line"],
+                        ),
+                    )
+            self.raises = list(blocks.values())
+        return self.raises
+
+    def index_by_function(
+        self, functions: List[MethodRecord]
+    ) -> Dict[int, List[RaiseRecord]]:
+        """
+        Assigns every try-except block to the innermost function enclosing it, in a single sweep over the functions and
+        the blocks sorted by start line, so that the functions are not credited with the blocks of their inner
+        functions.
+
+        :param functions: The functions of the file
+        :type functions: List[MethodRecord]
+        :returns: Dict[int, List[RaiseRecord]] - the try-except blocks (in the order of the parser) of every function,
+            keyed by the start line of the function
         """
-        return self.exceptions
+        sorted_functions = sorted(
+            functions, key=lambda function: (function.start_line, -function.end_line)
+        )
+        sorted_raises = sorted(
+            self.collect_data(), key=lambda raised: raised.start_line
+        )
+
+        owners = {}
+        open_functions = []
+        function_index = 0
+        for raised in sorted_raises:
+            # Opens the functions starting before the block, closing the ones ending before them
+            while (
+                function_index < len(sorted_functions)
+                and sorted_functions[function_index].start_line < raised.start_line
+            ):
+                function = sorted_functions[function_index]
+                while (
+                    open_functions and open_functions[-1].end_line < function.start_line
+                ):
+                    open_functions.pop()
+                open_functions.append(function)
+                function_index += 1
+
+            while open_functions and open_functions[-1].end_line < raised.start_line:
+                open_functions.pop()
+
+            for function in reversed(open_functions):
+                if raised.end_line <= function.end_line:
+                    owners[raised.start_line] = function.start_line
+                    break
+
+        functions_exceptions = {}
+        for raised in self.collect_data():
+            if raised.start_line in owners:
+                functions_exceptions.setdefault(owners[raised.start_line], []).append(
+                    raised
+                )
+        return functions_exceptions
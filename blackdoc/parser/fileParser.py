@@ -1,6 +1,39 @@
-from typing import List
+import ast
+import tokenize
+from typing import Iterable, Iterator, List, Tuple
 
-from pythonparser.parser import Parser
+from blackdoc.parser.ast_parser import AstParser
+
+# The parsers that can extract the elements of the code: pythonparser (based on astroid), or the faster one based on
+# the ast module of the standard library
+PARSER_BACKENDS = ("pythonparser", "ast")
+DEFAULT_PARSER_BACKEND = "pythonparser"
+# The size (in characters) of the chunks of top-level statements that ChunkedFileParser parses one at a time
+CHUNK_SIZE = 256 * 1024
+# The keywords that continue, at the top level, the statement of the previous lines
+CONTINUATION_KEYWORDS = ("elif", "else", "except", "finally")
+
+
+def get_parser_backend(backend: str = DEFAULT_PARSER_BACKEND) -> type:
+    """
+    This is a getter method. Returns the parser class of the backend. Every backend takes the code to parse, and
+    exposes the parse, parsing_status, classes, functions and exceptions methods, returning the same records.
+    pythonparser is imported only when it is used.
+
+    :param backend: The name of the backend, one of PARSER_BACKENDS. (Default=DEFAULT_PARSER_BACKEND)
+    :type backend: str
+    :raises ValueError: if the backend does not exist
+    :returns: type - the parser class of the backend
+    """
+    if backend == "ast":
+        return AstParser
+    if backend == "pythonparser":
+        from pythonparser.parser import Parser
+
+        return Parser
+    raise ValueError(
+        f"Unknown parser {backend}. Available parsers: {', '.join(PARSER_BACKENDS)}"
+    )
 
 
 class FileParser:
@@ -9,6 +42,7 @@ class FileParser:
 
     Methods:
     :method check_code_validity:
+    :method check_syntax:
     :method get_exceptions:
     :method __init__:
     :method get_functions:
@@ -17,19 +51,29 @@ class FileParser:
 
     :param code: XXX
     :type code: str
+    :param backend: The parser used to extract the elements of the code, one of PARSER_BACKENDS.
+        (Default=DEFAULT_PARSER_BACKEND)
+    :type backend: str
     """
 
-    def __init__(self, code: str):
+    def __init__(self, code: str, backend: str = DEFAULT_PARSER_BACKEND):
         """
         This overrides the built-in object Initializator. It is a class method of FileParser.
 
         :param code: XXX
         :type code: str
+        :param backend: The parser used to extract the elements of the code, one of PARSER_BACKENDS.
+            (Default=DEFAULT_PARSER_BACKEND)
+        :type backend: str
         """
 
         self.code = code
-        self.parser = Parser(code=self.code)
+        self.parser = get_parser_backend(backend)(code=self.code)
         self.parser.parse()
+        # The results of the parser, extracted only once
+        self.classes = None
+        self.functions = None
+        self.exceptions = None
 
     def check_code_validity(self) -> bool:
         """
@@ -40,6 +84,23 @@ class FileParser:
 
         return True if self.code and not self.parser.parsing_status() else False
 
+    @staticmethod
+    def check_syntax(code: str) -> bool:
+        """
+        Checks whether the code is valid Python, without parsing it again with the full parser. Meant for the code
+        that was already parsed and then edited.
+
+        :param code: The code to check
+        :type code: str
+        :returns: bool - True if the code is valid, False otherwise
+        """
+
+        try:
+            ast.parse(code)
+        except (SyntaxError, ValueError):
+            return False
+        return bool(code)
+
     def get_classes(self) -> List[dict]:
         """
         This is a getter method. This method is XXX . It is a class method of FileParser.
@@ -47,7 +108,9 @@ class FileParser:
         :returns: List[dict] - XXX
         """
 
-        return self.parser.classes()
+        if self.classes is None:
+            self.classes = self.parser.classes()
+        return self.classes
 
     def get_functions(self) -> List[dict]:
         """
@@ -56,7 +119,9 @@ class FileParser:
         :returns: List[dict] - XXX
         """
 
-        return self.parser.functions()
+        if self.functions is None:
+            self.functions = self.parser.functions()
+        return self.functions
 
     def get_exceptions(self) -> List[dict]:
         """
@@ -65,4 +130,206 @@ class FileParser:
         :returns: List[dict] - XXX
         """
 
-        return self.parser.exceptions()
+        if self.exceptions is None:
+            self.exceptions = self.parser.exceptions()
+        return self.exceptions
+
+
+def iter_code_chunks(
+    lines: Iterable[str], chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, str]]:
+    """
+    Groups the lines of the code in chunks of whole top-level statements (a decorated definition, or an if-else
+    statement, is never split) of at least chunk_size characters, except the last one. The statements are found with
+    the tokenizer, that reads the lines one at a time.
+
+    :param lines: The lines of the code, with their line endings
+    :type lines: Iterable[str]
+    :param chunk_size: The minimum size of a chunk, in characters. (Default=CHUNK_SIZE)
+    :type chunk_size: int
+    :raises SyntaxError: if the code cannot be tokenized
+    :returns: Iterator[Tuple[int, str]] - the (1-based) first line and the code of every chunk
+    """
+
+    lines = iter(lines)
+    # The lines read by the tokenizer, not yet yielded
+    pending: List[str] = []
+    pending_size = 0
+    first_line = 1
+
+    def readline() -> str:
+        """
+        Reads the next line, keeping it among the pending ones.
+
+        :returns: str - the line, or an empty string at the end of the code
+        """
+        nonlocal pending_size
+        line = next(lines, "")
+        pending.append(line)
+        pending_size += len(line)
+        return line
+
+    skipped_tokens = (
+        tokenize.COMMENT,
+        tokenize.NL,
+        tokenize.INDENT,
+        tokenize.DEDENT,
+        tokenize.ENDMARKER,
+    )
+    new_statement = True
+    after_decorator = False
+    try:
+        for token in tokenize.generate_tokens(readline):
+            if token.type == tokenize.NEWLINE:
+                new_statement = True
+                continue
+            if token.type in skipped_tokens or not new_statement:
+                continue
+
+            new_statement = False
+            line_number, column = token.start
+            if (
+                column == 0
+                and line_number > first_line
+                and not after_decorator
+                and token.string not in CONTINUATION_KEYWORDS
+                and pending_size >= chunk_size
+            ):
+                # The chunk ends right before the line of the token, that starts the next one (already read)
+                chunk_lines = line_number - first_line
+                next_size = sum(len(line) for line in pending[chunk_lines:])
+                if pending_size - next_size >= chunk_size:
+                    chunk = "".join(pending[:chunk_lines])
+                    del pending[:chunk_lines]
+                    pending_size = next_size
+                    yield first_line, chunk
+                    first_line = line_number
+            after_decorator = column == 0 and token.string == "@"
+    except tokenize.TokenError as ex:
+        raise SyntaxError(str(ex))
+
+    chunk = "".join(pending)
+    if chunk:
+        yield first_line, chunk
+
+
+class ChunkedFileParser:
+    """
+    Parser of the code of a (very large) file, that extracts the same records of FileParser, parsing one chunk of
+    top-level statements at a time. Only the records and the syntax tree of a single chunk are held in memory, never
+    the whole code or its syntax tree.
+
+    Methods:
+    :method check_code_validity:
+    :method check_file_syntax:
+    :method read_chunks:
+    :method get_classes:
+    :method get_functions:
+    :method get_exceptions:
+
+
+    :param file_path: The path of the file
+    :type file_path: str
+    :param backend: The parser used to extract the elements of the code, one of PARSER_BACKENDS.
+        (Default=DEFAULT_PARSER_BACKEND)
+    :type backend: str
+    """
+
+    def __init__(self, file_path: str, backend: str = DEFAULT_PARSER_BACKEND):
+        """
+        This overrides the built-in object Initializator. It is a class method of ChunkedFileParser.
+
+        :param file_path: The path of the file
+        :type file_path: str
+        :param backend: The parser used to extract the elements of the code, one of PARSER_BACKENDS.
+            (Default=DEFAULT_PARSER_BACKEND)
+        :type backend: str
+        """
+
+        self.valid = False
+        self.classes = []
+        self.functions = []
+        self.exceptions = []
+        try:
+            for code in self.read_chunks(file_path):
+                parser = FileParser(code, backend)
+                self.valid = parser.check_code_validity()
+                if not self.valid:
+                    break
+                self.classes.extend(parser.get_classes())
+                self.functions.extend(parser.get_functions())
+                self.exceptions.extend(parser.get_exceptions())
+        except (SyntaxError, ValueError):
+            self.valid = False
+
+    @staticmethod
+    def read_chunks(file_path: str) -> Iterator[str]:
+        """
+        Reads the code of the file one chunk at a time (see iter_code_chunks). Every chunk is preceded by as many empty
+        lines as the lines before it, so that the line numbers of its elements are the ones in the file.
+
+        :param file_path: The path of the file
+        :type file_path: str
+        :raises SyntaxError: if the code cannot be tokenized
+        :returns: Iterator[str] - the code of every chunk
+        """
+
+        with open(file_path, "r") as fp:
+            for first_line, chunk in iter_code_chunks(fp):
+                yield "\n" * (first_line - 1) + chunk
+
+    @staticmethod
+    def check_file_syntax(file_path: str) -> bool:
+        """
+        Checks whether the code of the file is valid Python, one chunk at a time, like FileParser.check_syntax.
+
+        :param file_path: The path of the file
+        :type file_path: str
+        :returns: bool - True if the code is valid, False otherwise
+        """
+
+        valid = False
+        try:
+            for code in ChunkedFileParser.read_chunks(file_path):
+                if not FileParser.check_syntax(code):
+                    return False
+                valid = True
+        except (SyntaxError, ValueError):
+            return False
+        return valid
+
+    def check_code_validity(self) -> bool:
+        """
+        Checks whether every chunk of the code was parsed successfully.
+
+        :returns: bool - True if the code is valid, False otherwise
+        """
+
+        return self.valid
+
+    def get_classes(self) -> List[dict]:
+        """
+        This is a getter method. Returns the classes found in every chunk of the code.
+
+        :returns: List[dict] - the class records
+        """
+
+        return self.classes
+
+    def get_functions(self) -> List[dict]:
+        """
+        This is a getter method. Returns the functions found in every chunk of the code.
+
+        :returns: List[dict] - the function records
+        """
+
+        return self.functions
+
+    def get_exceptions(self) -> List[dict]:
+        """
+        This is a getter method. Returns the try-except blocks found in every chunk of the code.
+
+        :returns: List[dict] - the try-except records
+        """
+
+        return self.exceptions
@@ -1,31 +1,19 @@
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+from blackdoc.parser.records import MethodRecord, ParameterRecord
 
-METHODS_RECORD_KEYS = [
-    "name",
-    "genus",
-    "parent_class",
-    "start_line",
-    "end_line",
-    "total_lines",
-    "num_lines_of_code",
-    "star_parameters_count",
-    "number_parameters",
-    "number_annotated_parameters",
-    "parameters",
-    "context",
-    "returns",
-    "documentation",
-    "complete_context",
-]
+logger = logging.getLogger(__name__)
 
 
 class MethodsExtractor:
     """
     Utility class based on pyparser.
     Parser for collecting methods in Python-modules of a repository.
+
+    Methods:
+    :method collect_data:
+    :method collect_parameters:
     """
 
     def __init__(self, parsed_functions):
@@ -37,10 +25,12 @@ class MethodsExtractor:
 
         self.functions = parsed_functions
 
-    def collect_data(self) -> List[dict]:
+    def collect_data(self) -> List[MethodRecord]:
         """
         Tries to parse (via `py:parsepy.Parser`) the methods (class and global) in the module at module_path.
         If parsing does not succeed returns an empty list
+
+        :returns: List[MethodRecord] - the records of the functions
         """
         # Iterate over functions computing some extra data not contained in the parsepy returned data
         for f in self.functions:
@@ -73,6 +63,44 @@ class MethodsExtractor:
                     )
                     f["number_annotated_parameters"] = 0
         module_methods = [
-            {k: f.get(k, None) for k in METHODS_RECORD_KEYS} for f in self.functions
+            MethodRecord(
+                name=f.get("name"),
+                genus=f.get("genus"),
+                parent_class=f.get("parent_class"),
+                start_line=f.get("start_line"),
+                end_line=f.get("end_line"),
+                total_lines=f.get("total_lines"),
+                num_lines_of_code=f.get("num_lines_of_code"),
+                star_parameters_count=f.get("star_parameters_count"),
+                number_parameters=f.get("number_parameters"),
+                number_annotated_parameters=f.get("number_annotated_parameters"),
+                parameters=self.collect_parameters(f.get("parameters")),
+                context=f.get("context"),
+                returns=f.get("returns"),
+                documentation=f.get("documentation"),
+                complete_context=tuple(f.get("complete_context") or ()),
+            )
+            for f in self.functions
         ]
         return module_methods
+
+    @staticmethod
+    def collect_parameters(
+        parameters: Optional[List[dict]],
+    ) -> Tuple[ParameterRecord, ...]:
+        """Converts the parameters extracted by the parser into records.
+
+        :param parameters: The parameters extracted by the parser
+        :type parameters: Optional[List[dict]]
+        :returns: Tuple[ParameterRecord, ...] - the records of the parameters
+        """
+        return tuple(
+            ParameterRecord(
+                name=parameter["name"],
+                param_type_hint=parameter["param_type_hint"],
+                value=parameter["value"],
+                is_vararg=parameter.get("is_vararg", False),
+                is_kwarg=parameter.get("is_kwarg", False),
+            )
+            for parameter in parameters or []
+        )
@@ -0,0 +1,141 @@
+from typing import NamedTuple, Optional, Tuple
+
+
+class ParameterRecord(NamedTuple):
+    """
+    A parameter of a function, as extracted by the parser.
+
+    :param name: The name of the parameter
+    :type name: str
+    :param param_type_hint: The type hint of the parameter, if any
+    :type param_type_hint: str
+    :param value: The default value of the parameter, if any
+    :type value: str
+    :param is_vararg: Whether the parameter is the *args one
+    :type is_vararg: bool
+    :param is_kwarg: Whether the parameter is the **kwargs one
+    :type is_kwarg: bool
+    """
+
+    name: str
+    param_type_hint: str
+    value: str
+    is_vararg: bool
+    is_kwarg: bool
+
+
+class MethodRecord(NamedTuple):
+    """
+    A function (global, inner or class method) of the file, with the information needed to document it.
+
+    :param name: The name of the function
+    :type name: str
+    :param genus: Either "function", "inner_function", "class_method" or "inner_method"
+    :type genus: str
+    :param parent_class: The name of the class of the method, if any
+    :type parent_class: str
+    :param start_line: The line of the definition
+    :type start_line: int
+    :param end_line: The last line of the function
+    :type end_line: int
+    :param total_lines: The number of lines of the function
+    :type total_lines: int
+    :param num_lines_of_code: The number of lines of the function, without its docstring
+    :type num_lines_of_code: int
+    :param star_parameters_count: The number of *args and **kwargs parameters
+    :type star_parameters_count: int
+    :param number_parameters: The number of parameters
+    :type number_parameters: int
+    :param number_annotated_parameters: The number of parameters with a type hint
+    :type number_annotated_parameters: int
+    :param parameters: The parameters of the function
+    :type parameters: Tuple[ParameterRecord, ...]
+    :param context: The type and the name of the innermost context of the function
+    :type context: dict
+    :param returns: The return type hint, if any
+    :type returns: str
+    :param documentation: The docstring, if any
+    :type documentation: str
+    :param complete_context: The chain of contexts enclosing the function
+    :type complete_context: tuple
+    """
+
+    name: str
+    genus: str
+    parent_class: str
+    start_line: int
+    end_line: int
+    total_lines: int
+    num_lines_of_code: int
+    star_parameters_count: int
+    number_parameters: int
+    number_annotated_parameters: int
+    parameters: Tuple[ParameterRecord, ...]
+    context: dict
+    returns: str
+    documentation: str
+    complete_context: tuple
+
+
+class ClassRecord(NamedTuple):
+    """
+    A class of the file, with the information needed to document it.
+
+    :param name: The name of the class
+    :type name: str
+    :param genus: Either "class" or "inner_class"
+    :type genus: str
+    :param documentation: The docstring, if any
+    :type documentation: str
+    :param start_line: The line of the definition
+    :type start_line: int
+    :param end_line: The last line of the class
+    :type end_line: int
+    :param total_lines: The number of lines of the class
+    :type total_lines: int
+    :param inheritance: The base classes
+    :type inheritance: Tuple[str, ...]
+    :param methods: The names of the methods of the class
+    :type methods: Tuple[str, ...]
+    :param init_method: The __init__ method of the class, if any
+    :type init_method: Optional[MethodRecord]
+    :param class_variables: The variables assigned in the body of the class
+    :type class_variables: tuple
+    :param object_variables: The variables assigned to self in the methods of the class
+    :type object_variables: tuple
+    :param complete_context: The chain of contexts enclosing the class
+    :type complete_context: tuple
+    """
+
+    name: str
+    genus: str
+    documentation: str
+    start_line: int
+    end_line: int
+    total_lines: int
+    inheritance: Tuple[str, ...]
+    methods: Tuple[str, ...]
+    init_method: Optional[MethodRecord]
+    class_variables: tuple
+    object_variables: tuple
+    complete_context: tuple
+
+
+class RaiseRecord(NamedTuple):
+    """
+    A try-except block of the file, with the exception handled by its (last) except clause.
+
+    :param name: The name of the handled exception (empty for a bare except)
+    :type name: str
+    :param alias: The name the exception is bound to, if any
+    :type alias: str
+    :param start_line: The line of the try statement
+    :type start_line: int
+    :param end_line: The last line of the try-except block
+    :type end_line: int
+    """
+
+    name: str
+    alias: str
+    start_line: int
+    end_line: int
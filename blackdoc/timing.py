@@ -0,0 +1,208 @@
+import cProfile
+import json
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+# The stages of the documentation of a file, in the order they are executed
+FILE_STAGES = (
+    "read",
+    "parse",
+    "extract",
+    "nlp",
+    "generate",
+    "isort",
+    "black",
+    "backup",
+    "write",
+)
+
+
+class StageTimer:
+    """
+    Measures the time spent in every stage of a run (or of the documentation of a file). A stage can be entered more
+    than once, and its time is summed. The time of a stage entered inside another one is not counted in the enclosing
+    stage, so that the stages never overlap (e.g. the lazy search of the files, consumed while the files are
+    documented, is not counted as documentation).
+
+    Methods:
+    :method span:
+    :method iterate:
+    """
+
+    def __init__(self):
+        """
+        This overrides the built-in object Initializator. It is a class method of StageTimer.
+        """
+
+        self.stages: Dict[str, float] = {}
+        # The time spent in the nested stages of every stage currently entered
+        self._nested: List[float] = []
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        Adds the time spent in the body of the with statement (except the nested stages) to the stage, even if the
+        body raises.
+
+        :param stage: The name of the stage
+        :type stage: str
+        """
+
+        start_time = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            nested = self._nested.pop()
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed - nested
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def iterate(self, stage: str, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Yields the items, adding to the stage only the time spent producing them, so that lazy generators (e.g. the
+        search of the files) can be timed while their items are consumed somewhere else.
+
+        :param stage: The name of the stage
+        :type stage: str
+        :param items: The items to time
+        :type items: Iterable[Any]
+        :returns: Iterator[Any] - the same items
+        """
+
+        iterator = iter(items)
+        while True:
+            with self.span(stage):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def aggregate_stage_timings(
+    file_timings: Iterable[Tuple[str, Dict[str, float]]]
+) -> Dict[str, dict]:
+    """
+    Sums the time of every stage across the files (and so across the workers that documented them).
+
+    :param file_timings: The path of every file, and the time spent in every stage documenting it
+    :type file_timings: Iterable[Tuple[str, Dict[str, float]]]
+    :returns: Dict[str, dict] - for every stage (in execution order), the number of files that went through it, the
+        total and the maximum time, and the slowest file
+    """
+
+    stages = {}
+    for path, timings in file_timings:
+        for stage, elapsed in timings.items():
+            summary = stages.setdefault(
+                stage, {"files": 0, "total": 0.0, "max": 0.0, "slowest": ""}
+            )
+            summary["files"] += 1
+            summary["total"] += elapsed
+            if elapsed >= summary["max"]:
+                summary["max"] = elapsed
+                summary["slowest"] = path
+
+    order = {stage: index for index, stage in enumerate(FILE_STAGES)}
+    return {
+        stage: stages[stage]
+        for stage in sorted(stages, key=lambda stage: order.get(stage, len(order)))
+    }
+
+
+def save_timings(
+    path: str,
+    main_stages: Dict[str, float],
+    file_timings: List[Tuple[str, Dict[str, float]]],
+):
+    """
+    Saves the timings of the run as JSON: the stages of the main process, the stages summed across the files, and the
+    stages of every file.
+
+    :param path: The JSON file
+    :type path: str
+    :param main_stages: The time spent in every stage by the main process
+    :type main_stages: Dict[str, float]
+    :param file_timings: The path of every file, and the time spent in every stage documenting it
+    :type file_timings: List[Tuple[str, Dict[str, float]]]
+    """
+
+    with open(path, "w") as fp:
+        json.dump(
+            {
+                "main": main_stages,
+                "stages": aggregate_stage_timings(file_timings),
+                "files": dict(file_timings),
+            },
+            fp,
+            indent=2,
+        )
+
+
+class ProfileEntries:
+    """
+    The entries of a cProfile profile sent back by a worker, in the form that pstats.Stats can load.
+
+    Methods:
+    :method create_stats:
+
+
+    :param stats: The entries of the profile (the stats attribute of cProfile.Profile)
+    :type stats: dict
+    """
+
+    def __init__(self, stats: dict):
+        """
+        This overrides the built-in object Initializator. It is a class method of ProfileEntries.
+
+        :param stats: The entries of the profile (the stats attribute of cProfile.Profile)
+        :type stats: dict
+        """
+
+        self.stats = stats
+
+    def create_stats(self):
+        """Does nothing, since the entries were already created by the worker."""
+
+
+def profile_call(function: Callable, *args, **kwargs) -> Tuple[Any, dict]:
+    """
+    Calls the function under cProfile.
+
+    :param function: The function to profile
+    :type function: Callable
+    :returns: Tuple[Any, dict] - the result of the function, and the entries of the profile (that can be pickled and
+        sent back to the main process)
+    """
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+def save_profile(path: str, profiles: Iterable[dict]) -> bool:
+    """
+    Merges the profiles of the files (computed by any worker) and saves them in a pstats file.
+
+    :param path: The pstats file
+    :type path: str
+    :param profiles: The entries of the profile of every file
+    :type profiles: Iterable[dict]
+    :returns: bool - False if there was no profile to save
+    """
+
+    stats = None
+    for entries in profiles:
+        if stats is None:
+            stats = pstats.Stats(ProfileEntries(entries))
+        else:
+            stats.add(ProfileEntries(entries))
+    if stats is None:
+        return False
+    stats.dump_stats(path)
+    return True
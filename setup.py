@@ -25,15 +25,9 @@ def read_requirements(filename: str):
 
 curr_dir = os.getcwd()
 install_requires = read_requirements(os.path.abspath("./requirements.txt"))
-install_requires = (
-    [
-        f"PythonParser@git+https://github.com/drasgo/PythonParser.git#egg=PythonParser-1.0.4"
-    ]
-    + [
-        f"NLPUtilities@git+https://github.com/drasgo/NLPUtilities.git#egg=NLPUtilities-1.0.0"
-    ]
-    + [req for req in install_requires if not req.startswith("./external_packages")]
-)
+install_requires = [
+    f"PythonParser@git+https://github.com/drasgo/PythonParser.git#egg=PythonParser-1.0.4"
+] + [req for req in install_requires if not req.startswith("./external_packages")]
 
 setup(
     name="BlackDoc",
@@ -44,6 +38,11 @@ setup(
     description="A tool combining Black and an automatic docstring template generation for every non-documented function, "
     "following Sphinx style",
     install_requires=install_requires,
+    extras_require={
+        "nlp": [
+            f"NLPUtilities@git+https://github.com/drasgo/NLPUtilities.git#egg=NLPUtilities-1.0.0"
+        ]
+    },
     packages=find_packages(),
     classifiers=[
         "Programming Language :: Python :: 3",
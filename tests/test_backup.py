@@ -0,0 +1,95 @@
+import os
+
+from blackdoc.backup import FilesBackup
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fp:
+        fp.write(content)
+
+
+def read(path):
+    with open(path, "r") as fp:
+        return fp.read()
+
+
+def replace(path, content):
+    # As the documented files, the new content is written to a new file that replaces the original one
+    write(path + ".new", content)
+    os.replace(path + ".new", path)
+
+
+def test_save_and_restore(tmp_path):
+    working_dir = str(tmp_path / "repo")
+    backup_dir = str(tmp_path / "backup")
+    module = os.path.join(working_dir, "package", "module.py")
+    external = str(tmp_path / "external.py")
+    write(module, "original\n")
+    write(external, "external\n")
+
+    backup = FilesBackup(working_dir, backup_dir)
+    backup.save(module)
+    backup.save(external)
+    # Saved only once
+    backup.save(module)
+    replace(module, "documented\n")
+    replace(external, "documented\n")
+
+    assert backup.read_manifest() == [os.path.join("package", "module.py"), external]
+
+    latest = FilesBackup.latest(working_dir, backup_dir)
+    assert latest.run_name == backup.run_name
+    assert latest.restore() == 2
+    assert read(module) == "original\n"
+    assert read(external) == "external\n"
+
+
+def test_restore_keeps_symlinks_and_hardlinks(tmp_path):
+    working_dir = str(tmp_path)
+    backup_dir = str(tmp_path / "backup")
+    target = os.path.join(working_dir, "target.py")
+    symlink = os.path.join(working_dir, "symlink.py")
+    hardlink = os.path.join(working_dir, "hardlink.py")
+    other = os.path.join(working_dir, "other.py")
+    write(target, "target\n")
+    write(hardlink, "hardlink\n")
+    os.symlink(target, symlink)
+    os.link(hardlink, other)
+
+    backup = FilesBackup(working_dir, backup_dir)
+    backup.save(symlink)
+    backup.save(hardlink, copy=True)
+    replace(target, "documented\n")
+    with open(hardlink, "w") as fp:
+        fp.write("documented\n")
+
+    assert backup.restore() == 2
+    assert os.path.islink(symlink)
+    assert read(symlink) == "target\n"
+    assert read(other) == "hardlink\n"
+    assert os.path.samefile(hardlink, other)
+
+
+def test_run_without_changes_keeps_the_last_backup(tmp_path):
+    working_dir = str(tmp_path / "repo")
+    backup_dir = str(tmp_path / "backup")
+    module = os.path.join(working_dir, "module.py")
+    write(module, "original\n")
+
+    first = FilesBackup(working_dir, backup_dir)
+    first.save(module)
+    replace(module, "documented\n")
+    # A run that does not save any file
+    FilesBackup(working_dir, backup_dir)
+
+    assert FilesBackup.latest(working_dir, backup_dir).run_name == first.run_name
+
+    second = FilesBackup(working_dir, backup_dir)
+    second.save(module)
+
+    assert os.listdir(backup_dir) == [second.run_name]
+
+
+def test_latest_without_backup(tmp_path):
+    assert FilesBackup.latest(str(tmp_path), str(tmp_path / "backup")) is None
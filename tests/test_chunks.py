@@ -0,0 +1,83 @@
+import ast
+
+import pytest
+
+from blackdoc.parser.fileParser import iter_code_chunks
+
+CODE = '''import os
+
+
+@decorator
+def first():
+    """
+    Docstring
+    """
+    return os.sep
+
+
+if os.sep == "/":
+    SEPARATOR = "slash"
+elif os.sep == "\\\\":
+    SEPARATOR = "backslash"
+else:
+    SEPARATOR = None
+
+try:
+    import json
+except ImportError:
+    json = None
+finally:
+    pass
+
+VALUE = (
+    1,
+    2,
+)
+
+
+class Second:
+    def method(self):
+        return 1
+# comment at the end
+'''
+
+
+def test_chunks_rebuild_the_code():
+    for chunk_size in (1, 10, 100, len(CODE), len(CODE) * 2):
+        chunks = list(iter_code_chunks(CODE.splitlines(keepends=True), chunk_size))
+
+        assert "".join(chunk for _, chunk in chunks) == CODE
+        lines = 1
+        for first_line, chunk in chunks:
+            assert chunk
+            assert first_line == lines
+            lines += chunk.count("\n")
+
+
+def test_chunks_are_whole_statements():
+    chunks = list(iter_code_chunks(CODE.splitlines(keepends=True), 1))
+
+    for _, chunk in chunks:
+        ast.parse(chunk)
+    assert [first_line for first_line, _ in chunks] == [1, 4, 12, 19, 26, 32]
+
+
+def test_chunks_of_at_least_chunk_size():
+    chunks = [
+        chunk for _, chunk in iter_code_chunks(CODE.splitlines(keepends=True), 100)
+    ]
+
+    assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+    assert len(chunks) > 1
+
+
+def test_single_chunk():
+    assert list(iter_code_chunks(CODE.splitlines(keepends=True), len(CODE))) == [
+        (1, CODE)
+    ]
+    assert list(iter_code_chunks([], 1)) == []
+
+
+def test_chunks_of_invalid_code():
+    with pytest.raises(SyntaxError):
+        list(iter_code_chunks(["VALUE = (\n", "    1,\n"], 1))
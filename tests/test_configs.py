@@ -0,0 +1,51 @@
+import pytest
+
+from blackdoc.configs import CONFIGURATION_NAME, Config
+
+
+@pytest.fixture
+def config(monkeypatch):
+    # The configurations are class attributes: every test starts from the defaults
+    for name in (
+        "workers",
+        "whitelist",
+        "backup_folder",
+        "gitignore",
+        "parser",
+        "low_memory_threshold",
+        "blacklist",
+    ):
+        monkeypatch.setattr(Config, name, getattr(Config, name))
+    return Config
+
+
+def load(tmp_path, content):
+    (tmp_path / CONFIGURATION_NAME).write_text("[blackdoc]\n" + content)
+    return Config.load_configs(str(tmp_path))
+
+
+def test_valid_parser_and_threshold(tmp_path, config):
+    configs = load(tmp_path, 'parser = "ast"\nlow_memory_threshold = 0\n')
+
+    assert configs.parser == "ast"
+    assert configs.low_memory_threshold == 0
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        'parser = "ats"\nlow_memory_threshold = "4MB"\n',
+        "parser = 3\nlow_memory_threshold = -1\n",
+        'parser = ["ast"]\nlow_memory_threshold = true\n',
+        "low_memory_threshold = 1.5\n",
+    ],
+)
+def test_invalid_parser_and_threshold(tmp_path, config, capsys, content):
+    default_parser = config.parser
+    default_threshold = config.low_memory_threshold
+
+    configs = load(tmp_path, content)
+
+    assert configs.parser == default_parser
+    assert configs.low_memory_threshold == default_threshold
+    assert "[ERROR]: Invalid low_memory_threshold" in capsys.readouterr().out
@@ -0,0 +1,132 @@
+import os
+
+from blackdoc.discovery import FilesDiscovery, GitIgnore, compile_patterns
+
+
+def write(path, content=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fp:
+        fp.write(content)
+
+
+def test_compile_patterns_splits_names_and_paths():
+    names, paths = compile_patterns(["venv", "*.egg-info", "/build/", "docs/api", " "])
+
+    assert names.match("venv")
+    assert names.match("blackdoc.egg-info")
+    assert not names.match("venv2")
+    assert names.match("build")
+    assert paths.match("docs/api")
+    assert not paths.match("other/docs/api")
+
+
+def test_compile_patterns_without_entries():
+    assert compile_patterns([]) == (None, None)
+    assert compile_patterns(["", "/"]) == (None, None)
+
+
+def test_gitignore_patterns(tmp_path):
+    write(
+        str(tmp_path / ".gitignore"),
+        "# comment\n\n*.pyc\nbuild/\n/top.py\ndocs/*.py\n**/generated\n!keep.pyc\n",
+    )
+    gitignore = GitIgnore.load(str(tmp_path))
+
+    assert gitignore.is_ignored("module.pyc", False)
+    assert gitignore.is_ignored("package/module.pyc", False)
+    assert not gitignore.is_ignored("keep.pyc", False)
+    # Only folders
+    assert gitignore.is_ignored("package/build", True)
+    assert not gitignore.is_ignored("package/build", False)
+    # Anchored to the folder of the .gitignore file
+    assert gitignore.is_ignored("top.py", False)
+    assert not gitignore.is_ignored("package/top.py", False)
+    assert gitignore.is_ignored("docs/conf.py", False)
+    assert not gitignore.is_ignored("docs/api/conf.py", False)
+    assert gitignore.is_ignored("generated", True)
+    assert gitignore.is_ignored("a/b/generated", True)
+    assert not gitignore.is_ignored("module.py", False)
+
+
+def test_gitignore_missing_or_empty(tmp_path):
+    assert GitIgnore.load(str(tmp_path)) is None
+
+    write(str(tmp_path / ".gitignore"), "# only a comment\n")
+    assert GitIgnore.load(str(tmp_path)) is None
+
+
+def test_walk_and_is_allowed(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, ".gitignore"), "ignored/\n")
+    write(os.path.join(root, "package", ".gitignore"), "local.py\n")
+    for path in (
+        "main.py",
+        "notes.txt",
+        "package/module.py",
+        "package/local.py",
+        "ignored/module.py",
+        "venv/module.py",
+        "other/module.py",
+    ):
+        write(os.path.join(root, path))
+
+    discovery = FilesDiscovery(root, ["venv"], [])
+    files = sorted(os.path.relpath(path, root) for path in discovery.walk())
+
+    assert files == [
+        "main.py",
+        os.path.join("other", "module.py"),
+        os.path.join("package", "module.py"),
+    ]
+    for path in ("package/local.py", "ignored/module.py", "venv/module.py"):
+        assert not FilesDiscovery(root, ["venv"], []).is_allowed(
+            os.path.join(root, path)
+        )
+    assert FilesDiscovery(root, ["venv"], []).is_allowed(
+        os.path.join(root, "package", "module.py")
+    )
+
+
+def test_walk_with_whitelist_and_without_gitignore(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, ".gitignore"), "*.py\n")
+    write(os.path.join(root, "main.py"))
+    write(os.path.join(root, "package", "module.py"))
+
+    discovery = FilesDiscovery(root, [], ["package"], use_gitignore=False)
+
+    assert list(discovery.walk()) == [os.path.join(root, "package", "module.py")]
+
+
+def test_parent_gitignores_and_info_exclude(tmp_path):
+    top_dir = str(tmp_path)
+    root = os.path.join(top_dir, "project", "src")
+    write(os.path.join(top_dir, ".git", "info", "exclude"), "local_*.py\n")
+    write(os.path.join(top_dir, ".gitignore"), "generated/\n")
+    write(os.path.join(top_dir, "project", ".gitignore"), "src/skipped.py\n")
+    for path in (
+        "module.py",
+        "local_settings.py",
+        "skipped.py",
+        "generated/module.py",
+        "package/local_module.py",
+    ):
+        write(os.path.join(root, path))
+
+    discovery = FilesDiscovery(root, [], [])
+
+    assert list(discovery.walk()) == [os.path.join(root, "module.py")]
+    assert not discovery.is_allowed(os.path.join(root, "skipped.py"))
+    assert not discovery.is_allowed(os.path.join(root, "generated", "module.py"))
+    assert discovery.is_allowed(os.path.join(root, "module.py"))
+
+
+def test_parent_gitignores_outside_the_repository(tmp_path):
+    write(str(tmp_path / ".gitignore"), "*.py\n")
+    root = str(tmp_path / "repo")
+    os.makedirs(os.path.join(root, ".git"))
+    write(os.path.join(root, "module.py"))
+
+    assert list(FilesDiscovery(root, [], []).walk()) == [
+        os.path.join(root, "module.py")
+    ]
@@ -0,0 +1,80 @@
+from blackdoc.docstring import DocumentFile
+from blackdoc.line_buffer import LineBuffer
+
+CODE = '''def first(a):
+    return a
+
+
+def second(
+    a,
+    b,
+):
+
+    return a + b
+
+
+class Third:
+
+    NAME = "third"
+
+    def method(self):
+        """
+        Existing docstring
+        """
+        return 1
+
+
+def fourth(a): return a
+'''
+
+
+def test_splice_after_the_definition():
+    lines = CODE.split("\n")
+
+    assert DocumentFile.find_docstring_splice(lines, 1) == (1, 1)
+
+
+def test_splice_replaces_the_empty_lines():
+    lines = CODE.split("\n")
+
+    # After the multi-line definition, replacing the empty line before the body
+    assert DocumentFile.find_docstring_splice(lines, 5) == (8, 9)
+
+
+def test_splice_replaces_the_empty_lines_of_a_class():
+    lines = CODE.split("\n")
+
+    assert DocumentFile.find_docstring_splice(lines, 13) == (13, 14)
+
+
+def test_splice_after_an_existing_docstring():
+    lines = CODE.split("\n")
+
+    # The docstrings are generated only for the undocumented elements: an existing one is skipped over
+    assert DocumentFile.find_docstring_splice(lines, 17) == (17, 20)
+
+
+def test_splice_without_body():
+    assert DocumentFile.find_docstring_splice(CODE.split("\n"), 24) is None
+    assert DocumentFile.find_docstring_splice(["def f():", ""], 1) is None
+
+
+def test_insert_every_docstring_in_one_pass(tmp_path):
+    document = DocumentFile.__new__(DocumentFile)
+    docstrings = [
+        (5, '    """Second"""'),
+        (1, '    """First"""'),
+        (13, '    """Third"""'),
+    ]
+    expected = CODE.split("\n")
+    expected[12:14] = ["class Third:", '    """Third"""', ""]
+    expected[4:9] = ["def second(", "    a,", "    b,", "):", '    """Second"""', ""]
+    expected[1:1] = ['    """First"""', ""]
+
+    documented = list(document.iter_docstrings_2_code(CODE.split("\n"), docstrings))
+    assert documented == expected
+
+    path = tmp_path / "module.py"
+    path.write_text(CODE)
+    with LineBuffer(str(path)) as code_lines:
+        assert list(document.iter_docstrings_2_code(code_lines, docstrings)) == expected
@@ -0,0 +1,86 @@
+import os
+
+from blackdoc.git_diff import map_changed_lines, map_line, parse_diff, parse_hunks
+
+DIFF = """diff --git a/module.py b/module.py
+index 1111111..2222222 100644
+--- a/module.py
++++ b/module.py
+@@ -3 +3,2 @@ def f():
+-    return 1
++    value = 1
++    return value
+@@ -10,0 +12,3 @@ def g():
++
++def h():
++    pass
+@@ -20,2 +24,0 @@ class A:
+-    def i(self):
+-        pass
+diff --git a/removed.py b/removed.py
+deleted file mode 100644
+--- a/removed.py
++++ /dev/null
+@@ -1 +0,0 @@
+-x = 1
+diff --git "a/caf\\303\\251.py" "b/caf\\303\\251.py"
+--- "a/caf\\303\\251.py"
++++ "b/caf\\303\\251.py"
+@@ -1 +1 @@
+-x = 1
++x = 2
+"""
+
+ROOT = os.path.join(os.sep, "repo")
+
+
+def test_parse_hunks():
+    hunks = parse_hunks(DIFF, ROOT)
+
+    assert hunks == {
+        os.path.join(ROOT, "module.py"): [(3, 1, 3, 2), (10, 0, 12, 3), (20, 2, 24, 0)],
+        os.path.join(ROOT, "café.py"): [(1, 1, 1, 1)],
+    }
+
+
+def test_parse_diff_keeps_the_line_before_a_deletion():
+    changed_lines = parse_diff(DIFF, ROOT)
+
+    assert changed_lines[os.path.join(ROOT, "module.py")] == [
+        (3, 4),
+        (12, 14),
+        (24, 24),
+    ]
+
+
+def test_parse_diff_deletion_at_the_beginning():
+    diff = "+++ b/module.py\n@@ -1,2 +0,0 @@\n-x = 1\n-y = 2\n"
+
+    assert parse_diff(diff, ROOT) == {os.path.join(ROOT, "module.py"): [(1, 1)]}
+
+
+def test_map_line_before_after_and_inside_hunks():
+    hunks = [(3, 1, 3, 2), (10, 0, 12, 3), (20, 2, 24, 0)]
+
+    # Before any hunk
+    assert map_line(1, hunks) == (1, 1)
+    # Replaced by the lines of the hunk
+    assert map_line(3, hunks) == (3, 4)
+    # Moved by the first hunk
+    assert map_line(5, hunks) == (6, 6)
+    # The insertion is placed after the line
+    assert map_line(10, hunks) == (11, 11)
+    assert map_line(11, hunks) == (15, 15)
+    # Deleted: the line where the deletion happened
+    assert map_line(21, hunks) == (24, 24)
+    assert map_line(22, hunks) == (24, 24)
+
+
+def test_map_line_without_hunks():
+    assert map_line(7, []) == (7, 7)
+
+
+def test_map_changed_lines():
+    hunks = [(3, 1, 3, 2), (10, 0, 12, 3)]
+
+    assert map_changed_lines([(1, 3), (8, 11)], hunks) == [(1, 4), (9, 15)]